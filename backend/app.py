@@ -1,13 +1,25 @@
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-import csv
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+from typing import List, Optional
 import os
+import threading
+import time
 
 # Import the existing get_fits functions
-from scripts.qb_fit_app import get_qb_fits_for_team
-from scripts.rb_fit_app import get_rb_fits_for_team
-from scripts.wr_fit_app import get_wr_fits_for_team
-from scripts.te_fit_app import get_te_fits_for_team
+from scripts.qb_fit_app import get_qb_fits_for_team, get_qb_fits_for_teams, get_qb_fit_for_player, rebuild_qb_fits
+from scripts.rb_fit_app import get_rb_fits_for_team, get_rb_fits_for_teams, get_rb_fit_for_player, rebuild_rb_fits
+from scripts.wr_fit_app import get_wr_fits_for_team, get_wr_fits_for_teams, get_wr_fit_for_player, rebuild_wr_fits
+from scripts.te_fit_app import get_te_fits_for_team, get_te_fits_for_teams, get_te_fit_for_player, rebuild_te_fits
+from scripts.fit_tensor import replace_fit_tables
+from scripts.ranking_cache import replace_rankings
+from scripts.player_store import get_player_index, build_player_index, replace_player_store, find_player, find_players, find_players_by_name
+from scripts.data_snapshot import get_snapshot, reload_snapshot, watch_data_dir
+from scripts.json_response import frame_payload, json_response, dumps
+from scripts.compute_executor import ComputeBusy, run_compute, start_executor, shutdown_executor
+from scripts.cached_response import get_cached_file_response, cached_file_response
 
 # --- Directory Setup ---
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))    # path to backend/
@@ -15,6 +27,7 @@ DATA_DIR = os.path.join(BASE_DIR, "processed_data")      # path to backend/proce
 
 # This is for your /teams endpoint that reads team_seasonal_stats.csv
 TEAM_SEASONAL_FILE = os.path.join(DATA_DIR, "team_seasonal_stats.csv")
+OLINE_FILE = os.path.join(DATA_DIR, "fa_oline.csv")
 
 # --- Team Abbreviations ---
 TEAM_ABBR_TO_NAME = {
@@ -61,6 +74,36 @@ FITS_FUNCTIONS = {
     # Add more if needed (TE, etc.)
 }
 
+# --- Position → multi-team fits function (one pass over the fit table) ---
+TEAMS_FITS_FUNCTIONS = {
+    "QB": get_qb_fits_for_teams,
+    "RB": get_rb_fits_for_teams,
+    "WR": get_wr_fits_for_teams,
+    "TE": get_te_fits_for_teams
+}
+
+# --- Position → single-player fit function (final_fit + ranking columns) ---
+PLAYER_FIT_FUNCTIONS = {
+    "QB": get_qb_fit_for_player,
+    "RB": get_rb_fit_for_player,
+    "WR": get_wr_fit_for_player,
+    "TE": get_te_fit_for_player
+}
+
+# --- Position → rebuild (re-reads the data, builds a new fit table and ranking entry) ---
+REBUILD_FUNCTIONS = {
+    "QB": rebuild_qb_fits,
+    "RB": rebuild_rb_fits,
+    "WR": rebuild_wr_fits,
+    "TE": rebuild_te_fits
+}
+
+# "background" (default): start serving right away and warm up in a thread; /ready reports progress.
+# "blocking": finish the warm-up before accepting requests. "off": build everything on first use.
+FIT_WARMUP = os.environ.get("FIT_WARMUP", "background")
+# Seconds between checks of processed_data for new scrapes (0 turns hot reloading off).
+DATA_RELOAD_INTERVAL = float(os.environ.get("DATA_RELOAD_INTERVAL", "10"))
+
 # --- Position → CSV filename ---
 POSITION_DATA_FILES = {
     "QB": "fa_qbs.csv",
@@ -142,7 +185,68 @@ ADVANCED_RANK_FIELDS = {
 ]
 }
 
-app = FastAPI()
+# --- Warm-up state, reported by /ready ---
+warm_up_status = {"ready": False, "error": None, "seconds": None}
+
+def rebuild_data():
+    """
+    Builds every position's fit table, rankings and player index from the current
+    processed_data files, then swaps them all in. Requests are served from the
+    previous objects until the swap.
+    """
+    tables, rankings, players = {}, {}, {}
+    for position, rebuild_fits in REBUILD_FUNCTIONS.items():
+        tables[position], rankings[position] = rebuild_fits()
+        players[position] = build_player_index(os.path.join(DATA_DIR, POSITION_DATA_FILES[position]))
+    if os.path.exists(OLINE_FILE):
+        players["OL"] = build_player_index(OLINE_FILE, id_column="id", name_column="name")
+    replace_fit_tables(tables)
+    replace_rankings(rankings)
+    replace_player_store(players)
+    # Encode the /teams and /oline bodies now rather than on their first request.
+    for key, path in (("teams", TEAM_SEASONAL_FILE), ("oline", OLINE_FILE)):
+        if os.path.exists(path):
+            get_cached_file_response(key, path)
+
+def warm_up():
+    """
+    Loads the first processed_data snapshot. Requests that arrive earlier still work;
+    they just build what they need themselves.
+    """
+    start = time.perf_counter()
+    try:
+        reload_snapshot(DATA_DIR, rebuild_data)
+        warm_up_status["ready"] = True
+    except Exception as e:
+        warm_up_status["error"] = repr(e)
+    warm_up_status["seconds"] = round(time.perf_counter() - start, 3)
+
+def start_up():
+    """
+    Warms up, starts the fit compute executor, then starts watching processed_data for new snapshots.
+    """
+    warm_up()
+    start_executor(reload=rebuild_data, version=get_snapshot().version)
+    if DATA_RELOAD_INTERVAL > 0:
+        watch_data_dir(DATA_DIR, rebuild_data, DATA_RELOAD_INTERVAL)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if FIT_WARMUP == "blocking":
+        start_up()
+    elif FIT_WARMUP == "background":
+        threading.Thread(target=start_up, name="fit-warm-up", daemon=True).start()
+    else:
+        warm_up_status["ready"] = True
+        # No snapshot is loaded (v0), so process workers don't load anything up front either:
+        # each job builds what it needs until the watcher loads the first snapshot.
+        start_executor(reload=rebuild_data, version=None)
+        if DATA_RELOAD_INTERVAL > 0:
+            watch_data_dir(DATA_DIR, rebuild_data, DATA_RELOAD_INTERVAL)
+    yield
+    shutdown_executor()
+
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS for all routes
 app.add_middleware(
@@ -153,127 +257,231 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --- 0. Endpoint: /ready ---
+@app.get("/ready")
+def ready():
+    """
+    Readiness probe: 200 once the warm-up has finished, 503 while it is still running (or failed).
+    Also reports which processed_data snapshot is being served.
+    """
+    snapshot = get_snapshot()
+    status = dict(warm_up_status, snapshot_version=snapshot.version, snapshot_loaded_at=snapshot.loaded_at)
+    return JSONResponse(status, status_code=200 if warm_up_status["ready"] else 503)
+
 # --- 1. Endpoint: /teams ---
 @app.get("/teams")
-def get_teams():
+def get_teams(request: Request):
     """
-    Reads all rows from team_seasonal_stats.csv
-    and returns them as a list of dicts.
+    Returns all rows of team_seasonal_stats.csv as a list of dicts.
+    The encoded body is cached until the file changes; supports ETag/If-Modified-Since and gzip.
     """
-    data = []
     try:
-        with open(TEAM_SEASONAL_FILE, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                data.append(row)
+        cached = get_cached_file_response("teams", TEAM_SEASONAL_FILE)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="team_seasonal_stats.csv not found")
-    return data
+    return cached_file_response(request, cached)
 
-# --- 2. Endpoint: /teams/{team_abbr}/qbfits ---
-@app.get("/teams/{team_abbr}/qbfits")
-def qb_fits_for_team_endpoint(team_abbr: str):
+# --- Helper: one team's fits as records ---
+def split_query_list(value):
+    return [item.strip() for item in value.split(",") if item.strip()] if value else None
+
+async def run_fit_job(fn, *args):
     """
-    Return QB fit data for the given team abbreviation.
+    Runs a fit job on the compute executor; a full queue is a 503 the client can retry.
+    """
+    try:
+        return await run_compute(fn, *args, version=get_snapshot().version)
+    except ComputeBusy:
+        raise HTTPException(
+            status_code=503, detail="Too many fit requests in progress, try again shortly", headers={"Retry-After": "1"}
+        )
+
+def team_fits_body(position, team_name, limit, offset, min_fit, fields, orient):
+    """
+    Compute job for one team's fits: returns the encoded JSON, or None when the team has
+    no fits. Raises ValueError for unknown fields.
+    """
+    fits_df = TEAMS_FITS_FUNCTIONS[position]([team_name], limit, offset, min_fit, fields)[team_name]
+    # An empty page is a valid answer; an empty pool is not.
+    paged = limit is not None or offset > 0 or min_fit is not None
+    if fits_df is None or (fits_df.empty and not paged):
+        return None
+    return dumps(frame_payload(fits_df, orient))
+
+async def team_fits_response(position, team_abbr, limit=None, offset=0, min_fit=None, fields=None, orient="records"):
+    """
+    Returns one team's fits for a position as a JSON response, best first.
+
+    Parameters:
+      limit, offset: Page of the sorted results (all of them by default).
+      min_fit: Only players with final_fit >= min_fit.
+      fields: Comma-separated columns to return (e.g. "qb_name,final_fit"); all by default.
+      orient: "records" (list of rows, the default) or "columns" ({column: [values]}).
     """
     team_name = TEAM_ABBR_TO_NAME.get(team_abbr.upper())
     if not team_name:
         raise HTTPException(status_code=404, detail=f"Unknown team abbreviation: {team_abbr}")
 
-    fits_df = get_qb_fits_for_team(team_name)
-    if fits_df is None or fits_df.empty:
-        raise HTTPException(status_code=404, detail=f"No QB fits found for team: {team_abbr}")
+    try:
+        body = await run_fit_job(
+            team_fits_body, position, team_name, limit, offset, min_fit, split_query_list(fields), orient
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if body is None:
+        raise HTTPException(status_code=404, detail=f"No {position} fits found for team: {team_abbr}")
+
+    return Response(body, media_type="application/json")
 
-    return fits_df.to_dict(orient="records")
+# --- 2. Endpoint: /teams/{team_abbr}/qbfits ---
+@app.get("/teams/{team_abbr}/qbfits")
+async def qb_fits_for_team_endpoint(
+    team_abbr: str,
+    limit: Optional[int] = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+    min_fit: Optional[float] = None,
+    fields: Optional[str] = None,
+    orient: str = Query("records", pattern="^(records|columns)$")
+):
+    """
+    Return QB fit data for the given team abbreviation.
+    """
+    return await team_fits_response("QB", team_abbr, limit, offset, min_fit, fields, orient)
 
 # --- 3. Endpoint: /teams/{team_abbr}/rbfits ---
 @app.get("/teams/{team_abbr}/rbfits")
-def rb_fits_for_team_endpoint(team_abbr: str):
+async def rb_fits_for_team_endpoint(
+    team_abbr: str,
+    limit: Optional[int] = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+    min_fit: Optional[float] = None,
+    fields: Optional[str] = None,
+    orient: str = Query("records", pattern="^(records|columns)$")
+):
     """
     Return RB fit data for the given team abbreviation.
     """
-    team_name = TEAM_ABBR_TO_NAME.get(team_abbr.upper())
-    if not team_name:
-        raise HTTPException(status_code=404, detail=f"Unknown team abbreviation: {team_abbr}")
-
-    fits_df = get_rb_fits_for_team(team_name)
-    if fits_df is None or fits_df.empty:
-        raise HTTPException(status_code=404, detail=f"No RB fits found for team: {team_abbr}")
-
-    return fits_df.to_dict(orient="records")
+    return await team_fits_response("RB", team_abbr, limit, offset, min_fit, fields, orient)
 
 # --- 4. Endpoint: /teams/{team_abbr}/wrfits ---
 @app.get("/teams/{team_abbr}/wrfits")
-def wr_fits_for_team_endpoint(team_abbr: str):
+async def wr_fits_for_team_endpoint(
+    team_abbr: str,
+    limit: Optional[int] = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+    min_fit: Optional[float] = None,
+    fields: Optional[str] = None,
+    orient: str = Query("records", pattern="^(records|columns)$")
+):
     """
     Return WR fit data for the given team abbreviation.
     """
-    team_name = TEAM_ABBR_TO_NAME.get(team_abbr.upper())
-    if not team_name:
-        raise HTTPException(status_code=404, detail=f"Unknown team abbreviation: {team_abbr}")
-
-    fits_df = get_wr_fits_for_team(team_name)
-    if fits_df is None or fits_df.empty:
-        raise HTTPException(status_code=404, detail=f"No WR fits found for team: {team_abbr}")
-    
-    return fits_df.to_dict(orient="records")
+    return await team_fits_response("WR", team_abbr, limit, offset, min_fit, fields, orient)
 
 @app.get("/teams/{team_abbr}/tefits")
-def te_fits_for_team_endpoint(team_abbr: str):
+async def te_fits_for_team_endpoint(
+    team_abbr: str,
+    limit: Optional[int] = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+    min_fit: Optional[float] = None,
+    fields: Optional[str] = None,
+    orient: str = Query("records", pattern="^(records|columns)$")
+):
     """
     Return TE fit data for the given team abbreviation.
     """
-    team_name = TEAM_ABBR_TO_NAME.get(team_abbr.upper())
-    if not team_name:
-        raise HTTPException(status_code=404, detail=f"Unknown team abbreviation: {team_abbr}")
+    return await team_fits_response("TE", team_abbr, limit, offset, min_fit, fields, orient)
+
+# --- Batch endpoints: /fits and /fits/batch ---
+class FitsBatchRequest(BaseModel):
+    teams: Optional[List[str]] = None       # team abbreviations; all teams if omitted
+    positions: Optional[List[str]] = None   # e.g. ["QB", "WR"]; all positions if omitted
+    limit: Optional[int] = Field(None, ge=0)
+    offset: int = Field(0, ge=0)
+    min_fit: Optional[float] = None
+    fields: Optional[List[str]] = None
+    orient: str = Field("records", pattern="^(records|columns)$")
+
+def batch_fits_body(team_abbrs, positions, limit, offset, min_fit, fields, orient):
+    """
+    Compute job for get_batch_fits: returns the encoded {team_abbr: {position: [fit records]}}.
+    Each position's fit table and rankings are read once for all the teams.
+    """
+    team_names = [TEAM_ABBR_TO_NAME[abbr] for abbr in team_abbrs]
+    results = {abbr: {} for abbr in team_abbrs}
+    for position in positions:
+        try:
+            fits_by_team = TEAMS_FITS_FUNCTIONS[position](team_names, limit, offset, min_fit, fields)
+        except ValueError as e:
+            raise ValueError(f"{position}: {e}")
+        for abbr, team_name in zip(team_abbrs, team_names):
+            fits_df = fits_by_team[team_name]
+            results[abbr][position] = [] if fits_df is None else frame_payload(fits_df, orient)
+    return dumps(results)
+
+async def get_batch_fits(team_abbrs, positions, limit=None, offset=0, min_fit=None, fields=None, orient="records"):
+    """
+    Returns the JSON response {team_abbr: {position: [fit records]}} for every requested team and position.
+    limit, offset, min_fit and fields apply to every team's list, as on the per-team routes.
+    """
+    team_abbrs = [abbr.upper() for abbr in team_abbrs] if team_abbrs else list(TEAM_ABBR_TO_NAME)
+    positions = [position.upper() for position in positions] if positions else list(TEAMS_FITS_FUNCTIONS)
+    for abbr in team_abbrs:
+        if abbr not in TEAM_ABBR_TO_NAME:
+            raise HTTPException(status_code=404, detail=f"Unknown team abbreviation: {abbr}")
+    for position in positions:
+        if position not in TEAMS_FITS_FUNCTIONS:
+            raise HTTPException(status_code=400, detail=f"Unsupported position: {position}")
 
-    fits_df = get_te_fits_for_team(team_name)
-    if fits_df is None or fits_df.empty:
-        raise HTTPException(status_code=404, detail=f"No TE fits found for team: {team_abbr}")
+    try:
+        body = await run_fit_job(batch_fits_body, team_abbrs, positions, limit, offset, min_fit, fields, orient)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(body, media_type="application/json")
+
+@app.get("/fits")
+async def fits_endpoint(
+    teams: Optional[str] = None,
+    positions: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=0),
+    offset: int = Query(0, ge=0),
+    min_fit: Optional[float] = None,
+    fields: Optional[str] = None,
+    orient: str = Query("records", pattern="^(records|columns)$")
+):
+    """
+    Return fit data for many teams and positions in one response, e.g.
+    /fits?teams=NYJ,KC&positions=QB,WR&limit=5. Omitting teams or positions means all of them.
+    """
+    return await get_batch_fits(
+        split_query_list(teams), split_query_list(positions), limit, offset, min_fit, split_query_list(fields), orient
+    )
 
-    return fits_df.to_dict(orient="records")
+@app.post("/fits/batch")
+async def fits_batch_endpoint(request: FitsBatchRequest):
+    """
+    Same as GET /fits, with the teams and positions given as JSON lists.
+    """
+    return await get_batch_fits(
+        request.teams, request.positions, request.limit, request.offset, request.min_fit, request.fields, request.orient
+    )
 
-# --- Helper: read_csv_rows for a given position ---
-def read_csv_rows(position: str):
+# --- Helper: indexed player rows for a given position ---
+def get_position_players(position: str):
     """
-    Reads rows from the corresponding {position}_data.csv file
-    and returns a list of dicts. Adjust if your CSV is named differently.
+    Returns the in-memory PlayerIndex (rows indexed by player_id and name)
+    for the position's free agent CSV, loading it on first use.
     """
     csv_filename = POSITION_DATA_FILES[position]
     csv_path = os.path.join(DATA_DIR, csv_filename)
     try:
-        with open(csv_path, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            rows = list(reader)
-        return rows
+        return get_player_index(position, csv_path)
     except FileNotFoundError:
         raise HTTPException(
             status_code=404,
             detail=f"CSV file '{csv_filename}' not found in processed_data folder"
         )
 
-# --- Helper: optional binary search by player ID ---
-def binary_search_by_id(rows, id_key: str, target_id: str):
-    """
-    Assume 'rows' is sorted ascending by 'id_key'.
-    Perform a binary search, case-insensitive.
-    Returns the matching row or None if not found.
-    """
-    left, right = 0, len(rows) - 1
-
-    while left <= right:
-        mid = (left + right) // 2
-        mid_id = rows[mid][id_key].strip()
-
-        if mid_id == target_id:
-            return rows[mid]
-        elif mid_id < target_id:
-            left = mid + 1
-        else:
-            right = mid - 1
-
-    return None
-
 # --- 5. Universal endpoint: /teams/{team_abbr}/{position}info/{player_id} ---
 @app.get("/teams/{team_abbr}/{position}info/{player_id}")
 def get_player_info(team_abbr: str, position: str, player_id: str):
@@ -286,87 +494,83 @@ def get_player_info(team_abbr: str, position: str, player_id: str):
     if pos_upper not in FITS_FUNCTIONS:
         raise HTTPException(status_code=400, detail=f"Unsupported position: {position}")
 
-    # 2. Retrieve the correct fits DataFrame for the team + position
-    fits_df = FITS_FUNCTIONS[pos_upper](team_name)
-    if fits_df is None or fits_df.empty:
-        raise HTTPException(status_code=404, detail=f"No {pos_upper} fits found for team: {team_abbr}")
-
-    df_id_col = f"{position.lower()}_id"
-    fits_list = fits_df.to_dict(orient="records")
-    final_fit_value = None
-    adv_rankings = {}
-
-    for record in fits_list:
-        if record.get(df_id_col, "").strip() == player_id.strip():
-            final_fit_value = record.get("final_fit")
-            # If advanced ranking fields are defined for this position, extract them
-            if pos_upper in ADVANCED_RANK_FIELDS:
-                adv_rankings = {
-                    field: record.get(field) for field in ADVANCED_RANK_FIELDS[pos_upper]
-                }
-            break
-
-    if final_fit_value is None:
-        raise HTTPException(
-            status_code=404,
-            detail=f"No {pos_upper} fit data found for ID '{player_id}' on team '{team_abbr}'"
-        )
-
-    # 3. Read the CSV data for the position and perform a binary search to find the matching row
-    rows = read_csv_rows(pos_upper)
-    matched_row = binary_search_by_id(rows, "player_id", player_id)
+    # 2. Look the player up in the indexed CSV rows (by ID, falling back to player name)
+    players = get_position_players(pos_upper)
+    matched_row = find_player(players, player_id)
     if not matched_row:
+        name_matches = find_players_by_name(players, player_id)
+        matched_row = name_matches[0] if name_matches else None
+
+    # 3. Look up the player's final fit and rankings in the precomputed fit table
+    fit_record = None
+    if matched_row:
+        fit_record = PLAYER_FIT_FUNCTIONS[pos_upper](team_name, matched_row["player_id"])
+    if fit_record is None:
         raise HTTPException(
             status_code=404,
-            detail=f"No row in {pos_upper}_data.csv matched ID '{player_id}'"
+            detail=f"No {pos_upper} fit data found for ID '{player_id}' on team '{team_abbr}'"
         )
 
     # 4. Merge final_fit and advanced rankings into the matched CSV row
-    matched_row["final_fit"] = final_fit_value
-    if adv_rankings:
-        matched_row.update(adv_rankings)
+    matched_row["final_fit"] = fit_record["final_fit"]
+    if pos_upper in ADVANCED_RANK_FIELDS:
+        matched_row.update({
+            field: fit_record.get(field) for field in ADVANCED_RANK_FIELDS[pos_upper]
+        })
 
     return matched_row
 
 # --- New Endpoint: /oline ---
 @app.get("/oline")
-def get_oline_data():
+def get_oline_data(request: Request):
+    """
+    Returns all rows of fa_oline.csv (the computed linemen stats and ratings) as a list of dicts.
+    The encoded body is cached until the file changes; supports ETag/If-Modified-Since and gzip.
+    """
+    try:
+        cached = get_cached_file_response("oline", OLINE_FILE)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="oline_data.csv not found")
+    return cached_file_response(request, cached)
+
+# --- Helper: indexed O-line rows ---
+def get_oline_players():
     """
-    Reads all rows from oline_data.csv (the computed linemen stats and ratings)
-    and returns them as a list of dicts.
+    Returns the in-memory PlayerIndex for fa_oline.csv (the linemen and their ratings
+    from o_line_rating.py), indexed by id and name, loading it on first use.
     """
-    oline_csv = os.path.join(DATA_DIR, "fa_oline.csv")
-    data = []
     try:
-        with open(oline_csv, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                data.append(row)
+        return get_player_index("OL", OLINE_FILE, id_column="id", name_column="name")
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="oline_data.csv not found")
-    return data
+
+# --- New Endpoint: /teams/{team_abbr}/olineinf?ids=... ---
+@app.get("/teams/{team_abbr}/olineinf")
+def get_oline_players_info(team_abbr: str, ids: str):
+    """
+    Retrieve several linemen in one call, e.g. /teams/NYJ/olineinf?ids=0,4,12.
+    Rows come back in the order of ids; any unknown id is a 404.
+    """
+    if not TEAM_ABBR_TO_NAME.get(team_abbr.upper()):
+        raise HTTPException(status_code=404, detail=f"Unknown team abbreviation: {team_abbr}")
+
+    rows, missing = find_players(get_oline_players(), split_query_list(ids) or [])
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Players not found: {', '.join(missing)}")
+    return json_response(rows)
 
 # --- New Endpoint: /teams/{team_abbr}/olineinfo/{player_name} ---
 @app.get("/teams/{team_abbr}/olineinf/{player_id}")
 def get_oline_player_info(team_abbr: str, player_id: str):
     """
-    Retrieve a given lineman's info for a team from oline_data.csv.
+    Retrieve a given lineman's info for a team from the indexed oline_data.csv rows.
     """
     # Validate team abbreviation and convert to full team name.
     team_name = TEAM_ABBR_TO_NAME.get(team_abbr.upper())
     if not team_name:
         raise HTTPException(status_code=404, detail=f"Unknown team abbreviation: {team_abbr}")
 
-    # Build the path to oline_data.csv.
-    oline_csv = os.path.join(DATA_DIR, "fa_oline.csv")
-    try:
-        with open(oline_csv, newline='') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                if row.get("id", "").strip() == player_id:
-                    return row
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="oline_data.csv not found")
-    
-    raise HTTPException(status_code=404, detail=f"Player '{player_id}' not found")
-
+    row = find_player(get_oline_players(), player_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Player '{player_id}' not found")
+    return row
@@ -0,0 +1,127 @@
+import json
+import os
+import sys
+import time
+import pandas as pd
+import html_parsing
+from html_parsing import lxml
+from http_fetch import scrape_cache_dir
+from playerscrape import parse_available_free_agents, parse_avg_salary
+from teamscrape import parse_team_cap_data
+
+# === HTML Parsing Benchmark ===
+# Times the scrapers' parse functions with every parser backend and checks that each gives
+# exactly the same results as the original whole-page html.parser parse. The pages are the
+# ones saved in a response cache directory (by default the scrape cache, i.e. whatever the
+# last scrape fetched), or generated Spotrac-like pages if there are none. Exits with 1 if
+# any setting's results differ.
+#   python backend/scripts/bench_html_parsing.py [page directory | --synthetic]
+
+def page_kind(url):
+    if '/free-agents/' in url:
+        return 'free_agents'
+    if '/cap/' in url:
+        return 'team_cap'
+    return 'market_value'
+
+def load_pages(directory):
+    """
+    Reads the pages saved in a response cache directory, grouped by kind
+    (the kind comes from each cache entry's URL).
+    """
+    pages = {'free_agents': [], 'team_cap': [], 'market_value': []}
+    if not os.path.isdir(directory):
+        return pages
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                entry = json.load(f)
+            with open(os.path.join(directory, entry['body'] + '.html'), encoding='utf-8') as f:
+                pages[page_kind(entry['url'])].append(f.read())
+        except (OSError, ValueError, KeyError):
+            continue
+    return pages
+
+def synthetic_pages(market_value_pages=50):
+    """
+    Spotrac-like fixture pages: a free agent table, the cap table and market value pages,
+    each inside ~100 KB of navigation/script boilerplate like the real site.
+    """
+    boilerplate = ''.join(
+        f'<div class="nav"><a href="/nfl/{i}">Link {i}</a><span>Menu {i}</span></div><script>var x{i} = {i};</script>'
+        for i in range(500)
+    )
+    rows = ''.join(
+        f'<tr><td>\n  Player {i} </td><td>QB</td><td>{24 + i % 12}</td><td>{i % 9}</td><td>NYJ</td>'
+        f'<td>${1000000 + i * 12345:,}</td><td>UFA</td>'
+        f'<td>{f"<a href=/mv/{i}>Market Value</a>" if i % 5 else "-"}</td></tr>'
+        for i in range(400)
+    )
+    cap_rows = ''.join(
+        f'<tr><td>{i}</td><td>T{i} Team</td><td>53</td><td>26.1</td><td>$200,000,000</td>'
+        f'<td>${i * 1000000:,}</td><td>$250,000,000</td><td>${i * 900000:,}</td><td>a</td><td>b</td><td>c</td></tr>'
+        for i in range(32)
+    )
+    return {
+        'free_agents': [f'<html><body>{boilerplate}<table><tr><th>Player</th></tr>{rows}</table>{boilerplate}</body></html>'],
+        'team_cap': [f'<html><body>{boilerplate}<table class="datatable"><tr><th>Rank</th></tr>{cap_rows}</table></body></html>'],
+        'market_value': [
+            f'<html><body>{boilerplate}<div class="mv"><span>Avg. Salary:</span>${5000000 + i * 777:,}</div>{boilerplate}</body></html>'
+            for i in range(market_value_pages)
+        ],
+    }
+
+def parse_all(pages):
+    return {
+        'free_agents': [parse_available_free_agents(page) for page in pages['free_agents']],
+        'team_cap': [parse_team_cap_data(page) for page in pages['team_cap']],
+        'market_value': [parse_avg_salary(page) for page in pages['market_value']],
+    }
+
+def same_results(a, b):
+    for kind in ('free_agents', 'team_cap'):
+        if not all(df_a.equals(df_b) for df_a, df_b in zip(a[kind], b[kind])):
+            return False
+    return a['market_value'] == b['market_value']
+
+def main(argv):
+    if '--synthetic' in argv:
+        pages, source = synthetic_pages(), 'synthetic fixture pages'
+    else:
+        directory = argv[1] if len(argv) > 1 else scrape_cache_dir
+        pages, source = load_pages(directory), directory
+        if not any(pages.values()):
+            pages, source = synthetic_pages(), f'synthetic fixture pages (no saved pages in {directory})'
+    all_pages = [page for kind_pages in pages.values() for page in kind_pages]
+    print(f"Parsing {len(all_pages)} pages, {sum(map(len, all_pages)) / 1e6:.1f} MB, from {source}")
+
+    parsers = ['html.parser'] + (['lxml'] if lxml is not None else [])
+    configurations = [(parser, targeted) for parser in parsers for targeted in (False, True)]
+    results = []
+    baseline = None
+    for parser, targeted in configurations:
+        html_parsing.html_parser, html_parsing.targeted_parsing = parser, targeted
+        start = time.perf_counter()
+        parsed = parse_all(pages)
+        seconds = time.perf_counter() - start
+        if baseline is None:
+            baseline, baseline_seconds = parsed, seconds
+        results.append({
+            'parser': parser,
+            'targeted': targeted,
+            'seconds': round(seconds, 3),
+            'speedup': round(baseline_seconds / seconds, 1),
+            'same_output': same_results(baseline, parsed),
+        })
+    print(pd.DataFrame(results).to_string(index=False))
+    if lxml is None:
+        print("lxml is not installed; pip install lxml to benchmark it.")
+    if not all(result['same_output'] for result in results):
+        print("Some parser settings gave different results from the html.parser whole-page parse.")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,128 @@
+import csv
+import gzip
+import hashlib
+import threading
+from collections import namedtuple
+from email.utils import formatdate, parsedate_to_datetime
+from fastapi import Response
+
+from scripts.json_response import dumps
+from scripts.ranking_cache import file_fingerprint
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# === 1. Pre-serialized File Responses ===
+# /teams and /oline return a whole CSV as JSON, and the frontend asks for /teams on nearly
+# every page. The body only changes when the CSV does, so we keep it encoded (and compressed)
+# in memory per file version, and answer repeat requests with 304 Not Modified when the
+# client already has it.
+#   - fingerprint: file_fingerprint of the CSV the body was built from
+#   - bodies: {content encoding: bytes} ("identity", "gzip" and, with brotli installed, "br")
+#   - etag: weak validator of the JSON body (the same for every encoding of it)
+#   - last_modified: the CSV's modification time as an HTTP date
+CachedResponse = namedtuple('CachedResponse', ['fingerprint', 'bodies', 'etag', 'last_modified'])
+
+_responses = {}
+_responses_lock = threading.Lock()
+
+def read_csv_rows(path):
+    """
+    Returns every row of a CSV as a dict of strings (csv.DictReader).
+    """
+    with open(path, newline='') as csvfile:
+        return list(csv.DictReader(csvfile))
+
+def build_cached_response(payload, fingerprint):
+    """
+    Encodes payload once as JSON, gzip and (if available) brotli.
+    """
+    body = dumps(payload)
+    bodies = {'identity': body, 'gzip': gzip.compress(body, compresslevel=6)}
+    if brotli is not None:
+        bodies['br'] = brotli.compress(body)
+    etag = 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    last_modified = formatdate(fingerprint[0] / 1e9, usegmt=True)
+    return CachedResponse(fingerprint, bodies, etag, last_modified)
+
+def get_cached_file_response(key, path, build_payload=read_csv_rows):
+    """
+    Returns the CachedResponse for a data file, rebuilding it only when the file changed.
+    Raises FileNotFoundError if the file does not exist.
+
+    Parameters:
+      key (str): Cache key, e.g. "teams".
+      path (str): The CSV the response is built from.
+      build_payload (callable): Called with path; returns the JSON payload.
+    """
+    fingerprint = file_fingerprint(path)
+    cached = _responses.get(key)
+    if cached is not None and cached.fingerprint == fingerprint:
+        return cached
+
+    with _responses_lock:
+        cached = _responses.get(key)
+        if cached is not None and cached.fingerprint == fingerprint:
+            return cached
+        cached = build_cached_response(build_payload(path), fingerprint)
+        _responses[key] = cached
+        return cached
+
+# === 2. Conditional GET and Content Negotiation ===
+def _etag_matches(if_none_match, etag):
+    if if_none_match.strip() == '*':
+        return True
+    # Weak comparison: W/"x" and "x" match.
+    tag = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == tag:
+            return True
+    return False
+
+def _not_modified_since(if_modified_since, last_modified):
+    try:
+        return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+def _accepted_encodings(accept_encoding):
+    accepted = set()
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        params = params.replace(' ', '')
+        if params.startswith('q=') and params[2:] in ('0', '0.0', '0.00', '0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    return accepted
+
+def cached_file_response(request, cached):
+    """
+    Answers a GET from a CachedResponse: 304 if the client's If-None-Match /
+    If-Modified-Since show it is current, otherwise the body in the best encoding
+    the client accepts (br, then gzip, then identity).
+    """
+    headers = {
+        'ETag': cached.etag,
+        'Last-Modified': cached.last_modified,
+        'Cache-Control': 'no-cache',  # may be stored, but revalidate (data can be hot-reloaded)
+        'Vary': 'Accept-Encoding',
+    }
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None:
+        if _etag_matches(if_none_match, cached.etag):
+            return Response(status_code=304, headers=headers)
+    elif request.headers.get('if-modified-since') is not None:
+        if _not_modified_since(request.headers['if-modified-since'], cached.last_modified):
+            return Response(status_code=304, headers=headers)
+
+    accepted = _accepted_encodings(request.headers.get('accept-encoding', ''))
+    for encoding in ('br', 'gzip'):
+        if encoding in cached.bodies and encoding in accepted:
+            headers['Content-Encoding'] = encoding
+            return Response(cached.bodies[encoding], headers=headers, media_type='application/json')
+    return Response(cached.bodies['identity'], headers=headers, media_type='application/json')
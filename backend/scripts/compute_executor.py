@@ -0,0 +1,141 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from starlette.concurrency import run_in_threadpool
+
+# === 1. Compute Executor ===
+# The fit endpoints do pandas/NumPy work. As plain `def` handlers they all share uvicorn's
+# threadpool, so under load every request runs at once, fights over the GIL and finishes late.
+# Instead the endpoints hand their work to a dedicated executor with a fixed number of
+# workers and a bounded queue; once the queue is full new requests get a 503 straight
+# away instead of piling up behind the others.
+#   - FIT_EXECUTOR=thread (default): a small thread pool in this process
+#   - FIT_EXECUTOR=process: worker processes, each with its own copy of the fit data
+#     (loaded when the worker starts and reloaded when a new snapshot is served; if loading
+#     fails at start, the worker retries on its first job)
+#   - FIT_EXECUTOR=off: run on uvicorn's threadpool as before, without a queue limit
+#   - FIT_WORKERS: number of workers (default: CPU count, at most 4)
+#   - FIT_QUEUE_LIMIT: jobs running or waiting before requests are refused (default: 8 per worker)
+executor_kind = os.environ.get('FIT_EXECUTOR', 'thread')
+executor_workers = int(os.environ.get('FIT_WORKERS', min(4, os.cpu_count() or 1)))
+executor_queue_limit = int(os.environ.get('FIT_QUEUE_LIMIT', 8 * executor_workers))
+
+class ComputeBusy(Exception):
+    """
+    Raised by run_compute when the executor's queue is full.
+    """
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+# Worker process state (only used inside FIT_EXECUTOR=process workers)
+_worker_reload = None
+_worker_version = None
+
+def _init_worker(reload, version):
+    # Version 0 means no snapshot is loaded yet (FIT_WARMUP=off, or the warm-up failed): the
+    # worker builds what each job needs on first use, like the parent, instead of loading it all.
+    global _worker_reload, _worker_version
+    _worker_reload = reload
+    _worker_version = version
+    if reload is not None and version:
+        try:
+            reload()
+        except Exception as e:
+            # An exception here would break the whole pool (every later job fails with
+            # BrokenProcessPool), so leave the worker unloaded and retry on its first job.
+            print(f"Fit worker {os.getpid()} could not load the fit data, loading on first job: {e!r}")
+            _worker_version = None
+
+def _call_in_worker(version, fn, args):
+    # A new snapshot is being served in the parent: reload this worker's data before the job.
+    # (Before the first snapshot, version 0, jobs build what they need themselves.)
+    global _worker_version
+    if _worker_reload is not None and version and version != _worker_version:
+        _worker_reload()
+        _worker_version = version
+    return fn(*args)
+
+def start_executor(kind=None, workers=None, queue_limit=None, reload=None, version=None):
+    """
+    Starts the compute executor (replacing a running one).
+
+    Parameters:
+      kind (str): "thread", "process" or "off" (default: FIT_EXECUTOR).
+      workers (int): Number of workers (default: FIT_WORKERS).
+      queue_limit (int): Jobs running or waiting before ComputeBusy (default: FIT_QUEUE_LIMIT).
+      reload (callable): Process workers only. Module-level function that loads the fit data
+        in a worker; called when the worker starts and whenever version changes.
+      version: The snapshot version the data is currently at (0 or None: nothing loaded yet,
+        so the workers don't load anything when they start).
+    """
+    global _executor, _slots
+    kind = kind or executor_kind
+    workers = workers or executor_workers
+    queue_limit = queue_limit or executor_queue_limit
+    if kind == 'thread':
+        executor = ThreadPoolExecutor(workers, thread_name_prefix='fit-compute')
+    elif kind == 'process':
+        # spawn, not fork: the parent has running threads (warm-up, snapshot watcher).
+        executor = ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker, initargs=(reload, version)
+        )
+    elif kind == 'off':
+        executor = None
+    else:
+        raise ValueError(f"Unknown FIT_EXECUTOR: {kind}")
+
+    with _executor_lock:
+        previous = _executor
+        _executor = executor
+        _slots = threading.BoundedSemaphore(max(queue_limit, workers)) if executor is not None else None
+    if previous is not None:
+        previous.shutdown(wait=False, cancel_futures=True)
+
+def shutdown_executor():
+    """
+    Stops the compute executor; later jobs run on uvicorn's threadpool.
+    """
+    global _executor, _slots
+    with _executor_lock:
+        previous = _executor
+        _executor = None
+        _slots = None
+    if previous is not None:
+        previous.shutdown(wait=False, cancel_futures=True)
+
+# === 2. Running Jobs ===
+async def run_compute(fn, *args, version=None):
+    """
+    Runs fn(*args) on the compute executor and waits for the result without blocking
+    the event loop. fn and its arguments must be picklable when using process workers,
+    so pass module-level functions and plain values (and return e.g. encoded bytes).
+
+    Parameters:
+      version: Snapshot version the caller is serving; process workers reload their data
+        when it differs from theirs.
+
+    Raises:
+      ComputeBusy: The queue is full.
+    """
+    executor, slots = _executor, _slots
+    if executor is None:
+        return await run_in_threadpool(fn, *args)
+
+    if not slots.acquire(blocking=False):
+        raise ComputeBusy()
+    try:
+        if isinstance(executor, ProcessPoolExecutor):
+            future = executor.submit(_call_in_worker, version, fn, args)
+        else:
+            future = executor.submit(fn, *args)
+    except BaseException:
+        slots.release()
+        raise
+    # Runs when the job finishes, fails or is cancelled (e.g. the client went away).
+    future.add_done_callback(lambda _: slots.release())
+    return await asyncio.wrap_future(future)
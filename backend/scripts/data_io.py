@@ -0,0 +1,87 @@
+import os
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401  (pd.read_parquet / to_parquet engine)
+except ImportError:
+    pyarrow = None
+
+# === 1. Processed Data Format ===
+# Every processed_data table is written as CSV (what the /teams, /oline and player detail
+# endpoints and the frontend read) and, when pyarrow is installed, as a Parquet file next to
+# it (qb_data.csv -> qb_data.parquet). Parquet keeps the column dtypes, so loading it skips
+# CSV parsing and type inference and can read just the columns asked for, memory-mapped.
+#   - PROCESSED_DATA_FORMAT=parquet (default): write both, read the Parquet copy when it is current
+#   - PROCESSED_DATA_FORMAT=csv: write and read CSV only
+data_format = os.environ.get('PROCESSED_DATA_FORMAT', 'parquet')
+
+def parquet_enabled():
+    return data_format == 'parquet' and pyarrow is not None
+
+def parquet_path(csv_path):
+    """
+    Returns the Parquet sibling of a CSV path (players.csv -> players.parquet).
+    """
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+def _parquet_is_current(csv_path):
+    # Use the Parquet copy unless the CSV was rewritten after it (e.g. edited by hand).
+    pq_path = parquet_path(csv_path)
+    if not os.path.exists(pq_path):
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return os.stat(pq_path).st_mtime_ns >= os.stat(csv_path).st_mtime_ns
+
+# === 2. Reading and Writing ===
+def read_table(csv_path, columns=None):
+    """
+    Reads a processed_data table, from its Parquet copy when available.
+
+    Parameters:
+      csv_path (str): Path of the table's CSV file.
+      columns (list): Only read these columns (all by default).
+
+    Returns:
+      pd.DataFrame: The table.
+    """
+    if parquet_enabled() and _parquet_is_current(csv_path):
+        return pd.read_parquet(parquet_path(csv_path), columns=columns, memory_map=True)
+    return pd.read_csv(csv_path, usecols=columns)
+
+def _parquet_ready(df):
+    """
+    Parquet needs one type per column: object columns that mix strings with numbers
+    (e.g. a contract column holding both "$1M" and 0) are written as strings.
+    """
+    df = df.reset_index(drop=True)
+    for col in df.columns[df.dtypes == object]:
+        values = df[col].dropna()
+        if values.map(type).nunique() > 1:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+def write_table(df, csv_path):
+    """
+    Writes a processed_data table as CSV and, when enabled, as Parquet next to it.
+    The Parquet file is written last, so it is never older than the CSV it mirrors.
+    """
+    df.to_csv(csv_path, index=False)
+    if parquet_enabled():
+        _parquet_ready(df).to_parquet(parquet_path(csv_path), index=False)
+
+def convert_directory(data_dir):
+    """
+    Writes a Parquet copy of every CSV in data_dir (for data written before Parquet support).
+    """
+    for name in sorted(os.listdir(data_dir)):
+        if name.endswith('.csv'):
+            csv_path = os.path.join(data_dir, name)
+            _parquet_ready(pd.read_csv(csv_path)).to_parquet(parquet_path(csv_path), index=False)
+            print(f"Wrote {parquet_path(csv_path)}")
+
+if __name__ == "__main__":
+    if pyarrow is None:
+        print("pyarrow is not installed; nothing to convert.")
+    else:
+        convert_directory('backend/processed_data')
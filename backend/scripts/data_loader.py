@@ -1,26 +1,92 @@
+import os
 import nfl_data_py as nfl
 import pandas as pd
+from data_io import read_table, write_table, parquet_path
 
-def load_pbp_data():
+# Columns used by the team stats (weekly_seasonal_data.py); season is kept for multi-year trends
+PBP_COLUMNS = [
+    "posteam", "week", "pass_attempt", "rush_attempt", "shotgun", "no_huddle",
+    "qb_scramble", "first_down_rush", "first_down_pass", "qb_dropback",
+    "pass_length", "pass_location", "run_location", "run_gap", "yards_after_catch",
+    "play_type", "yards_gained", "air_yards", "epa", "ydstogo", "down", "season"
+]
+
+# Downcasting: text columns with a handful of values become categoricals, 0/1 flags and small
+# counts become 8/16-bit numbers. yards/EPA stay float64 so the team averages don't change.
+PBP_CATEGORY_COLUMNS = ["posteam", "pass_length", "pass_location", "run_location", "run_gap", "play_type"]
+PBP_SMALL_NUMBER_COLUMNS = [
+    "week", "season", "down", "ydstogo", "pass_attempt", "rush_attempt", "shotgun", "no_huddle",
+    "qb_scramble", "first_down_rush", "first_down_pass", "qb_dropback"
+]
+
+# Filtered play-by-play is cached here, one file per season (pbp_2024.csv / .parquet).
+# Finished seasons don't change, so they are read from the cache; the current season is
+# still being played and is downloaded again on every load unless asked otherwise.
+RAW_CACHE_DIR = 'backend/raw_data'
+CURRENT_SEASON = 2024
+
+def pbp_cache_path(season):
+    return os.path.join(RAW_CACHE_DIR, f'pbp_{season}.csv')
+
+def downcast_pbp(df):
     """
-    Load and filter NFL play-by-play data.
+    Shrink the play-by-play dtypes: categoricals for the text columns, the smallest integer
+    type for whole-number columns without gaps, float32 for 0/1 flags with missing values.
     """
-    # Load play-by-play data
-    pbp_data = nfl.import_pbp_data([2024])
-    
+    df = df.copy()
+    for col in PBP_CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col in PBP_SMALL_NUMBER_COLUMNS:
+        if col in df.columns:
+            values = pd.to_numeric(df[col])
+            df[col] = pd.to_numeric(values, downcast='integer' if values.notna().all() else 'float')
+    return df
+
+def fetch_pbp_season(season):
+    """
+    Download one season of play-by-play (only PBP_COLUMNS) and keep the offensive plays.
+    """
+    pbp_data = nfl.import_pbp_data([season], columns=PBP_COLUMNS, downcast=False)
+
     # Filter for offensive plays only
     pbp_offense = pbp_data[
-        (pbp_data['play_type'].isin(['pass', 'run'])) & 
+        (pbp_data['play_type'].isin(['pass', 'run'])) &
         (pbp_data['posteam'].notna())
     ]
-    
-    # Select relevant columns
-    columns_to_keep = [
-        "posteam", "week", "pass_attempt", "rush_attempt", "shotgun", "no_huddle",
-        "qb_scramble", "first_down_rush", "first_down_pass", "qb_dropback",
-        "pass_length", "pass_location", "run_location", "run_gap", "yards_after_catch",
-        "play_type", "yards_gained", "air_yards", "epa", "ydstogo", "down"
-    ]
-    pbp_offense = pbp_offense[columns_to_keep]
-    
-    return pbp_offense 
\ No newline at end of file
+    return pbp_offense[PBP_COLUMNS]
+
+def load_pbp_season(season, refresh=False):
+    """
+    Return one season of filtered play-by-play from the local cache, downloading it
+    (and caching it) if it isn't cached yet or refresh is set.
+    """
+    path = pbp_cache_path(season)
+    if not refresh and (os.path.exists(path) or os.path.exists(parquet_path(path))):
+        return read_table(path)
+    pbp_offense = downcast_pbp(fetch_pbp_season(season))
+    os.makedirs(RAW_CACHE_DIR, exist_ok=True)
+    write_table(pbp_offense, path)
+    return pbp_offense
+
+def load_pbp_data(seasons=(CURRENT_SEASON,), refresh=None):
+    """
+    Load and filter NFL play-by-play data.
+
+    Parameters:
+      seasons (list, tuple or range): Seasons to load, e.g. range(2019, 2025).
+      refresh (bool or list): Which seasons to download again instead of using the cached
+        copies: None (default) for CURRENT_SEASON only, True for every season, a list for
+        just those seasons, False to use the cache for all of them.
+
+    Returns:
+      pd.DataFrame: Offensive plays (pass and run) with PBP_COLUMNS, downcast.
+    """
+    if refresh is None:
+        refresh = [CURRENT_SEASON]
+    frames = []
+    for season in seasons:
+        refresh_season = refresh is True or (refresh is not False and season in refresh)
+        frames.append(load_pbp_season(season, refresh_season))
+    # Categories differ between seasons, so downcast again after combining them
+    return downcast_pbp(pd.concat(frames, ignore_index=True))
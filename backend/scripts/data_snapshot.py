@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+from scripts.ranking_cache import file_fingerprint
+
+# === 1. Snapshots ===
+# The fit tables, rankings and player indexes are all built from backend/processed_data.
+# A snapshot is one version of that directory: when the scrapers write new CSVs, a watcher
+# thread notices the change, rebuilds everything off the request path and swaps the new
+# objects in, so requests keep being served from the previous version until then.
+#   - version: increases by one on every swap (1 is the first load)
+#   - fingerprint: {file name: (mtime ns, size)} of the data files it was built from
+#   - loaded_at: time.time() of the swap
+Snapshot = namedtuple('Snapshot', ['version', 'fingerprint', 'loaded_at'])
+
+data_file_suffixes = ('.csv', '.parquet')
+
+_snapshot = Snapshot(0, None, None)
+_reload_lock = threading.Lock()
+
+def directory_fingerprint(data_dir, suffixes=None):
+    """
+    Fingerprints every data file in data_dir: {file name: (mtime ns, size)}.
+    Any rewritten, added or removed file changes it.
+    """
+    if suffixes is None:
+        suffixes = data_file_suffixes
+    fingerprint = {}
+    for name in sorted(os.listdir(data_dir)):
+        if name.endswith(suffixes):
+            try:
+                fingerprint[name] = file_fingerprint(os.path.join(data_dir, name))
+            except FileNotFoundError:
+                # Removed between listdir and stat (e.g. a scraper replacing it)
+                continue
+    return fingerprint
+
+def get_snapshot():
+    """
+    Returns the Snapshot currently being served.
+    """
+    return _snapshot
+
+def reload_snapshot(data_dir, rebuild, fingerprint=None):
+    """
+    Rebuilds everything from data_dir and records the new snapshot.
+
+    Parameters:
+      data_dir (str): The processed_data directory.
+      rebuild (callable): Builds the new fit tables, rankings and indexes and swaps them in.
+        Requests keep using the old objects until it swaps them.
+      fingerprint (dict): directory_fingerprint taken before the rebuild started; taken now if omitted.
+
+    Returns:
+      Snapshot: The new snapshot.
+    """
+    global _snapshot
+    with _reload_lock:
+        if fingerprint is None:
+            fingerprint = directory_fingerprint(data_dir)
+        rebuild()
+        _snapshot = Snapshot(_snapshot.version + 1, fingerprint, time.time())
+        return _snapshot
+
+# === 2. Watching processed_data ===
+def watch_data_dir(data_dir, rebuild, interval=10.0):
+    """
+    Starts a daemon thread that polls data_dir every interval seconds and reloads the
+    snapshot when its files change. A change is only picked up once the directory has
+    been stable for one full interval, so a scrape that writes several files in a row
+    triggers one reload instead of several half-updated ones.
+
+    Returns:
+      threading.Thread: The watcher thread.
+    """
+    def watch():
+        pending = None
+        failed = None
+        while True:
+            time.sleep(interval)
+            try:
+                fingerprint = directory_fingerprint(data_dir)
+            except OSError as e:
+                print(f"Snapshot watcher could not read {data_dir}: {e}")
+                continue
+            if fingerprint == _snapshot.fingerprint or fingerprint == failed:
+                pending = None
+                continue
+            if fingerprint != pending:
+                # Changed since the last poll: wait until it settles.
+                pending = fingerprint
+                continue
+            try:
+                snapshot = reload_snapshot(data_dir, rebuild, fingerprint)
+                print(f"Loaded processed_data snapshot v{snapshot.version}")
+            except Exception as e:
+                # Keep serving the previous snapshot; retry once the files change again.
+                print(f"Snapshot reload failed, keeping v{_snapshot.version}: {e!r}")
+                failed = fingerprint
+            pending = None
+
+    thread = threading.Thread(target=watch, name='snapshot-watcher', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+
+# === 1. Coefficient Matrices ===
+# Every scheme's raw fit is a weighted sum of scaled stats, e.g. for an Air Raid QB:
+#     0.45 * (0.4 * yards_pg + 0.2 * tds_pg + ...) + 0.55 * (0.30 * epa + ... - 0.25 * ints)
+# Each position describes those weights as nested "terms" dicts:
+#   - a float value is the coefficient of a column,
+#   - a (weight, terms) tuple is a sub-component (prod, eff, ...) scaled by weight,
+#   - the INTERCEPT key holds a constant (used for terms like 0.10 * (1 - x)).
+# Flattening the terms for all 7 schemes gives a (features x schemes) matrix, so scoring
+# every player against every scheme is a single matrix product.
+INTERCEPT = 'const'
+
+CoefficientMatrix = namedtuple('CoefficientMatrix', ['schemes', 'features', 'weights', 'intercepts'])
+
+def flatten_terms(terms, scale=1.0, flat=None):
+    """
+    Flattens a nested terms dict into {column: coefficient}, multiplying
+    each coefficient by the weights of the components that contain it.
+    """
+    if flat is None:
+        flat = {}
+    for key, value in terms.items():
+        if isinstance(value, tuple):
+            weight, sub_terms = value
+            flatten_terms(sub_terms, scale * weight, flat)
+        else:
+            flat[key] = flat.get(key, 0.0) + scale * value
+    return flat
+
+def build_coefficient_matrix(coefficients, schemes):
+    """
+    Builds the coefficient matrix for a position.
+
+    Parameters:
+      coefficients (dict): Mapping of scheme name to its nested terms dict.
+      schemes (list): Scheme names, in the column order of the matrix.
+
+    Returns:
+      CoefficientMatrix: features (list of columns), weights (features x schemes array)
+      and intercepts (one constant per scheme).
+    """
+    flat = {scheme: flatten_terms(coefficients[scheme]) for scheme in schemes}
+    features = []
+    for scheme in schemes:
+        for col in flat[scheme]:
+            if col != INTERCEPT and col not in features:
+                features.append(col)
+
+    weights = np.zeros((len(features), len(schemes)))
+    intercepts = np.zeros(len(schemes))
+    for j, scheme in enumerate(schemes):
+        for col, coef in flat[scheme].items():
+            if col == INTERCEPT:
+                intercepts[j] = coef
+            else:
+                weights[features.index(col), j] = coef
+    return CoefficientMatrix(list(schemes), features, weights, intercepts)
+
+# === 2. Scoring ===
+def feature_matrix(frame, features):
+    """
+    Returns the (players x features) array for the given columns.
+    Columns missing from the frame count as 0, like row.get(col, 0) in the scalar functions.
+    """
+    values = np.zeros((len(frame), len(features)))
+    for i, col in enumerate(features):
+        if col in frame.columns:
+            values[:, i] = frame[col].to_numpy(dtype=float)
+    return values
+
+def score_players(frame, matrix):
+    """
+    Scores every player in frame against every scheme in one matrix product.
+    Returns a (players x schemes) array of raw fits.
+    """
+    return feature_matrix(frame, matrix.features) @ matrix.weights + matrix.intercepts
+
+def row_fit_functions(matrix):
+    """
+    Per-player versions of score_players for the row-by-row code (build_fit_*_df):
+    {scheme: function(row) -> raw fit}, read off the coefficient matrix, so the
+    coefficient tables are the only place the scheme weights are written down.
+    Columns missing from the row count as 0.
+    """
+    def row_fit(j):
+        terms = [(col, matrix.weights[i, j]) for i, col in enumerate(matrix.features) if matrix.weights[i, j] != 0]
+        intercept = matrix.intercepts[j]
+
+        def fit(row):
+            return intercept + sum(coef * row.get(col, 0) for col, coef in terms)
+        return fit
+    return {scheme: row_fit(j) for j, scheme in enumerate(matrix.schemes)}
+
+def score_row_terms(row, terms):
+    """
+    Weighted sum of a nested terms dict (e.g. a position's production terms) for one player row.
+    """
+    return sum(coef if col == INTERCEPT else coef * row.get(col, 0) for col, coef in flatten_terms(terms).items())
+
+def top3_scheme_mask(team_frame, score_columns):
+    """
+    Marks each team's 3 highest-scoring schemes.
+
+    Parameters:
+      team_frame (pd.DataFrame): One row per team.
+      score_columns (dict): Mapping of scheme name to its team score column, in matrix order.
+
+    Returns:
+      np.ndarray: A (teams x schemes) boolean matrix.
+    """
+    scores = team_frame[list(score_columns.values())].to_numpy(dtype=float)
+    # A stable sort on the negated scores keeps ties in scheme order, like sorted(reverse=True).
+    top3 = np.argsort(-scores, axis=1, kind='stable')[:, :3]
+    mask = np.zeros(scores.shape, dtype=bool)
+    np.put_along_axis(mask, top3, True, axis=1)
+    return mask
+
+def top3_scheme_weights(team_frame, score_columns):
+    """
+    Vectorized get_top3_scheme_weights_*: for each team keeps its 3 highest scheme
+    scores, normalized to sum to 1, and zeroes the rest.
+    Returns a (teams x schemes) weight matrix.
+    """
+    scores = team_frame[list(score_columns.values())].to_numpy(dtype=float)
+    top3 = np.where(top3_scheme_mask(team_frame, score_columns), scores, 0.0)
+    return top3 / top3.sum(axis=1, keepdims=True)
+
+def combine_scheme_fits(raw_fits, scheme_weights, skip_nonfinite=True):
+    """
+    Weights each player's raw scheme fits by each team's scheme weights.
+
+    Parameters:
+      raw_fits (np.ndarray): (players x schemes) raw fits from score_players.
+      scheme_weights (np.ndarray): (teams x schemes) weights from top3_scheme_weights.
+      skip_nonfinite (bool): Drop non-finite raw fits from the sum (as the QB/RB/WR
+        final fit functions do) instead of propagating NaN (as the TE app does).
+
+    Returns:
+      np.ndarray: A (players x teams) array of weighted base fits.
+    """
+    finite = np.isfinite(raw_fits)
+    combined = np.where(finite, raw_fits, 0.0) @ scheme_weights.T
+    if not skip_nonfinite:
+        # Only schemes a team actually weights can poison its sum.
+        poisoned = (~finite).astype(float) @ (scheme_weights > 0).T.astype(float)
+        combined[poisoned > 0] = np.nan
+    return combined
+
+# === 3. Helpers ===
+def column_or_fallback(frame, column, fallback):
+    """
+    Vectorized row.get(column, row.get(fallback)): returns the first column that exists.
+    """
+    if column in frame.columns:
+        return frame[column]
+    if fallback in frame.columns:
+        return frame[fallback]
+    return pd.Series(np.nan, index=frame.index)
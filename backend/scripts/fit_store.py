@@ -0,0 +1,137 @@
+import hashlib
+import json
+import os
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+from scripts.fit_tensor import make_fit_table
+from scripts.data_snapshot import directory_fingerprint
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, writes are still atomic
+    fcntl = None
+
+# === 1. Shared Fit Store ===
+# With several uvicorn workers (or FIT_EXECUTOR=process), every process used to load the
+# imputed/scaled player data and build its own copy of each fit table. Instead the first
+# process to need a table builds it and writes it here; every process (including that one)
+# then memory-maps the fits matrix read-only, so the OS keeps a single copy in the page
+# cache for all of them and the other workers never load the feature data at all.
+# A stored table is only reused if it was built from the current processed_data files
+# (and the same build settings, e.g. the QB floor mode), otherwise it is rebuilt.
+#   - <position>_fits.npy: the (players x teams) fits matrix, opened with mmap_mode='r'
+#   - <position>_frames.pkl: team names and the per-player output columns
+#   - <position>.json: the key the files were built for, written last
+#   - FIT_STORE_DIR: where to keep them (default processed_data/fit_store; empty turns sharing off)
+fit_store_dir = os.environ.get('FIT_STORE_DIR', 'processed_data/fit_store')
+fit_store_data_dir = 'processed_data'
+fit_store_format = 1
+
+def fit_store_enabled():
+    return bool(fit_store_dir)
+
+def fit_store_key(position, build_key=''):
+    """
+    Identifies what a stored table was built from: the processed_data fingerprint,
+    the position's build settings and the store format.
+    """
+    fingerprint = directory_fingerprint(fit_store_data_dir)
+    text = json.dumps([fit_store_format, position, build_key, sorted(fingerprint.items())])
+    return hashlib.sha1(text.encode()).hexdigest()
+
+def _store_path(position, suffix):
+    return os.path.join(fit_store_dir, f"{position.lower()}{suffix}")
+
+@contextmanager
+def _store_lock(position, exclusive):
+    # Readers share the lock; a writer waits for them and holds it alone.
+    if fcntl is None:
+        yield
+        return
+    os.makedirs(fit_store_dir, exist_ok=True)
+    with open(_store_path(position, '.lock'), 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def _replace_file(path, write):
+    # Write next to the target and rename over it, so readers (and existing memory maps)
+    # only ever see a complete file.
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+# === 2. Writing and Attaching ===
+def write_fit_table(position, table, key, id_column):
+    """
+    Stores a FitTable's arrays for other processes. The manifest goes last, so a
+    half-written table is never picked up.
+    """
+    os.makedirs(fit_store_dir, exist_ok=True)
+
+    def save_fits(path):
+        with open(path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(table.fits, dtype=float))
+
+    def save_manifest(path):
+        with open(path, 'w') as f:
+            json.dump({'key': key, 'id_column': id_column}, f)
+
+    _replace_file(_store_path(position, '_fits.npy'), save_fits)
+    _replace_file(_store_path(position, '_frames.pkl'),
+                  lambda path: pd.to_pickle({'team_names': table.team_names, 'players': table.players}, path))
+    _replace_file(_store_path(position, '.json'), save_manifest)
+
+def attach_fit_table(position, key, floor=None):
+    """
+    Returns the stored FitTable for position with its fits memory-mapped read-only,
+    or None if nothing was stored for this key.
+    """
+    try:
+        with open(_store_path(position, '.json')) as f:
+            manifest = json.load(f)
+        if manifest.get('key') != key:
+            return None
+        frames = pd.read_pickle(_store_path(position, '_frames.pkl'))
+        fits = np.load(_store_path(position, '_fits.npy'), mmap_mode='r')
+    except (OSError, ValueError):
+        return None
+    return make_fit_table(frames['team_names'], frames['players'], fits, manifest['id_column'], floor)
+
+def shared_fit_table(position, build_fit_table, id_column, build_key='', floor=None):
+    """
+    Returns the position's FitTable from the shared store, building and storing it
+    first if no process has done so for the current data yet.
+
+    Parameters:
+      position (str): Position key, e.g. "QB".
+      build_fit_table (callable): Builds the FitTable when the store is out of date.
+      id_column (str): The players' id column (e.g. "qb_id").
+      build_key (str): Settings that change the built fits (e.g. the QB floor mode and seed).
+      floor (callable): Read-time floor to attach to the table (see FitTable).
+    """
+    if not fit_store_enabled():
+        return build_fit_table()
+
+    key = fit_store_key(position, build_key)
+    with _store_lock(position, exclusive=False):
+        table = attach_fit_table(position, key, floor)
+    if table is not None:
+        return table
+
+    with _store_lock(position, exclusive=True):
+        # Another worker may have built it while we waited for the lock.
+        table = attach_fit_table(position, key, floor)
+        if table is not None:
+            return table
+        table = build_fit_table()
+        try:
+            write_fit_table(position, table, key, id_column)
+        except OSError as e:
+            print(f"Could not write the {position} fit table to {fit_store_dir}: {e}")
+            return table
+        return attach_fit_table(position, key, floor) or table
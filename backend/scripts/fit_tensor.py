@@ -0,0 +1,161 @@
+import threading
+import numpy as np
+from collections import namedtuple
+
+# === 1. Fit Tables ===
+# For each position we score every free agent against every team once and keep the
+# (players x teams) matrix in memory. A fit request then only slices one team's column
+# and sorts it, instead of running a full scoring pass.
+#   - team_names: pd.Series of team names, one per column of fits
+#   - players: pd.DataFrame of the per-player output columns (name, id, aav, ...)
+#   - fits: np.ndarray of final fits, shape (players, teams)
+#   - player_index: dict of player id -> row of fits
+#   - floor: optional callable(fits) applied whenever fits are read (e.g. the QB floor)
+FitTable = namedtuple('FitTable', ['team_names', 'players', 'fits', 'player_index', 'floor'])
+
+_fit_tables = {}
+_fit_tables_lock = threading.Lock()
+
+def make_fit_table(team_names, players, fits, id_column, floor=None):
+    """
+    Builds a FitTable, indexing its rows by the players' id_column (e.g. "qb_id").
+    """
+    player_index = {str(player_id).strip(): row for row, player_id in enumerate(players[id_column])}
+    return FitTable(team_names, players, fits, player_index, floor)
+
+def get_fit_table(position, build_fit_table):
+    """
+    Returns the cached FitTable for a position, building it on first use.
+
+    Parameters:
+      position (str): Position key, e.g. "QB".
+      build_fit_table (callable): Builds the FitTable when it is not cached yet.
+    """
+    table = _fit_tables.get(position)
+    if table is None:
+        with _fit_tables_lock:
+            table = _fit_tables.get(position)
+            if table is None:
+                table = build_fit_table()
+                _fit_tables[position] = table
+    return table
+
+def replace_fit_tables(tables):
+    """
+    Swaps in a new set of FitTables ({position: FitTable}) at once. Requests already
+    holding a table finish with it; the next get_fit_table call sees the new one.
+    """
+    global _fit_tables
+    with _fit_tables_lock:
+        _fit_tables = dict(tables)
+
+def clear_fit_tables():
+    """
+    Drops every cached FitTable so the next request rebuilds it.
+    """
+    with _fit_tables_lock:
+        _fit_tables.clear()
+
+# === 2. Slicing ===
+def find_team_column(table, team_name):
+    """
+    Returns the fits column of the first team whose name contains team_name
+    (case-insensitive, like the team_df lookups), or None if no team matches.
+    """
+    matches = np.flatnonzero(table.team_names.str.contains(team_name, case=False, na=False).to_numpy())
+    if len(matches) == 0:
+        return None
+    return int(matches[0])
+
+def get_team_fits(table, team_name):
+    """
+    Returns a copy of one team's final fits as a 1-D array, or None if the team is unknown.
+    """
+    column = find_team_column(table, team_name)
+    if column is None:
+        return None
+    final_fit = table.fits[:, column].copy()
+    if table.floor is not None:
+        final_fit = table.floor(final_fit)
+    return final_fit
+
+def get_player_fit(table, team_name, player_id):
+    """
+    Returns one player's final fit for a team as a float, or None if the team or player is unknown.
+    """
+    column = find_team_column(table, team_name)
+    row = table.player_index.get(player_id.strip())
+    if column is None or row is None:
+        return None
+    final_fit = table.fits[row:row + 1, column]
+    if table.floor is not None:
+        final_fit = table.floor(final_fit)
+    return float(final_fit[0])
+
+def top_fit_rows(final_fit, limit=None, offset=0, min_fit=None):
+    """
+    Returns the rows of the best fits, best first: rows offset .. offset + limit of the
+    fits sorted descending (ties keep table order, NaN fits go last), keeping only
+    fits >= min_fit when it is given.
+
+    With a limit, only the top offset + limit candidates are found (np.partition, O(n))
+    and sorted, instead of sorting every player. The rows are the same as slicing the
+    full sort, so pages line up with the unpaginated response.
+    """
+    rows = np.arange(len(final_fit))
+    if min_fit is not None:
+        rows = rows[final_fit >= min_fit]
+    fits = -final_fit[rows]
+    if limit is not None:
+        k = offset + limit
+        if k == 0:
+            return rows[:0]
+        if k < len(rows):
+            # Keep everything at least as good as the k-th best, so ties at the cutoff
+            # are resolved by the stable sort below, exactly as in a full sort.
+            kth = np.partition(fits, k - 1)[k - 1]
+            if not np.isnan(kth):
+                keep = fits <= kth
+                rows, fits = rows[keep], fits[keep]
+    order = np.argsort(fits, kind='stable')
+    end = None if limit is None else offset + limit
+    return rows[order][offset:end]
+
+def sorted_team_fits(table, ranked_players, team_names, limit=None, offset=0, min_fit=None, fields=None):
+    """
+    Builds the sorted fit results for several teams from one fit table.
+
+    Parameters:
+      table (FitTable): The position's fit table.
+      ranked_players (pd.DataFrame): table.players with the ranking columns merged in
+        (same rows, same order). Merging once here instead of once per team is what
+        makes a multi-team request cheap.
+      team_names (list): Team names to slice.
+      limit, offset, min_fit: Page of the results to return (see top_fit_rows).
+      fields (list): Only return these columns ("final_fit" included); all by default.
+
+    Returns:
+      dict: team_name -> DataFrame sorted by final_fit (descending), or None if the team is unknown.
+    """
+    # final_fit goes right after the player columns, before the ranking columns.
+    fit_column = len(table.players.columns)
+    if fields is not None:
+        unknown = [field for field in fields if field != 'final_fit' and field not in ranked_players.columns]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        columns = [col for col in ranked_players.columns if col in fields]
+        fit_column = len([col for col in table.players.columns if col in fields])
+        ranked_players = ranked_players[columns]
+
+    results = {}
+    for team_name in team_names:
+        final_fit = get_team_fits(table, team_name)
+        if final_fit is None:
+            results[team_name] = None
+            continue
+        rows = top_fit_rows(final_fit, limit, offset, min_fit)
+        team_fits = ranked_players.iloc[rows].reset_index(drop=True)
+        if fields is None or 'final_fit' in fields:
+            team_fits.insert(fit_column, 'final_fit', final_fit[rows])
+        results[team_name] = team_fits
+    return results
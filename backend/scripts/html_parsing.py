@@ -0,0 +1,74 @@
+import os
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
+
+try:
+    import lxml  # noqa: F401  (BeautifulSoup "lxml" parser)
+except ImportError:
+    lxml = None
+
+# === HTML Parsing Backend ===
+# Parsing is most of the CPU time of a scrape (hundreds of market value pages), so the
+# scrapers parse through these helpers instead of building a full BeautifulSoup tree with
+# the pure-Python html.parser every time:
+#   - SCRAPE_HTML_PARSER: BeautifulSoup parser to use (default lxml when installed, else html.parser)
+#   - SCRAPE_TARGETED_PARSE=1 (default): only parse what is read, i.e. the <tr> rows of a
+#     table page (SoupStrainer) or the snippet around a label; 0 parses whole pages as before
+# bench_html_parsing.py checks every combination gives the same DataFrames and times them.
+html_parser = os.environ.get('SCRAPE_HTML_PARSER') or ('lxml' if lxml is not None else 'html.parser')
+targeted_parsing = os.environ.get('SCRAPE_TARGETED_PARSE', '1') != '0'
+
+def make_soup(html, only=None):
+    """
+    Parses html with the configured parser, keeping only the `only` tags (and what is
+    inside them) when targeted parsing is on.
+    """
+    parse_only = SoupStrainer(only) if only and targeted_parsing else None
+    return BeautifulSoup(html, html_parser, parse_only=parse_only)
+
+def table_rows(html):
+    """
+    Returns every <tr> of a page, in document order.
+    """
+    return make_soup(html, 'tr').find_all('tr')
+
+def _text_after_span(soup, label):
+    # (found, text): found is False if no <span> has exactly this text
+    span = soup.find('span', string=label)
+    if span is None:
+        return False, None
+    sibling = span.next_sibling
+    if isinstance(sibling, NavigableString):
+        return True, str(sibling)
+    return True, None
+
+def _starts_tag(html, pos):
+    # "<" followed by a tag name or "/": every parser ends the text before it
+    return html[pos + 1:pos + 2].isalpha() or html[pos + 1:pos + 2] == '/'
+
+def text_after_label(html, label):
+    """
+    Returns the text right after the first <span> whose text is exactly label
+    (e.g. "Avg. Salary:" in <span>Avg. Salary:</span>$13,462,485 -> "$13,462,485"),
+    or None if there is no such span or it isn't followed by text.
+
+    With targeted parsing only the snippet from that <span ...> to the next tag after
+    it is parsed; the whole page is parsed if the label can't be located that way or the
+    text after it doesn't end at a plain tag (e.g. a comment follows).
+    """
+    if targeted_parsing:
+        start = html.find(label)
+        while start != -1:
+            span_start = html.rfind('<span', 0, start)
+            span_end = html.find('</span>', start)
+            if span_start != -1 and span_end != -1:
+                text_end = html.find('<', span_end + len('</span>'))
+                if text_end != -1 and not _starts_tag(html, text_end):
+                    # A comment, CDATA or a stray "<" after the label: the snippet would end
+                    # somewhere a whole-page parse doesn't, so parse the whole page instead.
+                    break
+                snippet = html[span_start:text_end if text_end != -1 else len(html)]
+                found, text = _text_after_span(BeautifulSoup(snippet, html_parser), label)
+                if found:
+                    return text
+            start = html.find(label, start + 1)
+    return _text_after_span(make_soup(html), label)[1]
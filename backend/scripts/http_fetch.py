@@ -0,0 +1,328 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import time
+import httpx
+
+# === Async HTTP Fetching ===
+# Shared fetch layer for the scrapers (playerscrape.py, teamscrape.py). All requests of a
+# scrape go through one pooled keep-alive client instead of a new connection per page, and:
+#   - a token bucket per host caps the request rate (rate requests/second, bursts up to burst)
+#   - a semaphore per host caps how many requests to it are in flight at once
+#   - failed requests (connection errors, timeouts, 429 and 5xx) are retried with jittered
+#     exponential backoff, honoring Retry-After when the site sends one
+#   - pages are kept in an on-disk cache (see ResponseCache), so re-runs don't hit the site again
+# The scripts are synchronous, so fetch_text / fetch_many run the event loop for them.
+
+default_headers = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+retry_statuses = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """
+    Allows rate acquisitions per second on average, up to burst at once.
+    """
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        if not self.rate:
+            return
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+# === Response Cache ===
+# Pages fetched by the scrapers are stored on disk, so pipeline re-runs (e.g. after a later
+# step failed) don't download the Spotrac tables and market value pages again:
+#   - within SCRAPE_CACHE_TTL seconds of being fetched a page is served from disk, no request
+#   - after that it is revalidated with If-None-Match / If-Modified-Since; a 304 keeps the stored copy
+# Bodies are stored by the SHA-256 of their content (<sha>.html); each URL has a small entry
+# (<sha of url>.json) with its ETag, Last-Modified, fetch time and body hash.
+# Entries not fetched or revalidated for SCRAPE_CACHE_MAX_AGE are removed, with the bodies no
+# entry uses any more, when a scrape starts (at most once per PRUNE_INTERVAL in a process), so
+# the cache doesn't keep every page ever fetched (e.g. market value pages of past classes).
+#   - SCRAPE_CACHE_DIR: where (default backend/raw_data/http_cache; empty turns the cache off)
+#   - SCRAPE_CACHE_TTL: seconds a page is used without asking the site (default 12 hours)
+#   - SCRAPE_CACHE_MAX_AGE: seconds an unused page is kept (default 14 days; 0 keeps everything)
+scrape_cache_dir = os.environ.get('SCRAPE_CACHE_DIR', 'backend/raw_data/http_cache')
+scrape_cache_ttl = float(os.environ.get('SCRAPE_CACHE_TTL', 12 * 60 * 60))
+scrape_cache_max_age = float(os.environ.get('SCRAPE_CACHE_MAX_AGE', 14 * 24 * 60 * 60))
+PRUNE_INTERVAL = 60 * 60
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+def _remove(path):
+    try:
+        os.remove(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+class ResponseCache:
+    """
+    On-disk cache of page bodies keyed by URL (see above). max_age of 0 or None never prunes.
+    """
+    def __init__(self, directory, ttl, max_age=None):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_age = max_age
+        self.pruned_at = None
+
+    def _entry_path(self, url):
+        return os.path.join(self.directory, _sha256(url.encode()) + '.json')
+
+    def _body_path(self, body_hash):
+        return os.path.join(self.directory, body_hash + '.html')
+
+    def get(self, url):
+        """
+        Returns (entry, text) for url, or (None, None) if it isn't cached.
+        """
+        try:
+            with open(self._entry_path(url)) as f:
+                entry = json.load(f)
+            with open(self._body_path(entry['body']), 'rb') as f:
+                return entry, f.read().decode('utf-8')
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched_at'] < self.ttl
+
+    def validators(self, entry):
+        """
+        Conditional request headers for revalidating a cached entry.
+        """
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, response):
+        """
+        Stores a 200 response's body and validators.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        body = response.text.encode('utf-8')
+        body_hash = _sha256(body)
+        if not os.path.exists(self._body_path(body_hash)):
+            _write_atomic(self._body_path(body_hash), body)
+        self._write_entry(url, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+            'body': body_hash,
+        })
+
+    def touch(self, url, entry):
+        """
+        Marks a cached entry as just revalidated (the site answered 304).
+        """
+        self._write_entry(url, dict(entry, fetched_at=time.time()))
+
+    def _write_entry(self, url, entry):
+        _write_atomic(self._entry_path(url), json.dumps(entry).encode('utf-8'))
+
+    def prune(self):
+        """
+        Removes the entries not fetched or revalidated within max_age and the bodies no
+        remaining entry uses. Returns the number of files removed.
+        """
+        self.pruned_at = time.time()
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return 0
+        removed = 0
+        used_bodies = set()
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+                if self.pruned_at - entry['fetched_at'] < self.max_age:
+                    used_bodies.add(entry['body'] + '.html')
+                    continue
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError, KeyError, TypeError):
+                pass  # an unreadable entry is dropped too
+            removed += _remove(path)
+        # A body removed while another process stores an entry for it only costs that
+        # entry a cache miss (get() treats a missing body as not cached).
+        for name in names:
+            if name.endswith('.html') and name not in used_bodies:
+                removed += _remove(os.path.join(self.directory, name))
+        return removed
+
+    def prune_if_due(self):
+        if self.max_age and (self.pruned_at is None or time.time() - self.pruned_at >= PRUNE_INTERVAL):
+            self.prune()
+
+default_cache = ResponseCache(scrape_cache_dir, scrape_cache_ttl, scrape_cache_max_age) if scrape_cache_dir else None
+
+def _retry_after(response):
+    # Retry-After in seconds (the HTTP-date form is rare enough to ignore)
+    try:
+        return float(response.headers.get('Retry-After', ''))
+    except ValueError:
+        return None
+
+class AsyncFetcher:
+    """
+    Pooled HTTP client with per-host rate limiting, concurrency caps and retries.
+    Use as `async with AsyncFetcher(...) as fetcher: html = await fetcher.fetch_text(url)`.
+
+    Parameters:
+      rate (float): Requests per second per host (0 or None for no limit).
+      burst (int): Requests a host's bucket can release at once.
+      per_host (int): Requests in flight per host.
+      retries (int): Retries after the first attempt.
+      backoff (float): Base delay in seconds; attempt n waits backoff * 2**n, jittered +/-50%.
+      timeout (float): Seconds per request (connect and read).
+      headers (dict): Sent with every request (default: a browser User-Agent).
+      cache (ResponseCache): Where fetch_text keeps pages (default: the on-disk cache; None for no cache).
+    """
+    def __init__(self, rate=5.0, burst=5, per_host=5, retries=3, backoff=0.5, timeout=10.0, headers=None, cache=default_cache):
+        self.rate = rate
+        self.burst = burst
+        self.per_host = per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = dict(default_headers if headers is None else headers)
+        self.cache = cache
+        self.client = None
+        self.buckets = {}
+        self.semaphores = {}
+
+    async def __aenter__(self):
+        if self.cache is not None:
+            self.cache.prune_if_due()
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=max(self.per_host, 10)),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.client.aclose()
+        self.client = None
+
+    def _host_limits(self, url):
+        host = httpx.URL(url).host
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(self.per_host)
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+        return self.semaphores[host], self.buckets[host]
+
+    async def fetch(self, url, headers=None):
+        """
+        GETs url and returns the httpx.Response, retrying transient failures.
+        Raises httpx.HTTPStatusError for an error status, httpx.TransportError if the
+        site can't be reached, once the retries are used up. A 304 (for a conditional
+        request) is returned, not raised.
+        """
+        semaphore, bucket = self._host_limits(url)
+        for attempt in range(self.retries + 1):
+            wait = None
+            async with semaphore:
+                await bucket.acquire()
+                try:
+                    response = await self.client.get(url, headers=headers)
+                except httpx.TransportError:
+                    if attempt == self.retries:
+                        raise
+                else:
+                    if response.status_code not in retry_statuses or attempt == self.retries:
+                        if response.status_code != 304:
+                            response.raise_for_status()
+                        return response
+                    wait = _retry_after(response)
+            # Back off outside the semaphore so other requests to the host can go ahead
+            if wait is None:
+                wait = self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+            await asyncio.sleep(wait)
+
+    async def fetch_text(self, url):
+        """
+        Returns the text of url, from the response cache when the cached copy is fresh
+        or the site confirms it is unchanged.
+        """
+        if self.cache is None:
+            return (await self.fetch(url)).text
+
+        entry, text = self.cache.get(url)
+        if entry is not None and self.cache.is_fresh(entry):
+            return text
+        response = await self.fetch(url, self.cache.validators(entry) if entry is not None else None)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(url, entry)
+            return text
+        self.cache.put(url, response)
+        return response.text
+
+    async def fetch_all(self, urls, on_page=None):
+        """
+        Fetches every url concurrently (within the limits). Returns a list in the same
+        order with the page text, or the exception for urls that failed.
+        on_page(url, text_or_exception) is called as each page arrives, if given.
+        """
+        async def fetch_one(url):
+            try:
+                page = await self.fetch_text(url)
+            except Exception as e:
+                page = e
+            if on_page is not None:
+                on_page(url, page)
+            return page
+        return await asyncio.gather(*(fetch_one(url) for url in urls))
+
+# --- Synchronous entry points for the scripts ---
+def fetch_text(url, **options):
+    """
+    Returns the text of one page (raises if it can't be fetched). options go to AsyncFetcher.
+    """
+    async def run():
+        async with AsyncFetcher(**options) as fetcher:
+            return await fetcher.fetch_text(url)
+    return asyncio.run(run())
+
+def fetch_many(urls, on_page=None, **options):
+    """
+    Fetches many pages over one pooled client. Returns a list in the order of urls with
+    each page's text, or the exception for pages that failed. on_page is called as each
+    page arrives (see AsyncFetcher.fetch_all); options go to AsyncFetcher.
+    """
+    async def run():
+        async with AsyncFetcher(**options) as fetcher:
+            return await fetcher.fetch_all(urls, on_page)
+    return asyncio.run(run())
@@ -0,0 +1,59 @@
+import json
+import math
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # local runs without the requirements installed
+    orjson = None
+
+# === JSON Responses ===
+# Returning df.to_dict(orient="records") from an endpoint makes FastAPI walk every value
+# through jsonable_encoder before encoding it. For the fit lists (thousands of values per
+# team) that walk is most of the request time, so these helpers encode the payload to JSON
+# bytes directly with orjson (in requirements.txt) and return a plain Response. Without
+# orjson (local runs) they fall back to the json module, which is slower: NaN has to be
+# replaced value by value first. NaN values are written as null either way.
+
+def frame_payload(df, orient="records"):
+    """
+    Converts a DataFrame to the JSON payload for a response.
+
+    Parameters:
+      df (pd.DataFrame): The frame to send.
+      orient (str): "records" for a list of row objects (the default, what the frontend reads),
+        or "columns" for {column: [values]}, which is smaller and faster to build.
+    """
+    # Series.tolist() gives Python scalars column by column, much faster than
+    # df.to_dict(orient="records"), which boxes every cell on its own.
+    columns = {col: df[col].tolist() for col in df.columns}
+    if orient == "columns":
+        return columns
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+def _nan_to_none(value):
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if isinstance(value, dict):
+        return {k: _nan_to_none(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_nan_to_none(v) for v in value]
+    return value
+
+def _numpy_default(value):
+    # NumPy scalars (np.float64, np.int64, ...) -> the matching Python scalar
+    return value.item()
+
+def dumps(payload):
+    """
+    Encodes a payload (dicts, lists, Python or NumPy scalars) to JSON bytes, NaN as null.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(_nan_to_none(payload), ensure_ascii=False, separators=(",", ":"), default=_numpy_default).encode("utf-8")
+
+def json_response(payload, status_code=200, headers=None):
+    """
+    Returns an already-encoded JSON Response for payload.
+    """
+    return Response(dumps(payload), status_code=status_code, headers=headers, media_type="application/json")
@@ -2,6 +2,7 @@ import os
 import pandas as pd
 import nfl_data_py as nfl
 from playerscrape import scrape_free_agents, scrape_market_values_concurrently, off_url
+from data_io import read_table, write_table
 
 def get_roster_data(year):
     """
@@ -19,7 +20,7 @@ def load_oline_data(filepath):
     """
     weeks = [f"Week {i}" for i in range(1, 19)]
     columns = ['NAME', 'POS', 'TEAM', 'DEPTH', 'Avg', 'TM SNAP %'] + weeks
-    df = pd.read_csv(filepath, usecols=columns)
+    df = read_table(filepath, columns=columns)
     return df
 
 def add_rankings(df):
@@ -132,7 +133,7 @@ def main():
     
     # 7. Sort by final_rating (highest first) and save full linemen data without cleaning columns.
     df_oline = df_oline.sort_values(by='final_rating', ascending=False)
-    df_oline.to_csv(oline_output_filepath, index=False)
+    write_table(df_oline, oline_output_filepath)
     print(f"Saved full linemen data with rankings and final ratings to {oline_output_filepath}")
     
     # 8. Scrape free agent linemen.
@@ -153,7 +154,7 @@ def main():
     df_fa = clean_columns(df_fa)
     df_fa['id'] = range(len(df_fa))
     df_fa = df_fa[['id'] + df_fa.columns.tolist()[:-1]]
-    df_fa.to_csv(fa_oline_output_filepath, index=False)
+    write_table(df_fa, fa_oline_output_filepath)
     print(f"Saved free agent linemen data with final ratings to {fa_oline_output_filepath}")
 
 if __name__ == '__main__':
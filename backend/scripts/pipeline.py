@@ -0,0 +1,295 @@
+import functools
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import data_loader
+import o_line_rating
+import playerscrape
+import skilled_players
+import teamscrape
+import weekly_seasonal_data
+from skilled_players import RAW_CACHE_DIR
+
+# === 1. Pipeline Stages ===
+# The offline data pipeline as a DAG: each stage is a script step with the files it reads
+# (inputs) and writes (outputs), and a stage runs after the stages producing its inputs.
+#   python backend/scripts/pipeline.py [stage ...] [--force[=stage,...]] [--workers=N] [--serial] [--incremental] [--list]
+# Runs the given stages and everything upstream of them (all stages by default):
+#   - independent stages (player, free agent and team cap scrapes, play-by-play aggregation,
+#     o-line ratings) run in parallel, in separate processes (--workers, default 3)
+#   - a stage is skipped if its inputs (content hashes) and its code (its script and the
+#     pipeline scripts it imports) are the same as on its last successful run and its outputs
+#     still exist; stages that pull from nflverse or Spotrac are also rerun once their last
+#     run is older than REMOTE_REFRESH_AFTER (team_pbp then downloads the current season again)
+#   - if a stage fails, the stages depending on it don't run; the others still do
+# Each stage's timing is reported at the end. The state of the last runs is kept in
+# backend/raw_data/pipeline_state.json.
+Stage = namedtuple('Stage', ['name', 'run', 'inputs', 'outputs', 'refresh_after'])
+
+PIPELINE_STATE_FILE = os.path.join(RAW_CACHE_DIR, 'pipeline_state.json')
+REMOTE_REFRESH_AFTER = 24 * 60 * 60
+OLINE_FILES = [
+    'backend/processed_data/oline_data.csv',
+    'backend/processed_data/fa_oline.csv',
+]
+
+def pipeline_stages(incremental=False):
+    """
+    The pipeline's stages. incremental is passed to skilled_players.build_player_files.
+    """
+    wsd = weekly_seasonal_data
+    position_files = list(skilled_players.POSITION_DATA_FILES.values())
+    return [
+        Stage('players', functools.partial(skilled_players.build_player_files, incremental),
+              list(dict.fromkeys(skilled_players.NGS_FILES.values())), position_files, REMOTE_REFRESH_AFTER),
+        Stage('free_agents', playerscrape.write_free_agents,
+              [], [playerscrape.free_agents_file], REMOTE_REFRESH_AFTER),
+        Stage('fa_players', skilled_players.write_free_agent_files,
+              position_files + [playerscrape.free_agents_file], list(skilled_players.FREE_AGENT_DATA_FILES.values()), None),
+        Stage('team_cap', teamscrape.scrape_team_cap_data,
+              [], [wsd.TEAM_CAP_FILE], REMOTE_REFRESH_AFTER),
+        Stage('team_pbp', functools.partial(wsd.write_team_pbp_stats, [data_loader.CURRENT_SEASON]),
+              [], [wsd.TEAM_WEEKLY_FILE, wsd.TEAM_PBP_FILE], REMOTE_REFRESH_AFTER),
+        Stage('team_seasonal', wsd.write_team_seasonal_stats,
+              [wsd.TEAM_PBP_FILE, wsd.TEAM_WEEKLY_FILE, wsd.TEAM_CAP_FILE, wsd.TEAM_OFFENSE_FILE], [wsd.TEAM_SEASONAL_FILE], None),
+        Stage('oline', o_line_rating.main,
+              ['backend/processed_data/o_line.csv'], OLINE_FILES, REMOTE_REFRESH_AFTER),
+    ]
+
+def stage_dependencies(stages):
+    """
+    Returns {stage name: set of the stage names producing its inputs}.
+    Raises ValueError if two stages write the same file or the stages form a cycle.
+    """
+    producers = {}
+    for stage in stages:
+        for path in stage.outputs:
+            if path in producers:
+                raise ValueError(f"{path} is written by both {producers[path]} and {stage.name}")
+            producers[path] = stage.name
+    dependencies = {
+        stage.name: {producers[path] for path in stage.inputs if path in producers} - {stage.name}
+        for stage in stages
+    }
+
+    # Cycle check: repeatedly remove stages whose dependencies are all removed
+    remaining = dict(dependencies)
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps & remaining.keys()]
+        if not ready:
+            raise ValueError(f"Pipeline stages form a cycle: {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+    return dependencies
+
+def upstream_stages(dependencies, names):
+    """
+    The given stages and every stage they depend on, directly or not.
+    """
+    selected = set()
+    to_visit = list(names)
+    while to_visit:
+        name = to_visit.pop()
+        if name not in selected:
+            selected.add(name)
+            to_visit.extend(dependencies[name])
+    return selected
+
+# === 2. Change Detection ===
+def file_hash(path):
+    """SHA-256 of a file's contents, or None if it doesn't exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+def local_modules(module, found=None):
+    """
+    The scripts a module uses, directly or through the scripts it imports (the modules
+    and functions it imports from its own directory), including itself.
+    """
+    if found is None:
+        found = {}
+    found[module.__name__] = module
+    scripts_dir = os.path.dirname(os.path.abspath(module.__file__))
+    for value in vars(module).values():
+        used = value if inspect.ismodule(value) else sys.modules.get(getattr(value, '__module__', None) or '')
+        if used is None or used.__name__ in found or not inspect.ismodule(used):
+            continue
+        path = getattr(used, '__file__', None)
+        if path and os.path.dirname(os.path.abspath(path)) == scripts_dir:
+            local_modules(used, found)
+    return found
+
+def stage_key(stage):
+    """
+    What a stage's run depends on: its code (the stage's script and every pipeline script
+    it uses, e.g. scheme.py, data_io.py, data_loader.py), its arguments and its input files.
+    """
+    run = stage.run.func if isinstance(stage.run, functools.partial) else stage.run
+    modules = local_modules(sys.modules[run.__module__])
+    return {
+        'code': {name: file_hash(inspect.getsourcefile(module)) for name, module in sorted(modules.items())},
+        'call': f"{run.__module__}.{run.__name__} {getattr(stage.run, 'args', ())!r} {getattr(stage.run, 'keywords', {})!r}",
+        'inputs': {path: file_hash(path) for path in stage.inputs},
+    }
+
+def is_up_to_date(stage, record, key, now):
+    if not record or record.get('key') != key:
+        return False
+    if not all(os.path.exists(path) for path in stage.outputs):
+        return False
+    return stage.refresh_after is None or now - record['finished_at'] < stage.refresh_after
+
+def load_pipeline_state():
+    try:
+        with open(PIPELINE_STATE_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_pipeline_state(state):
+    os.makedirs(RAW_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{PIPELINE_STATE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, PIPELINE_STATE_FILE)
+
+# === 3. Running ===
+def run_stage(run):
+    """
+    Runs a stage's function and returns how long it took (timed where it runs, so
+    waiting for a free worker and process start-up aren't counted).
+    """
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+def run_pipeline(stages, selected=None, force=False, workers=3, serial=False):
+    """
+    Runs the stages in dependency order, independent ones in parallel.
+
+    Parameters:
+      stages (list): Stage tuples (see pipeline_stages).
+      selected (list): Stage names to run, with everything upstream of them (default: all).
+      force (bool or set): Rerun every stage (True) or these stages even if up to date.
+      workers (int): Stages running at once, each in its own process.
+      serial (bool): Run the stages one at a time in this process instead.
+
+    Returns:
+      dict: Stage name -> (status, seconds); status is "ran", "skipped", "failed" or "blocked".
+    """
+    by_name = {stage.name: stage for stage in stages}
+    dependencies = stage_dependencies(stages)
+    unknown = set(selected or ()) - by_name.keys()
+    if unknown:
+        raise ValueError(f"Unknown pipeline stages: {sorted(unknown)} (stages: {list(by_name)})")
+    wanted = upstream_stages(dependencies, selected) if selected else by_name.keys()
+    pending = [name for name in by_name if name in wanted]
+
+    state = load_pipeline_state()
+    results = {}
+    running = {}  # future -> (stage, key, submit time)
+
+    def finish(stage, key, seconds, error=None):
+        if error is not None:
+            print(f"[{stage.name}] failed after {seconds:.1f}s:")
+            traceback.print_exception(type(error), error, error.__traceback__)
+            results[stage.name] = ('failed', seconds)
+            return
+        print(f"[{stage.name}] finished in {seconds:.1f}s")
+        results[stage.name] = ('ran', seconds)
+        # Saved after every stage, so a failure later on doesn't lose what already ran
+        state[stage.name] = {'key': key, 'finished_at': time.time(), 'seconds': round(seconds, 2)}
+        save_pipeline_state(state)
+
+    executor = None
+    if not serial:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        while pending or running:
+            # Start (or skip) every stage whose upstream stages are all done
+            started_any = True
+            while started_any:
+                started_any = False
+                for name in list(pending):
+                    if not dependencies[name] <= results.keys():
+                        continue
+                    pending.remove(name)
+                    started_any = True
+                    stage = by_name[name]
+                    if any(results[dep][0] in ('failed', 'blocked') for dep in dependencies[name]):
+                        print(f"[{name}] not run: an upstream stage failed")
+                        results[name] = ('blocked', 0.0)
+                        continue
+                    key = stage_key(stage)
+                    forced = force is True or name in (force or ())
+                    if not forced and is_up_to_date(stage, state.get(name), key, time.time()):
+                        print(f"[{name}] up to date, skipped")
+                        results[name] = ('skipped', 0.0)
+                        continue
+                    print(f"[{name}] started")
+                    submitted = time.perf_counter()
+                    if executor is None:
+                        try:
+                            seconds = run_stage(stage.run)
+                        except Exception as e:
+                            finish(stage, key, time.perf_counter() - submitted, e)
+                        else:
+                            finish(stage, key, seconds)
+                    else:
+                        running[executor.submit(run_stage, stage.run)] = (stage, key, submitted)
+
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, key, submitted = running.pop(future)
+                    if future.exception() is not None:
+                        finish(stage, key, time.perf_counter() - submitted, future.exception())
+                    else:
+                        finish(stage, key, future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return results
+
+def print_report(results, wall_seconds):
+    print("\nPipeline report:")
+    for name, (status, seconds) in results.items():
+        print(f"  {name:<15} {status:<8} {seconds:8.1f}s")
+    stage_seconds = sum(seconds for _, seconds in results.values())
+    print(f"  {'total':<15} {'':<8} {wall_seconds:8.1f}s  ({stage_seconds:.1f}s of stage time)")
+
+def main(argv):
+    options = dict(arg[2:].partition('=')[::2] for arg in argv[1:] if arg.startswith('--'))
+    selected = [arg for arg in argv[1:] if not arg.startswith('--')]
+    stages = pipeline_stages(incremental='incremental' in options)
+
+    if 'list' in options:
+        dependencies = stage_dependencies(stages)
+        for stage in stages:
+            after = ', '.join(sorted(dependencies[stage.name])) or '-'
+            print(f"{stage.name:<15} after: {after:<25} writes: {', '.join(stage.outputs)}")
+        return 0
+
+    force = options.get('force')
+    force = set(force.split(',')) if force else 'force' in options
+    started = time.perf_counter()
+    results = run_pipeline(stages, selected or None, force, int(options.get('workers') or 3), 'serial' in options)
+    print_report(results, time.perf_counter() - started)
+    return 1 if any(status in ('failed', 'blocked') for status, _ in results.values()) else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,90 @@
+import csv
+import threading
+from collections import namedtuple
+
+# === Player Store ===
+# The player detail endpoints used to re-open the position CSV on every request and
+# binary-search it (which silently relied on the file being sorted by player_id).
+# Instead we parse each CSV once and keep hash indexes on id and name, so a detail
+# lookup is a dict access with no disk I/O on the request path.
+#   - rows: list of the CSV rows as dicts (string values, exactly as csv.DictReader reads them)
+#   - by_id: dict of stripped id -> row
+#   - by_name: dict of lowercased name -> list of rows (names are not unique)
+PlayerIndex = namedtuple('PlayerIndex', ['rows', 'by_id', 'by_name'])
+
+_player_store = {}
+_player_store_lock = threading.Lock()
+
+def build_player_index(csv_path, id_column='player_id', name_column='player_name'):
+    """
+    Reads a player CSV once and indexes its rows by id and by name.
+    """
+    with open(csv_path, newline='') as csvfile:
+        rows = list(csv.DictReader(csvfile))
+
+    by_id = {}
+    by_name = {}
+    for row in rows:
+        by_id[row.get(id_column, '').strip()] = row
+        name = row.get(name_column, '').strip().lower()
+        if name:
+            by_name.setdefault(name, []).append(row)
+    return PlayerIndex(rows, by_id, by_name)
+
+def get_player_index(key, csv_path, id_column='player_id', name_column='player_name'):
+    """
+    Returns the cached PlayerIndex for key (e.g. "QB"), loading csv_path on first use.
+    Raises FileNotFoundError if the CSV does not exist.
+    """
+    index = _player_store.get(key)
+    if index is None:
+        with _player_store_lock:
+            index = _player_store.get(key)
+            if index is None:
+                index = build_player_index(csv_path, id_column, name_column)
+                _player_store[key] = index
+    return index
+
+def find_player(index, player_id):
+    """
+    Returns a copy of the row for player_id (so callers can add fields to it), or None.
+    """
+    row = index.by_id.get(player_id.strip())
+    return dict(row) if row is not None else None
+
+def find_players(index, player_ids):
+    """
+    Looks up many ids at once.
+
+    Returns:
+      (list, list): Copies of the matching rows in the order asked for, and the ids not found.
+    """
+    rows, missing = [], []
+    for player_id in player_ids:
+        row = index.by_id.get(player_id.strip())
+        if row is None:
+            missing.append(player_id)
+        else:
+            rows.append(dict(row))
+    return rows, missing
+
+def find_players_by_name(index, name):
+    """
+    Returns copies of every row whose name matches (case-insensitive).
+    """
+    return [dict(row) for row in index.by_name.get(name.strip().lower(), [])]
+
+def replace_player_store(indexes):
+    """
+    Swaps in a new set of PlayerIndexes ({key: PlayerIndex}) at once.
+    """
+    global _player_store
+    with _player_store_lock:
+        _player_store = dict(indexes)
+
+def clear_player_store():
+    """
+    Drops every cached PlayerIndex.
+    """
+    with _player_store_lock:
+        _player_store.clear()
@@ -1,33 +1,22 @@
-import requests
 import pandas as pd
-from bs4 import BeautifulSoup
-import concurrent.futures
-import time
+from data_io import write_table
+from http_fetch import fetch_text, fetch_many
+from html_parsing import table_rows, text_after_label
+from scrape_checkpoint import default_checkpoint, ScrapeProgress
 
 off_url = "https://www.spotrac.com/nfl/free-agents/_/year/2025/position/off/sort/contract_value"
 def_url = "https://www.spotrac.com/nfl/free-agents/_/year/2025/position/def/sort/contract_value"
+free_agents_file = 'backend/processed_data/free_agents.csv'
 
-def get_avg_salary(market_value_url):
+def parse_avg_salary(html):
     """
-    Given a Spotrac market value URL, returns the average salary as a float,
-    or None if not found or scraping fails.
+    Returns the average salary on a Spotrac market value page as a float, or None if not found.
     """
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-    }
-    try:
-        response = requests.get(market_value_url, headers=headers, timeout=10)
-        response.raise_for_status()
-    except Exception:
-        return None  # Request error or timeout
-
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    # Look for the <span> that exactly matches "Avg. Salary:"
-    avg_salary_span = soup.find("span", text="Avg. Salary:")
-    if avg_salary_span and avg_salary_span.next_sibling:
+    # Look for the <span> that exactly matches "Avg. Salary:" and the text after it
+    raw_salary_text = text_after_label(html, "Avg. Salary:")
+    if raw_salary_text:
         # e.g. "$13,462,485"
-        raw_salary_text = avg_salary_span.next_sibling.strip()
+        raw_salary_text = raw_salary_text.strip()
         clean_salary = raw_salary_text.replace("$", "").replace(",", "")
         try:
             return float(clean_salary)
@@ -36,19 +25,24 @@ def get_avg_salary(market_value_url):
 
     return None
 
+def get_avg_salary(market_value_url):
+    """
+    Given a Spotrac market value URL, returns the average salary as a float,
+    or None if not found or scraping fails.
+    """
+    try:
+        html = fetch_text(market_value_url)
+    except Exception:
+        return None  # Request error or timeout (after retries)
+    return parse_avg_salary(html)
+
 def scrape_free_agents(url):
     """
     Scrape the main Spotrac free-agents page (for a given URL).
     Returns a DataFrame with columns: Name, Position, Age, YOE, Prev Team,
     AAV (from the main page), Type, and MV_Link (if there's a Market Value page).
     """
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-    }
-    response = requests.get(url, headers=headers).text
-    soup = BeautifulSoup(response, "html.parser")
-
-    rows = soup.find_all("tr")
+    rows = table_rows(fetch_text(url))
 
     names, positions, ages, yoes = [], [], [], []
     prev_teams, original_aavs, types, mv_links = [], [], [], []
@@ -117,67 +111,67 @@ def scrape_free_agents(url):
 
     return df
 
-def fetch_market_value_for_row(row, delay=0.2):
-    """
-    Worker function that takes a single DataFrame row,
-    sleeps briefly (to avoid spamming the site),
-    then scrapes the Market Value if a link is present.
-    """
-    link = row['MV_Link']
-    if pd.isna(link) or not link:
-        return None
-    time.sleep(delay)  # Throttle requests a bit
-    return get_avg_salary(link)
-
-def scrape_market_values_concurrently(df, max_workers=5, delay=0.2):
+def scrape_market_values_concurrently(df, max_workers=5, delay=0.2, checkpoint=default_checkpoint, resume=True, progress_every=5.0):
     """
-    Given a DataFrame with a column 'MV_Link', scrape each link in parallel
+    Given a DataFrame with a column 'MV_Link', scrape each link concurrently
     to get the player's Market Value. Store the final result in a new
-    'Market Value' column. If scraping fails or there's no link, fall back to 'AAV'.
+    'market_value' column. If scraping fails or there's no link, fall back to 'AAV'.
+
+    Each player's result is checkpointed by MV_Link as soon as it is scraped (see
+    scrape_checkpoint.py), so if the scrape is interrupted, running it again only
+    fetches the players that are still missing.
+
+    Parameters:
+      max_workers (int): Requests to Spotrac in flight at once.
+      delay (float): Spacing between request starts per worker; the overall rate is
+        limited to max_workers / delay requests per second (to avoid spamming the site).
+      checkpoint (ScrapeCheckpoint): Where results are recorded (None to not checkpoint).
+      resume (bool): Reuse the checkpointed results; False scrapes every link again.
+      progress_every (float): Seconds between progress lines (None for just the summary).
     """
-    # Create a thread pool
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {}
-        for idx, row in df.iterrows():
-            # Submit each row to the thread pool
-            futures[executor.submit(fetch_market_value_for_row, row, delay)] = idx
-
-        # Gather results
-        results = {}
-        for future in concurrent.futures.as_completed(futures):
-            idx = futures[future]
-            try:
-                results[idx] = future.result()
-            except Exception:
-                results[idx] = None
-
-    # Build the final "Market Value" column
-    market_values = []
-    for i in range(len(df)):
-        mv = results.get(i)
-        if mv is not None:
-            market_values.append(mv)
+    links = [link if isinstance(link, str) and link else None for link in df['MV_Link']]
+    unique_links = list(dict.fromkeys(link for link in links if link is not None))
+
+    # Salaries by MV_Link: what earlier runs already scraped, then this run's pages
+    scraped = {}
+    if checkpoint is not None:
+        if resume:
+            wanted = set(unique_links)
+            scraped = {link: mv for link, mv in checkpoint.load().items() if link in wanted}
         else:
-            market_values.append(df.loc[i, 'AAV'])
-            # market_values.append(None)
+            checkpoint.clear()
+    to_fetch = [link for link in unique_links if link not in scraped]
+    progress = ScrapeProgress("Market values", len(unique_links), resumed=len(scraped), every=progress_every)
+
+    def on_page(link, page):
+        if isinstance(page, Exception):
+            progress.update(failed=True)  # not checkpointed, so the next run retries it
+            return
+        scraped[link] = parse_avg_salary(page)
+        if checkpoint is not None:
+            checkpoint.record(link, scraped[link])
+        progress.update()
+
+    rate = max_workers / delay if delay else None
+    fetch_many(to_fetch, on_page=on_page, rate=rate, burst=max_workers, per_host=max_workers)
+    progress.finish()
+
+    # Build the final "Market Value" column by link, whatever the frame's index
+    market_values = []
+    for link, aav in zip(links, df['AAV']):
+        mv = scraped.get(link) if link is not None else None
+        market_values.append(mv if mv is not None else aav)
 
     df['market_value'] = market_values
     return df
 
-def get_available_free_agents(url):
+def parse_available_free_agents(html):
     """
-    Scrape the main Spotrac free-agents page (for a given URL).
+    Parse a Spotrac free-agents page.
     Returns a DataFrame with columns: Name, Position, Age, YOE, Prev Team,
     AAV (from the main page), Type, and MV_Link (if there's a Market Value page).
     """
-
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
-    }
-    response = requests.get(url, headers=headers).text
-    soup = BeautifulSoup(response, "html.parser")
-
-    rows = soup.find_all("tr")
+    rows = table_rows(html)
 
     names, positions, ages, yoes = [], [], [], []
     prev_teams, original_aavs, types, mv_links = [], [], [], []
@@ -253,20 +247,50 @@ def get_available_free_agents(url):
 
     return df
 
-# ------------------------------------------------------------
-# Example usage if this file is run directly:
-# ------------------------------------------------------------
-if __name__ == "__main__":
+def get_available_free_agents(url):
+    """
+    Scrape the main Spotrac free-agents page (for a given URL).
+    Returns a DataFrame with columns: Name, Position, Age, YOE, Prev Team,
+    AAV (from the main page), Type, and MV_Link (if there's a Market Value page).
+    """
+    return parse_available_free_agents(fetch_text(url))
 
-    # 1) Scrape the main table
-    df_off = get_available_free_agents(off_url)
-    # df_off = scrape_free_agents(off_url)
+def get_free_agent_class(urls=(off_url, def_url)):
+    """
+    Scrape several free-agents pages (by default offense and defense) concurrently
+    and return them as one DataFrame (same columns as get_available_free_agents).
+    """
+    urls = list(urls)
+    pages = fetch_many(urls)
+    for url, page in zip(urls, pages):
+        if isinstance(page, Exception):
+            raise RuntimeError(f"Could not fetch {url}: {page!r}")
+    return pd.concat([parse_available_free_agents(page) for page in pages], ignore_index=True)
+
+def write_free_agents(urls=(off_url,)):
+    """
+    Scrape the free agents on Spotrac free-agents pages (by default offense only; pass
+    (off_url, def_url) for the whole class) with their market values and save them
+    to free_agents.csv (used by skilled_players.py).
+    """
+    if isinstance(urls, str):
+        urls = (urls,)
+    # 1) Scrape the main tables (all pages at once)
+    df = get_free_agent_class(urls)
+    # df = scrape_free_agents(url)
 
     # 2) Scrape Market Value in parallel
-    df_off = scrape_market_values_concurrently(df_off, max_workers=5, delay=0.2)
+    df = scrape_market_values_concurrently(df, max_workers=5, delay=0.2)
 
-    # Now 'df_off' has:
+    # Now 'df' has:
     #  - AAV (original from the main page)
     #  - Market Value (scraped from the MV link, or fallback to AAV if not found)
-    df_off.to_csv('backend/processed_data/free_agents.csv', index=False)
+    write_table(df, free_agents_file)
+    return df
+
+# ------------------------------------------------------------
+# Example usage if this file is run directly:
+# ------------------------------------------------------------
+if __name__ == "__main__":
+    df_off = write_free_agents((off_url,))
     print(df_off.head(20))
@@ -1,26 +1,19 @@
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.impute import SimpleImputer
+from scripts.fit_engine import build_coefficient_matrix, row_fit_functions, score_players, combine_scheme_fits
+from scripts.data_io import read_table
 
-# === 1. Read the Data ===
-team_df = pd.read_csv('processed_data/team_seasonal_stats.csv')
-qb_df = pd.read_csv('processed_data/fa_qbs.csv')
+# === 1. Data Files ===
+# Nothing is read at import time: load_qb_data() reads and preprocesses the data on first use.
+team_data_file = 'processed_data/team_seasonal_stats.csv'
+fa_qb_data_file = 'processed_data/fa_qbs.csv'
+# Full QB dataset (all seasons), used for the advanced stat rankings
+full_qb_data_file = 'processed_data/qb_data.csv'
 
 # === 2. Preprocess QB Data ===
-# Replace 0 games with NaN to avoid division errors
-qb_df['games'] = qb_df['games'].replace(0, np.nan)
-qb_df['passing_yards'] = qb_df['passing_yards'] - qb_df['passing_yards_after_catch']
-# Create a new column for completed air yards.
-qb_df['pass_yards_minus_yac'] = qb_df['passing_yards'] - qb_df['passing_yards_after_catch']
-
-qb_df['passing_yards_per_game'] = qb_df['passing_yards'] / qb_df['games']
-qb_df['passing_tds_per_game'] = qb_df['passing_tds'] / qb_df['games']
-qb_df['completions_per_game'] = qb_df['completions'] / qb_df['games']
-qb_df['passing_first_downs_per_game'] = qb_df['passing_first_downs'] / qb_df['games']
-qb_df['rushing_yards_per_game'] = qb_df['rushing_yards'] / qb_df['games']
-qb_df['rushing_tds_per_game'] = qb_df['rushing_tds'] / qb_df['games']
-
 # Define columns for production and efficiency.
 # Note: 'interceptions' is now included.
 production_cols_qb = [
@@ -39,17 +32,48 @@ additional_cols_qb = [
     'ngs_expected_completion_percentage', 'ngs_completion_percentage_above_expectation'
 ]
 all_qb_cols = list(set(production_cols_qb + efficiency_cols_qb + additional_cols_qb))
+scaled_cols_qb = ["scaled_" + col for col in all_qb_cols]
 
-# Impute missing values using median.
-imputer = SimpleImputer(strategy='median')
-qb_imputed = qb_df.copy()
-qb_imputed[all_qb_cols] = imputer.fit_transform(qb_imputed[all_qb_cols])
+def preprocess_qb_data(qb_df):
+    """
+    Adds the per-game columns to the free agent QB data, imputes missing values
+    and scales the fit columns. Returns the imputed and scaled frame.
+    """
+    # Replace 0 games with NaN to avoid division errors
+    qb_df['games'] = qb_df['games'].replace(0, np.nan)
+    qb_df['passing_yards'] = qb_df['passing_yards'] - qb_df['passing_yards_after_catch']
+    # Create a new column for completed air yards.
+    qb_df['pass_yards_minus_yac'] = qb_df['passing_yards'] - qb_df['passing_yards_after_catch']
 
-# Scale values to a 0-1 range (here, scaled to between 0.2 and 1).
-scaler = MinMaxScaler(feature_range=(0.2, 1))
-qb_imputed_scaled = qb_imputed.copy()
-scaled_cols_qb = ["scaled_" + col for col in all_qb_cols]
-qb_imputed_scaled[scaled_cols_qb] = scaler.fit_transform(qb_imputed[all_qb_cols])
+    qb_df['passing_yards_per_game'] = qb_df['passing_yards'] / qb_df['games']
+    qb_df['passing_tds_per_game'] = qb_df['passing_tds'] / qb_df['games']
+    qb_df['completions_per_game'] = qb_df['completions'] / qb_df['games']
+    qb_df['passing_first_downs_per_game'] = qb_df['passing_first_downs'] / qb_df['games']
+    qb_df['rushing_yards_per_game'] = qb_df['rushing_yards'] / qb_df['games']
+    qb_df['rushing_tds_per_game'] = qb_df['rushing_tds'] / qb_df['games']
+
+    # Impute missing values using median.
+    imputer = SimpleImputer(strategy='median')
+    qb_imputed = qb_df.copy()
+    qb_imputed[all_qb_cols] = imputer.fit_transform(qb_imputed[all_qb_cols])
+
+    # Scale values to a 0-1 range (here, scaled to between 0.2 and 1).
+    scaler = MinMaxScaler(feature_range=(0.2, 1))
+    qb_imputed_scaled = qb_imputed.copy()
+    qb_imputed_scaled[scaled_cols_qb] = scaler.fit_transform(qb_imputed[all_qb_cols])
+    return qb_imputed_scaled
+
+@lru_cache(maxsize=None)
+def load_qb_data():
+    """
+    Reads the team and free agent QB data once and preprocesses it.
+
+    Returns:
+      tuple: (team_df, qb_imputed_scaled). Treat both as read-only.
+    """
+    team_df = read_table(team_data_file)
+    qb_imputed_scaled = preprocess_qb_data(read_table(fa_qb_data_file))
+    return team_df, qb_imputed_scaled
 
 # === 3. Bonus Functions for QBs (to be applied in the app) ===
 def compute_rushing_bonus_qb(qb_row):
@@ -129,139 +153,120 @@ def compute_team_need_bonus(team_row):
         bonus = -0.2
     return bonus
 
-# === 4. Raw Fit Functions for Offensive Schemes ===
-# Each function combines a production component and an efficiency component.
-# A penalty for interceptions is applied in each efficiency component (-0.15 * scaled_interceptions).
-
-# Air Raid (Pass-Favored)
-def compute_raw_fit_air_raid_qb(qb_row):
-    prod = (
-        0.4 * qb_row['scaled_passing_yards_per_game'] +
-        0.2 * qb_row['scaled_passing_tds_per_game'] +
-        0.2 * qb_row['scaled_completions_per_game'] +
-        0.2 * qb_row['scaled_passing_first_downs_per_game']
-    )
-    eff = (
-        0.30 * qb_row['scaled_passing_epa'] +
-        0.25 * qb_row['scaled_ngs_avg_time_to_throw'] +
-        0.25 * qb_row['scaled_ngs_avg_intended_air_yards'] +
-        0.20 * qb_row['scaled_ngs_completion_percentage'] -
-        0.25 * qb_row['scaled_interceptions']
-    )
-    return 0.45 * prod + 0.55 * eff
-
-# Spread Option (RPO-Heavy, Balanced)
-def compute_raw_fit_spread_option_qb(qb_row):
-    prod = (
-        0.35 * qb_row['scaled_passing_yards_per_game'] +
-        0.25 * qb_row['scaled_passing_tds_per_game'] +
-        0.2 * qb_row['scaled_completions_per_game'] +
-        0.2 * qb_row['scaled_passing_first_downs_per_game']
-    )
-    eff = (
-        0.30 * qb_row['scaled_passing_epa'] +
-        0.20 * qb_row['scaled_ngs_avg_time_to_throw'] +
-        0.30 * qb_row['scaled_ngs_completion_percentage'] +
-        0.20 * qb_row['scaled_ngs_passer_rating'] -
-        0.25 * qb_row['scaled_interceptions']
-    )
-    return 0.4 * prod + 0.6 * eff
-
-# West Coast (Pass-Favored)
-def compute_raw_fit_west_coast_qb(qb_row):
-    prod = (
-        0.35 * qb_row['scaled_passing_yards_per_game'] +
-        0.25 * qb_row['scaled_passing_tds_per_game'] +
-        0.2 * qb_row['scaled_completions_per_game'] +
-        0.2 * qb_row['scaled_passing_first_downs_per_game']
-    )
-    eff = (
-        0.30 * qb_row['scaled_passing_epa'] +
-        0.30 * qb_row['scaled_ngs_passer_rating'] +
-        0.2 * qb_row['scaled_ngs_completion_percentage'] +
-        0.2 * qb_row['scaled_ngs_expected_completion_percentage'] -
-        0.25 * qb_row['scaled_interceptions']
-    )
-    return 0.4 * prod + 0.6 * eff
-
-# West Coast McVay (Modern West Coast, Balanced) – including YAC
-def compute_raw_fit_west_coast_mcvay_qb(qb_row):
-    prod = (
-        0.35 * qb_row['scaled_passing_yards_per_game'] +
-        0.25 * qb_row['scaled_passing_tds_per_game'] +
-        0.2 * qb_row['scaled_completions_per_game'] +
-        0.2 * qb_row['scaled_passing_first_downs_per_game']
-    )
-    eff = (
-        0.25 * qb_row['scaled_passing_epa'] +
-        0.25 * qb_row['scaled_ngs_passer_rating'] +
-        0.25 * qb_row['scaled_ngs_completion_percentage'] +
-        0.25 * qb_row['scaled_ngs_avg_intended_air_yards'] -
-        0.25 * qb_row['scaled_interceptions']
-    )
-    yac = qb_row.get('scaled_passing_yards_after_catch', 0)
-    return 0.4 * prod + 0.55 * eff + 0.05 * yac
-
-# Shanahan Wide Zone (Run-Favored)
-def compute_raw_fit_shanahan_qb(qb_row):
-    prod = (
-        0.3 * qb_row['scaled_passing_yards_per_game'] +
-        0.3 * qb_row['scaled_passing_tds_per_game'] +
-        0.2 * qb_row['scaled_completions_per_game'] +
-        0.2 * qb_row['scaled_passing_first_downs_per_game']
-    )
-    eff = (
-        0.3 * qb_row['scaled_passing_epa'] +
-        0.2 * qb_row['scaled_ngs_passer_rating'] +
-        0.3 * qb_row['scaled_ngs_completion_percentage'] +
-        0.2 * qb_row['scaled_ngs_completion_percentage_above_expectation'] -
-        0.25 * qb_row['scaled_interceptions']
-    )
-    return 0.5 * prod + 0.5 * eff
-
-# Run Power (Run-Favored)
-def compute_raw_fit_run_power_qb(qb_row):
-    prod = (
-        0.3 * qb_row['scaled_passing_yards_per_game'] +
-        0.3 * qb_row['scaled_passing_tds_per_game'] +
-        0.2 * qb_row['scaled_completions_per_game'] +
-        0.2 * qb_row['scaled_passing_first_downs_per_game']
-    )
-    eff = (
-        0.25 * qb_row['scaled_passing_epa'] +
-        0.25 * qb_row['scaled_ngs_passer_rating'] +
-        0.25 * qb_row['scaled_ngs_completion_percentage'] +
-        0.25 * qb_row['scaled_ngs_expected_completion_percentage'] -
-        0.25 * qb_row['scaled_interceptions']
-    )
-    return 0.35 * prod + 0.65 * eff
-
-# Pistol Power Spread (Balanced)
-def compute_raw_fit_pistol_power_spread_qb(qb_row):
-    prod = (
-        0.35 * qb_row['scaled_passing_yards_per_game'] +
-        0.25 * qb_row['scaled_passing_tds_per_game'] +
-        0.2 * qb_row['scaled_completions_per_game'] +
-        0.2 * qb_row['scaled_passing_first_downs_per_game']
-    )
-    eff = (
-        0.30 * qb_row['scaled_passing_epa'] +
-        0.25 * qb_row['scaled_ngs_avg_time_to_throw'] +
-        0.25 * qb_row['scaled_ngs_avg_intended_air_yards'] +
-        0.20 * qb_row['scaled_ngs_passer_rating'] -
-        0.25 * qb_row['scaled_interceptions']
-    )
-    return 0.4 * prod + 0.6 * eff
+# === 4. Scheme Coefficients for QBs ===
+# Each scheme's raw fit combines a production component and an efficiency component, with a
+# penalty for interceptions in each efficiency component, as nested (weight, terms) components.
+# These tables are the only place the weights are defined: the vectorized fits score the
+# matrix (fit_matrix_qb) and the row-by-row raw fit functions are read off the same matrix.
+production_terms_qb = {
+    'scaled_passing_yards_per_game': 0.35,
+    'scaled_passing_tds_per_game': 0.25,
+    'scaled_completions_per_game': 0.2,
+    'scaled_passing_first_downs_per_game': 0.2
+}
+fit_coefficients_qb = {
+    'air_raid': {
+        'prod': (0.45, {
+            'scaled_passing_yards_per_game': 0.4,
+            'scaled_passing_tds_per_game': 0.2,
+            'scaled_completions_per_game': 0.2,
+            'scaled_passing_first_downs_per_game': 0.2
+        }),
+        'eff': (0.55, {
+            'scaled_passing_epa': 0.30,
+            'scaled_ngs_avg_time_to_throw': 0.25,
+            'scaled_ngs_avg_intended_air_yards': 0.25,
+            'scaled_ngs_completion_percentage': 0.20,
+            'scaled_interceptions': -0.25
+        })
+    },
+    'spread_option': {
+        'prod': (0.4, production_terms_qb),
+        'eff': (0.6, {
+            'scaled_passing_epa': 0.30,
+            'scaled_ngs_avg_time_to_throw': 0.20,
+            'scaled_ngs_completion_percentage': 0.30,
+            'scaled_ngs_passer_rating': 0.20,
+            'scaled_interceptions': -0.25
+        })
+    },
+    'west_coast': {
+        'prod': (0.4, production_terms_qb),
+        'eff': (0.6, {
+            'scaled_passing_epa': 0.30,
+            'scaled_ngs_passer_rating': 0.30,
+            'scaled_ngs_completion_percentage': 0.2,
+            'scaled_ngs_expected_completion_percentage': 0.2,
+            'scaled_interceptions': -0.25
+        })
+    },
+    'west_coast_mcvay': {
+        'prod': (0.4, production_terms_qb),
+        'eff': (0.55, {
+            'scaled_passing_epa': 0.25,
+            'scaled_ngs_passer_rating': 0.25,
+            'scaled_ngs_completion_percentage': 0.25,
+            'scaled_ngs_avg_intended_air_yards': 0.25,
+            'scaled_interceptions': -0.25
+        }),
+        'scaled_passing_yards_after_catch': 0.05
+    },
+    'shanahan': {
+        'prod': (0.5, {
+            'scaled_passing_yards_per_game': 0.3,
+            'scaled_passing_tds_per_game': 0.3,
+            'scaled_completions_per_game': 0.2,
+            'scaled_passing_first_downs_per_game': 0.2
+        }),
+        'eff': (0.5, {
+            'scaled_passing_epa': 0.3,
+            'scaled_ngs_passer_rating': 0.2,
+            'scaled_ngs_completion_percentage': 0.3,
+            'scaled_ngs_completion_percentage_above_expectation': 0.2,
+            'scaled_interceptions': -0.25
+        })
+    },
+    'run_power': {
+        'prod': (0.35, {
+            'scaled_passing_yards_per_game': 0.3,
+            'scaled_passing_tds_per_game': 0.3,
+            'scaled_completions_per_game': 0.2,
+            'scaled_passing_first_downs_per_game': 0.2
+        }),
+        'eff': (0.65, {
+            'scaled_passing_epa': 0.25,
+            'scaled_ngs_passer_rating': 0.25,
+            'scaled_ngs_completion_percentage': 0.25,
+            'scaled_ngs_expected_completion_percentage': 0.25,
+            'scaled_interceptions': -0.25
+        })
+    },
+    'pistol_power_spread': {
+        'prod': (0.4, production_terms_qb),
+        'eff': (0.6, {
+            'scaled_passing_epa': 0.30,
+            'scaled_ngs_avg_time_to_throw': 0.25,
+            'scaled_ngs_avg_intended_air_yards': 0.25,
+            'scaled_ngs_passer_rating': 0.20,
+            'scaled_interceptions': -0.25
+        })
+    }
+}
+fit_matrix_qb = build_coefficient_matrix(fit_coefficients_qb, list(fit_coefficients_qb))
+raw_fit_functions_qb = row_fit_functions(fit_matrix_qb)
 
-raw_fit_functions_qb = {
-    'air_raid': compute_raw_fit_air_raid_qb,
-    'spread_option': compute_raw_fit_spread_option_qb,
-    'west_coast': compute_raw_fit_west_coast_qb,
-    'west_coast_mcvay': compute_raw_fit_west_coast_mcvay_qb,
-    'shanahan': compute_raw_fit_shanahan_qb,
-    'run_power': compute_raw_fit_run_power_qb,
-    'pistol_power_spread': compute_raw_fit_pistol_power_spread_qb
+# Team score column for each scheme, in the same order as fit_matrix_qb.
+scheme_score_columns_qb = {
+    'air_raid': 'score_air_raid',
+    'spread_option': 'score_spread_option',
+    'west_coast': 'score_west_coast',
+    'west_coast_mcvay': 'score_west_coast_mcvay',
+    'shanahan': 'score_shanahan_wide_zone',
+    'run_power': 'score_run_power',
+    'pistol_power_spread': 'score_pistol_power_spread'
 }
+# Schemes where a mobile QB earns the rushing bonus.
+mobility_schemes_qb = ['spread_option', 'pistol_power_spread']
 
 # === 5. Scheme Weights for QBs ===
 def get_top3_scheme_weights_qb(team_row):
@@ -305,49 +310,45 @@ def compute_final_fit_qb(qb_row, scheme_weights, raw_fit_functions, team_need_bo
 
     return base_fit
 
-# === 5. Build the (Team, QB) Fit Dataset ===
-records = []
-# Loop over every team.
-for _, team_row in team_df.iterrows():
-    team_name = team_row['team_name']
-    # Get the team's top 3 scheme weights.
-    scheme_weights = get_top3_scheme_weights_qb(team_row)
-    team_need = compute_team_need_bonus(team_row)
-    # Loop over each QB in our (first 15) qb data.
-    for _, qb_row in qb_imputed_scaled.iterrows():
-        qb_name = qb_row['player_name']
-        qb_id = qb_row['player_id']
-        aav = qb_row.get('market_value', qb_row.get('AAV'))
-        completed_air_yards = qb_row['passing_yards']
-        prev_team = qb_row['Prev Team']
-        age = qb_row['Age']
-        games = qb_row['games']
-        headshot = qb_row['headshot_url']
-        # Compute raw fit for each scheme in the team's top 3.
-        final_fit = compute_final_fit_qb(qb_row, scheme_weights, raw_fit_functions_qb, team_need)
-        records.append({
-            'team_name': team_name,
-            'qb_name': qb_name,
-            'qb_id': qb_id,
-            'completed_air_yards': completed_air_yards,
-            'aav': aav,
-            'prev_team': prev_team,
-            'age': age,
-            'games': games,
-            'headshot': headshot, 
-            'final_fit': final_fit,
-        })
+# === 6b. Vectorized Final Fit for QBs ===
+def compute_rushing_bonus_qb_vectorized(qb_frame):
+    """
+    Vectorized compute_rushing_bonus_qb: returns one rushing bonus per QB in qb_frame.
+    """
+    carries = qb_frame['carries'].to_numpy(dtype=float)
+    games = qb_frame['games'].to_numpy(dtype=float)
+    rushing_yards = qb_frame['rushing_yards'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cpg = carries / games
+        ypc = np.where(carries > 0, rushing_yards / carries, 0)
+    extra_volume = np.minimum(cpg, 5) - 3
+    extra_efficiency = np.maximum(0, ypc - 3.5)
+    bonus = np.minimum(0.05 + 0.05 * (extra_volume * extra_efficiency), 0.15)
+    return np.where((games > 1) & (cpg >= 3), bonus, 0.0)
+
+def compute_final_fit_matrix_qb(qb_frame, scheme_weights):
+    """
+    Vectorized compute_final_fit_qb for every QB against every team at once.
+
+    Parameters:
+      qb_frame (pd.DataFrame): Imputed and scaled QB rows.
+      scheme_weights (np.ndarray): (teams x schemes) weights from top3_scheme_weights.
+
+    Returns:
+      np.ndarray: A (players x teams) array of base fits (games and recency penalties applied).
+    """
+    raw_fits = score_players(qb_frame, fit_matrix_qb)
+    base_fit = combine_scheme_fits(raw_fits, scheme_weights)
 
-# Create a DataFrame from our records.
-fit_qb_df = pd.DataFrame(records)
-fit_qb_df = fit_qb_df.dropna(subset=['final_fit'])
-print("Sample computed (Team, QB) raw fit scores:")
-print(fit_qb_df[['qb_name', 'final_fit']].head())
+    penalty = np.where(qb_frame['games'].to_numpy(dtype=float) < 9, 0.1, 0.0)
+    if 'season' in qb_frame.columns:
+        penalty += (2024 - qb_frame['season'].fillna(2024).to_numpy(dtype=float)) * 0.05
+    return base_fit - penalty[:, None]
 
-# === 8. Functionalized Full QB Ranking ===
-def compute_full_qb_rankings():
+# === 7. Functionalized Full QB Ranking ===
+def compute_full_qb_rankings(data_file=full_qb_data_file):
     # Load the full QB dataset (assumed available)
-    full_qb_df = pd.read_csv('processed_data/qb_data.csv')
+    full_qb_df = read_table(data_file)
     full_qb_df['games'] = full_qb_df['games'].replace(0, np.nan)
      # Create a new column: pass_yards_minus_yac = passing_yards - passing_yards_after_catch
     full_qb_df['pass_yards_minus_yac'] = full_qb_df['passing_yards'] - full_qb_df['passing_yards_after_catch']
@@ -406,8 +407,72 @@ def compute_full_qb_rankings():
     ranking_qb_df = grouped_full_qb[['player_name'] + [metric + '_rank' for metric in ranking_columns.keys()]]
     return ranking_qb_df
 
-ranking_qb_df = compute_full_qb_rankings()
-fit_qb_df = fit_qb_df.merge(ranking_qb_df, left_on='qb_name', right_on='player_name', how='left').drop(columns=['player_name'])
+# === 8. Build the (Team, QB) Fit Dataset ===
+@lru_cache(maxsize=None)
+def build_fit_qb_df():
+    """
+    Builds the full (team, QB) fit dataset row by row with the scalar fit functions
+    and merges in the QB rankings. The API uses the vectorized fit table instead; this
+    is the reference version, built only when asked for.
+    """
+    team_df, qb_imputed_scaled = load_qb_data()
+    records = []
+    # Loop over every team.
+    for _, team_row in team_df.iterrows():
+        team_name = team_row['team_name']
+        # Get the team's top 3 scheme weights.
+        scheme_weights = get_top3_scheme_weights_qb(team_row)
+        team_need = compute_team_need_bonus(team_row)
+        # Loop over each QB in our (first 15) qb data.
+        for _, qb_row in qb_imputed_scaled.iterrows():
+            qb_name = qb_row['player_name']
+            qb_id = qb_row['player_id']
+            aav = qb_row.get('market_value', qb_row.get('AAV'))
+            completed_air_yards = qb_row['passing_yards']
+            prev_team = qb_row['Prev Team']
+            age = qb_row['Age']
+            games = qb_row['games']
+            headshot = qb_row['headshot_url']
+            # Compute raw fit for each scheme in the team's top 3.
+            final_fit = compute_final_fit_qb(qb_row, scheme_weights, raw_fit_functions_qb, team_need)
+            records.append({
+                'team_name': team_name,
+                'qb_name': qb_name,
+                'qb_id': qb_id,
+                'completed_air_yards': completed_air_yards,
+                'aav': aav,
+                'prev_team': prev_team,
+                'age': age,
+                'games': games,
+                'headshot': headshot, 
+                'final_fit': final_fit,
+            })
+
+    # Create a DataFrame from our records.
+    fit_qb_df = pd.DataFrame(records)
+    fit_qb_df = fit_qb_df.dropna(subset=['final_fit'])
+    ranking_qb_df = compute_full_qb_rankings()
+    return fit_qb_df.merge(ranking_qb_df, left_on='qb_name', right_on='player_name', how='left').drop(columns=['player_name'])
+
+# === 9. Lazy Module Attributes ===
+def __getattr__(name):
+    """
+    Keeps the old module-level frames (team_df, qb_imputed_scaled, fit_qb_df,
+    ranking_qb_df) importable; they are now built on first access.
+    """
+    if name == 'team_df':
+        return load_qb_data()[0]
+    if name == 'qb_imputed_scaled':
+        return load_qb_data()[1]
+    if name == 'fit_qb_df':
+        return build_fit_qb_df()
+    if name == 'ranking_qb_df':
+        return compute_full_qb_rankings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-print("Final QB Fit Data with Rankings:")
-print(fit_qb_df.head())
+if __name__ == "__main__":
+    fit_qb_df = build_fit_qb_df()
+    print("Sample computed (Team, QB) raw fit scores:")
+    print(fit_qb_df[['qb_name', 'final_fit']].head())
+    print("Final QB Fit Data with Rankings:")
+    print(fit_qb_df.head())
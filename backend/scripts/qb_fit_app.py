@@ -1,10 +1,105 @@
+import os
+import zlib
 import pandas as pd
 import numpy as np
+from scripts.fit_engine import top3_scheme_mask, top3_scheme_weights, column_or_fallback
+from scripts.fit_tensor import make_fit_table, get_fit_table, get_player_fit, sorted_team_fits
+from scripts.fit_store import shared_fit_table
+from scripts.ranking_cache import get_rankings, get_player_rankings, build_ranking_entry
 from scripts.qb_fit import (
-    team_df, qb_imputed_scaled, get_top3_scheme_weights_qb, raw_fit_functions_qb,
-    compute_final_fit_qb, compute_team_need_bonus, compute_full_qb_rankings, compute_rushing_bonus_qb
+    load_qb_data, scheme_score_columns_qb, mobility_schemes_qb,
+    compute_final_fit_matrix_qb, compute_team_need_bonus, full_qb_data_file, compute_full_qb_rankings,
+    compute_rushing_bonus_qb_vectorized
 )
 
+# How the 0 to 0.2 QB fit floor is drawn:
+#   - "seeded" (default): one draw per (team, QB) pair, derived from the team name, the QB's id
+#     and QB_FIT_FLOOR_SEED, so the same request always returns the same fits and the list
+#     and detail endpoints agree.
+#   - "random": a fresh np.random draw on every read (the original behavior).
+#   - "none": no floor.
+fit_floor_mode_qb = os.environ.get('QB_FIT_FLOOR', 'seeded')
+fit_floor_seed_qb = int(os.environ.get('QB_FIT_FLOOR_SEED', '0'))
+
+def build_qb_fit_table():
+    """
+    Scores every free agent QB against every team at once.
+
+    Returns:
+    - A FitTable of (QB, team) final fits. The seeded floor is applied here; the
+      random floor (QB_FIT_FLOOR=random) is applied each time the fits are read.
+    """
+    team_df, qb_imputed_scaled = load_qb_data()
+    teams = team_df[team_df['team_name'].notna()].reset_index(drop=True)
+
+    # Get every team's top 3 schemes and their weights (teams x schemes)
+    top3 = top3_scheme_mask(teams, scheme_score_columns_qb)
+    scheme_weights = top3_scheme_weights(teams, scheme_score_columns_qb)
+
+    # Compute base final fit (without need bonus)
+    fits = compute_final_fit_matrix_qb(qb_imputed_scaled, scheme_weights)
+    # Add bonus for QB mobility (for teams running applicable schemes)
+    schemes = list(scheme_score_columns_qb)
+    mobility = top3[:, [schemes.index(scheme) for scheme in mobility_schemes_qb]].any(axis=1)
+    fits += np.outer(compute_rushing_bonus_qb_vectorized(qb_imputed_scaled), mobility)
+    # Apply the team need bonus in the app
+    fits += teams.apply(compute_team_need_bonus, axis=1).to_numpy(dtype=float)
+    age = qb_imputed_scaled['Age']
+    fits -= np.where(age > 35, 0.05, 0.0)[:, None]
+
+    players = pd.DataFrame({
+        'qb_name': qb_imputed_scaled['player_name'],
+        'qb_id': qb_imputed_scaled['player_id'],
+        'completed_air_yards': qb_imputed_scaled['passing_yards'],
+        'aav': column_or_fallback(qb_imputed_scaled, 'market_value', 'AAV'),
+        'prev_team': qb_imputed_scaled['Prev Team'],
+        'age': age,
+        'games': qb_imputed_scaled['games'],
+        'headshot': qb_imputed_scaled['headshot_url']
+    })
+    if fit_floor_mode_qb == 'random':
+        return make_fit_table(teams['team_name'], players, fits, 'qb_id', floor=apply_fit_floor_qb)
+    if fit_floor_mode_qb == 'seeded':
+        fits = np.maximum(fits, seeded_fit_floor_qb(teams['team_name'], players['qb_id']))
+    return make_fit_table(teams['team_name'], players, fits, 'qb_id')
+
+def load_qb_fit_table():
+    """
+    Returns the QB FitTable from the shared fit store (memory-mapped, shared by every
+    worker process), building it first if the store is out of date.
+    """
+    floor = apply_fit_floor_qb if fit_floor_mode_qb == 'random' else None
+    return shared_fit_table('QB', build_qb_fit_table, 'qb_id', f"{fit_floor_mode_qb}:{fit_floor_seed_qb}", floor)
+
+def seeded_fit_floor_qb(team_names, player_ids, seed=None):
+    """
+    Deterministic stand-in for np.random.uniform(0, 0.2): one floor per (QB, team) pair,
+    taken from the CRC32 of "team|player_id" (started from the seed), scaled to [0, 0.2).
+
+    Parameters:
+    - team_names (pd.Series): Team names, one per column of the fit table.
+    - player_ids (pd.Series): QB ids, one per row of the fit table.
+    - seed (int): Changes every draw; defaults to QB_FIT_FLOOR_SEED.
+
+    Returns:
+    - A (QBs x teams) array of floors.
+    """
+    if seed is None:
+        seed = fit_floor_seed_qb
+    floors = np.empty((len(player_ids), len(team_names)))
+    for j, team_name in enumerate(team_names):
+        for i, player_id in enumerate(player_ids):
+            key = f"{team_name}|{str(player_id).strip()}".encode()
+            floors[i, j] = zlib.crc32(key, seed & 0xFFFFFFFF) / 2**32
+    return floors * 0.2
+
+def apply_fit_floor_qb(final_fit):
+    """
+    Ensures the final score isn't negative: raises each fit to at least a random number from 0 to 0.2.
+    Only used when QB_FIT_FLOOR=random.
+    """
+    return np.maximum(final_fit, np.random.uniform(0, 0.2, size=len(final_fit)))
+
 def get_qb_fits_for_team(team_name):
     """
     Given an NFL team name, computes the best QB fits using the trained model.
@@ -15,66 +110,49 @@ def get_qb_fits_for_team(team_name):
     Returns:
     - A sorted DataFrame with QB names and their fit scores for the specified team.
     """
-    # Find the team in team_df
-    team_row = team_df[team_df['team_name'].str.contains(team_name, case=False, na=False)]
-
-    if team_row.empty:
+    results_df = get_qb_fits_for_teams([team_name])[team_name]
+    if results_df is None:
         print(f"Error: Team '{team_name}' not found in the dataset.")
+    return results_df
+
+def get_qb_fits_for_teams(team_names, limit=None, offset=0, min_fit=None, fields=None):
+    """
+    Returns the sorted QB fits (with ranking columns) for several teams in one pass over
+    the QB fit table: {team_name: DataFrame, or None if the team is unknown}.
+    limit, offset, min_fit and fields select a page of each team's results (see sorted_team_fits).
+    """
+    table = get_fit_table('QB', load_qb_fit_table)
+    # Merge in the full QB ranking information once for every team.
+    ranking_qb_df = get_rankings('QB', full_qb_data_file, compute_full_qb_rankings)
+    ranked_players = table.players.merge(ranking_qb_df, left_on='qb_name', right_on='player_name', how='left').drop(columns=['player_name'])
+    return sorted_team_fits(table, ranked_players, team_names, limit, offset, min_fit, fields)
+
+def get_qb_fit_for_player(team_name, player_id):
+    """
+    Returns one QB's final fit for a team merged with its ranking columns, as a dict,
+    or None if the team or player is unknown. Hash lookups only; no scoring pass.
+    """
+    table = get_fit_table('QB', load_qb_fit_table)
+    final_fit = get_player_fit(table, team_name, player_id)
+    if final_fit is None:
         return None
+    qb_name = table.players['qb_name'].iat[table.player_index[player_id.strip()]]
+    record = dict(get_player_rankings('QB', full_qb_data_file, compute_full_qb_rankings, qb_name))
+    record['final_fit'] = final_fit
+    return record
+
+def rebuild_qb_fits():
+    """
+    Re-reads the QB data and builds a new fit table and ranking entry, without touching
+    the ones being served (the caller swaps them in). If another worker already stored
+    the fit table for the same data, that one is attached instead of building it again.
 
-    team_row = team_row.iloc[0]  # Take the first matching row
-
-    # Get the team's top 3 scheme weights
-    scheme_weights = get_top3_scheme_weights_qb(team_row)
-
-    # Compute raw fit scores for each QB
-    records = []
-    for _, qb_row in qb_imputed_scaled.iterrows():
-        qb_name = qb_row['player_name']
-        qb_id = qb_row['player_id']
-        completed_air_yards = qb_row['passing_yards']
-        aav = qb_row.get('market_value', qb_row.get('AAV'))
-        prev_team = qb_row['Prev Team']
-        age = qb_row['Age']
-        games = qb_row['games']
-        headshot = qb_row['headshot_url']
-
-        # Compute base final fit (without need bonus)
-        base_fit = compute_final_fit_qb(qb_row, scheme_weights, raw_fit_functions_qb)
-        team_need_bonus = compute_team_need_bonus(team_row)
-        # Add bonus for QB mobility (for applicable schemes)
-        mobility_schemes = ['spread_option', 'pistol_power_spread']
-        if any(scheme in scheme_weights for scheme in mobility_schemes):
-            base_fit += compute_rushing_bonus_qb(qb_row)
-        # Apply the team need bonus in the app
-        final_fit = base_fit + team_need_bonus
-        if age > 35:
-            final_fit -= 0.05
-        final_fit = max(final_fit, np.random.uniform(0, 0.2))  
-        # Ensure the final score isn't negative and add a random number from 0 to 0.2.
-
-        # Store results
-        records.append({
-            'qb_name': qb_name,
-            'qb_id': qb_id,
-            'completed_air_yards': completed_air_yards,
-            'aav': aav,
-            'prev_team': prev_team,
-            'age': age,
-            'games': games,
-            'headshot': headshot, 
-            'final_fit': final_fit
-        })
-
-    # Convert to DataFrame and sort by best fit
-    results_df = pd.DataFrame(records).sort_values(by='final_fit', ascending=False)
-    # Merge in the full QB ranking information.
-    ranking_qb_df = compute_full_qb_rankings()
-    # Add completed air yards to results df
-    results_df['completed_air_yards'] = results_df['qb_name'].map(qb_imputed_scaled.set_index('player_name')['passing_yards'])
-    results_df = results_df.merge(ranking_qb_df, left_on='qb_name', right_on='player_name', how='left').drop(columns=['player_name'])
+    Returns:
+    - (FitTable, ranking cache entry)
+    """
+    load_qb_data.cache_clear()
+    return load_qb_fit_table(), build_ranking_entry(full_qb_data_file, compute_full_qb_rankings)
 
-    return results_df
 
 # === Run the script ===
 if __name__ == "__main__":
@@ -0,0 +1,88 @@
+import os
+import threading
+
+# === Ranking Cache ===
+# compute_full_*_rankings re-read the full position CSV, re-fit an imputer and scaler,
+# regroup and re-rank. The result only changes when that CSV changes, so we keep one
+# ranking frame per position together with the fingerprint of the file it came from,
+# and recompute only when the fingerprint moves. Each entry is
+# (fingerprint, ranking frame, {player_name: ranking record}).
+_rankings = {}
+_rankings_lock = threading.Lock()
+# Once replace_rankings has installed entries (the processed_data snapshot manager does),
+# they are served as-is: the snapshot decides when rankings change, not the request path.
+_rankings_replaced = False
+
+def file_fingerprint(path):
+    """
+    Cheap fingerprint of a data file: (modification time in ns, size in bytes).
+    A rewritten CSV changes at least one of them.
+    """
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+def build_ranking_entry(data_file, compute_rankings):
+    """
+    Computes the rankings for data_file and returns a cache entry:
+    (fingerprint, ranking frame, {player_name: ranking record}).
+    """
+    # Fingerprint first, so a file rewritten while we read it is recomputed next time.
+    fingerprint = file_fingerprint(data_file)
+    ranking_df = compute_rankings(data_file)
+    records = ranking_df.set_index('player_name').to_dict(orient='index')
+    return (fingerprint, ranking_df, records)
+
+def _get_entry(position, data_file, compute_rankings):
+    cached = _rankings.get(position)
+    if cached is not None and _rankings_replaced:
+        return cached
+    fingerprint = file_fingerprint(data_file)
+    if cached is not None and cached[0] == fingerprint:
+        return cached
+
+    with _rankings_lock:
+        cached = _rankings.get(position)
+        if cached is not None and cached[0] == fingerprint:
+            return cached
+        cached = build_ranking_entry(data_file, compute_rankings)
+        _rankings[position] = cached
+        return cached
+
+def get_rankings(position, data_file, compute_rankings):
+    """
+    Returns the ranking DataFrame for a position, recomputing it only when data_file changed.
+
+    Parameters:
+      position (str): Position key, e.g. "QB".
+      data_file (str): The full position CSV the rankings are computed from.
+      compute_rankings (callable): compute_full_*_rankings; called with data_file.
+
+    Returns:
+      pd.DataFrame: The cached (or freshly computed) rankings. Treat it as read-only.
+    """
+    return _get_entry(position, data_file, compute_rankings)[1]
+
+def get_player_rankings(position, data_file, compute_rankings, player_name):
+    """
+    Returns one player's ranking columns as a dict (a hash lookup on player_name),
+    or an empty dict if the player has no rankings.
+    """
+    return _get_entry(position, data_file, compute_rankings)[2].get(player_name, {})
+
+def replace_rankings(entries):
+    """
+    Swaps in a new set of entries from build_ranking_entry ({position: entry}) at once.
+    """
+    global _rankings, _rankings_replaced
+    with _rankings_lock:
+        _rankings = dict(entries)
+        _rankings_replaced = True
+
+def clear_rankings():
+    """
+    Drops every cached ranking frame.
+    """
+    global _rankings_replaced
+    with _rankings_lock:
+        _rankings.clear()
+        _rankings_replaced = False
@@ -1,22 +1,28 @@
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LinearRegression
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
+from scripts.fit_engine import (
+    INTERCEPT, build_coefficient_matrix, row_fit_functions, score_row_terms, score_players, combine_scheme_fits
+)
+from scripts.data_io import read_table
 
-# === 1. Read the Data ===
-team_df = pd.read_csv('processed_data/team_seasonal_stats.csv')
-rb_df = pd.read_csv('processed_data/fa_rbs.csv')  # Free agent RB data
+# === 1. Data Files ===
+# Nothing is read at import time: load_rb_data() reads and preprocesses the data on first use.
+team_data_file = 'processed_data/team_seasonal_stats.csv'
+fa_rb_data_file = 'processed_data/fa_rbs.csv'  # Free agent RB data
+# Full RB dataset (all seasons), used for the advanced stat rankings
+full_rb_data_file = 'processed_data/rb_data.csv'
 
 # === 2. Preprocess RB Data ===
 def safe_ypc(row):
     return row['rushing_yards'] / row['carries'] if row['carries'] > 0 else 0
 
-rb_df['yards_per_carry'] = rb_df.apply(safe_ypc, axis=1)
-
 # Define columns used in production and efficiency calculations.
 production_cols_rb = [
     'rushing_yards', 'rushing_tds',
@@ -31,15 +37,35 @@ fumble_cols = ['rushing_fumbles', 'receiving_fumbles']
 additional_cols = ['receiving_yards_after_catch']
 
 all_rb_cols = list(set(production_cols_rb + efficiency_cols_rb + fumble_cols + additional_cols + ['carries']))
+scaled_cols_rb = ["scaled_" + col for col in all_rb_cols]
+
+def preprocess_rb_data(rb_df):
+    """
+    Adds yards per carry to the free agent RB data, imputes missing values
+    and scales the fit columns. Returns the imputed and scaled frame.
+    """
+    rb_df['yards_per_carry'] = rb_df.apply(safe_ypc, axis=1)
 
-imputer = SimpleImputer(strategy='median')
-rb_imputed = rb_df.copy()
-rb_imputed[all_rb_cols] = imputer.fit_transform(rb_imputed[all_rb_cols])
+    imputer = SimpleImputer(strategy='median')
+    rb_imputed = rb_df.copy()
+    rb_imputed[all_rb_cols] = imputer.fit_transform(rb_imputed[all_rb_cols])
 
-scaler = MinMaxScaler(feature_range=(0.2, 1))
-rb_imputed_scaled = rb_imputed.copy()
-scaled_cols_rb = ["scaled_" + col for col in all_rb_cols]
-rb_imputed_scaled[scaled_cols_rb] = scaler.fit_transform(rb_imputed[all_rb_cols])
+    scaler = MinMaxScaler(feature_range=(0.2, 1))
+    rb_imputed_scaled = rb_imputed.copy()
+    rb_imputed_scaled[scaled_cols_rb] = scaler.fit_transform(rb_imputed[all_rb_cols])
+    return rb_imputed_scaled
+
+@lru_cache(maxsize=None)
+def load_rb_data():
+    """
+    Reads the team and free agent RB data once and preprocesses it.
+
+    Returns:
+      tuple: (team_df, rb_imputed_scaled). Treat both as read-only.
+    """
+    team_df = read_table(team_data_file)
+    rb_imputed_scaled = preprocess_rb_data(read_table(fa_rb_data_file))
+    return team_df, rb_imputed_scaled
 
 # === 3. Bonus Functions ===
 def compute_volume_bonus_rb(rb_row):
@@ -67,111 +93,130 @@ def compute_receiving_bonus_rb(rb_row):
         bonus += 0.0375
     return bonus
 
-# === 4. Production Score & Raw Fit Functions ===
+# === 4. Production Score & Scheme Coefficients ===
+# Each scheme's raw fit is a production component (80% rushing, 20% receiving) plus an efficiency
+# component, as nested (weight, terms) components. Terms like 0.10 * (1 - scaled_ngs_avg_time_to_los)
+# become an intercept plus a negative weight. These tables are the only place the weights are
+# defined: the vectorized fits score the matrix (fit_matrix_rb) and the row-by-row raw fit
+# functions are read off the same matrix. Run power also gets the carry bonuses of
+# compute_run_power_bonus_rb_vectorized.
+production_terms_rb = {
+    'rushing': (0.8, {
+        'scaled_rushing_yards': 0.4,
+        'scaled_rushing_tds': 0.3,
+        'scaled_yards_per_carry': 0.3
+    }),
+    'receiving': (0.2, {
+        'scaled_receiving_yards': 0.5,
+        'scaled_receiving_tds': 0.5
+    })
+}
+fit_coefficients_rb = {
+    'air_raid': {
+        'prod': (0.40, production_terms_rb),
+        'eff': (0.60, {
+            'scaled_receiving_epa': 0.25,
+            'scaled_rushing_epa': 0.35,
+            'scaled_ngs_efficiency': 0.20,
+            INTERCEPT: 0.10,
+            'scaled_ngs_avg_time_to_los': -0.10,
+            'scaled_receiving_fumbles': -0.10,
+            'scaled_rushing_fumbles': -0.05
+        })
+    },
+    'spread_option': {
+        'prod': (0.40, production_terms_rb),
+        'eff': (0.60, {
+            'scaled_rushing_epa': 0.40,
+            'scaled_receiving_epa': 0.20,
+            'scaled_ngs_efficiency': 0.20,
+            INTERCEPT: 0.10,
+            'scaled_ngs_avg_time_to_los': -0.10,
+            'scaled_ngs_rush_yards_over_expected': 0.10,
+            'scaled_rushing_fumbles': -0.05,
+            'scaled_receiving_fumbles': -0.05
+        })
+    },
+    'west_coast': {
+        'prod': (0.40, production_terms_rb),
+        'eff': (0.60, {
+            'scaled_receiving_epa': 0.30,
+            'scaled_rushing_epa': 0.30,
+            'scaled_ngs_efficiency': 0.20,
+            INTERCEPT: 0.10,
+            'scaled_ngs_avg_time_to_los': -0.10,
+            'scaled_receiving_yards_after_catch': 0.10,
+            'scaled_receiving_fumbles': -0.10,
+            'scaled_rushing_fumbles': -0.10
+        })
+    },
+    'mcvay': {
+        'prod': (0.40, production_terms_rb),
+        'eff': (0.60, {
+            'scaled_rushing_epa': 0.40,
+            'scaled_receiving_epa': 0.15,
+            'scaled_ngs_efficiency': 0.20,
+            INTERCEPT: 0.15,
+            'scaled_ngs_avg_time_to_los': -0.15,
+            'scaled_ngs_rush_yards_over_expected': 0.10,
+            'scaled_rushing_fumbles': -0.05,
+            'scaled_receiving_fumbles': -0.05
+        })
+    },
+    'shanahan': {
+        'prod': (0.6, production_terms_rb),
+        'eff': (0.4, {
+            'scaled_rushing_epa': 0.6,
+            'scaled_ngs_efficiency': 0.2,
+            'scaled_ngs_rush_yards_over_expected': 0.2,
+            'scaled_rushing_fumbles': -0.05
+        })
+    },
+    'run_power': {
+        # The carry bonuses are thresholds, added in compute_run_power_bonus_rb_vectorized.
+        'prod': (0.6, production_terms_rb),
+        'eff': (0.4, {
+            'scaled_rushing_epa': 0.6,
+            'scaled_ngs_efficiency': 0.2,
+            'scaled_ngs_rush_yards_over_expected': 0.15,
+            'scaled_rushing_fumbles': -0.05
+        })
+    },
+    'pistol_power_spread': {
+        'prod': (0.40, production_terms_rb),
+        'eff': (0.60, {
+            'scaled_rushing_epa': 0.40,
+            'scaled_receiving_epa': 0.30,
+            'scaled_ngs_efficiency': 0.20,
+            INTERCEPT: 0.05,
+            'scaled_ngs_avg_time_to_los': -0.05,
+            'scaled_ngs_rush_yards_over_expected': 0.05,
+            'scaled_rushing_fumbles': -0.05,
+            'scaled_receiving_fumbles': -0.05
+        })
+    }
+}
+fit_matrix_rb = build_coefficient_matrix(fit_coefficients_rb, list(fit_coefficients_rb))
+raw_fit_functions_rb = row_fit_functions(fit_matrix_rb)
+run_power_fit_rb = raw_fit_functions_rb['run_power']
+
 def compute_production_score_rb(rb_row):
-    # 80% from rushing production, 20% from receiving production.
-    rushing_score = (
-        0.4 * rb_row['scaled_rushing_yards'] +
-        0.3 * rb_row['scaled_rushing_tds'] +
-        0.3 * rb_row['scaled_yards_per_carry']
-    )
-    receiving_score = (
-        0.5 * rb_row['scaled_receiving_yards'] +
-        0.5 * rb_row['scaled_receiving_tds']
-    )
-    return 0.8 * rushing_score + 0.2 * receiving_score
-
-def compute_raw_fit_air_raid_rb(rb_row):
-    prod = compute_production_score_rb(rb_row)
-    eff = (
-        0.25 * rb_row['scaled_receiving_epa'] +
-        0.35 * rb_row['scaled_rushing_epa'] +
-        0.20 * rb_row['scaled_ngs_efficiency'] +
-        0.10 * (1 - rb_row['scaled_ngs_avg_time_to_los']) -
-        0.10 * rb_row.get('scaled_receiving_fumbles', 0) -
-        0.05 * rb_row.get('scaled_rushing_fumbles', 0)
-    )
-    return 0.40 * prod + 0.60 * eff
-
-def compute_raw_fit_spread_option_rb(rb_row):
-    prod = compute_production_score_rb(rb_row)
-    eff = (
-        0.40 * rb_row['scaled_rushing_epa'] +
-        0.20 * rb_row['scaled_receiving_epa'] +
-        0.20 * rb_row['scaled_ngs_efficiency'] +
-        0.10 * (1 - rb_row['scaled_ngs_avg_time_to_los']) +
-        0.10 * rb_row['scaled_ngs_rush_yards_over_expected'] -
-        0.05 * (rb_row.get('scaled_rushing_fumbles', 0) + rb_row.get('scaled_receiving_fumbles', 0))
-    )
-    return 0.40 * prod + 0.60 * eff
-
-def compute_raw_fit_west_coast_rb(rb_row):
-    prod = compute_production_score_rb(rb_row)
-    eff = (
-        0.30 * rb_row['scaled_receiving_epa'] +
-        0.30 * rb_row['scaled_rushing_epa'] +
-        0.20 * rb_row['scaled_ngs_efficiency'] +
-        0.10 * (1 - rb_row['scaled_ngs_avg_time_to_los']) +
-        0.10 * rb_row.get('scaled_receiving_yards_after_catch', 0) -
-        0.10 * (rb_row.get('scaled_receiving_fumbles', 0) + rb_row.get('scaled_rushing_fumbles', 0))
-    )
-    return 0.40 * prod + 0.60 * eff
-
-def compute_raw_fit_mcvay_rb(rb_row):
-    prod = compute_production_score_rb(rb_row)
-    eff = (
-        0.40 * rb_row['scaled_rushing_epa'] +
-        0.15 * rb_row['scaled_receiving_epa'] +
-        0.20 * rb_row['scaled_ngs_efficiency'] +
-        0.15 * (1 - rb_row['scaled_ngs_avg_time_to_los']) +
-        0.10 * rb_row['scaled_ngs_rush_yards_over_expected'] -
-        0.05 * (rb_row.get('scaled_rushing_fumbles', 0) + rb_row.get('scaled_receiving_fumbles', 0))
-    )
-    return 0.40 * prod + 0.60 * eff
-
-def compute_raw_fit_shanahan_rb(rb_row):
-    prod = compute_production_score_rb(rb_row)
-    eff = (
-        0.6 * rb_row['scaled_rushing_epa'] +
-        0.2 * rb_row['scaled_ngs_efficiency'] +
-        0.2 * rb_row['scaled_ngs_rush_yards_over_expected'] -
-        0.05 * rb_row.get('scaled_rushing_fumbles', 0)
-    )
-    return 0.6 * prod + 0.4 * eff
+    return score_row_terms(rb_row, production_terms_rb)
 
 def compute_raw_fit_run_power_rb(rb_row):
-    prod = compute_production_score_rb(rb_row)
-    eff = (
-        0.6 * rb_row['scaled_rushing_epa'] +
-        0.2 * rb_row['scaled_ngs_efficiency'] +
-        0.15 * rb_row['scaled_ngs_rush_yards_over_expected'] -
-        0.05 * rb_row.get('scaled_rushing_fumbles', 0)
-    )
-    carries_per_game = rb_row['carries'] / rb_row['games'] if rb_row['games'] > 0 else 0
-    carry_bonus = 0.05 if rb_row['carries'] >= 250 else 0
-    per_game_bonus = 0.05 if carries_per_game >= 15 else 0
-    return 0.6 * prod + 0.4 * eff + carry_bonus + per_game_bonus
-
-def compute_raw_fit_pistol_power_spread_rb(rb_row):
-    prod = compute_production_score_rb(rb_row)
-    eff = (
-        0.40 * rb_row['scaled_rushing_epa'] +
-        0.30 * rb_row['scaled_receiving_epa'] +
-        0.20 * rb_row['scaled_ngs_efficiency'] +
-        0.05 * (1 - rb_row['scaled_ngs_avg_time_to_los']) +
-        0.05 * rb_row['scaled_ngs_rush_yards_over_expected'] -
-        0.05 * (rb_row.get('scaled_rushing_fumbles', 0) + rb_row.get('scaled_receiving_fumbles', 0))
-    )
-    return 0.40 * prod + 0.60 * eff
-
-raw_fit_functions_rb = {
-    'air_raid': compute_raw_fit_air_raid_rb,
-    'spread_option': compute_raw_fit_spread_option_rb,
-    'west_coast': compute_raw_fit_west_coast_rb,
-    'mcvay': compute_raw_fit_mcvay_rb,
-    'shanahan': compute_raw_fit_shanahan_rb,
-    'run_power': compute_raw_fit_run_power_rb,
-    'pistol_power_spread': compute_raw_fit_pistol_power_spread_rb
+    return run_power_fit_rb(rb_row) + float(compute_run_power_bonus_rb_vectorized(rb_row))
+
+raw_fit_functions_rb['run_power'] = compute_raw_fit_run_power_rb
+
+# Team score column for each scheme, in the same order as fit_matrix_rb.
+scheme_score_columns_rb = {
+    'air_raid': 'score_air_raid',
+    'spread_option': 'score_spread_option',
+    'west_coast': 'score_west_coast',
+    'mcvay': 'score_west_coast_mcvay',
+    'shanahan': 'score_shanahan_wide_zone',
+    'run_power': 'score_run_power',
+    'pistol_power_spread': 'score_pistol_power_spread'
 }
 
 # === 5. Scheme Weights ===
@@ -217,66 +262,69 @@ def compute_final_fit_rb(rb_row, scheme_weights, raw_fit_functions):
 
     return base_fit - recency_penalty
 
-# === 7. Build (Team, RB) Fit Dataset ===
-records_rb = []
-for _, team_row in team_df.iterrows():
-    team_name = team_row['team_name']
-    scheme_weights = get_top3_scheme_weights_rb(team_row)
-    for _, rb_row in rb_imputed_scaled.iterrows():
-        rb_name = rb_row['player_name']
-        rb_id = rb_row['player_id']
-        aav = rb_row.get('market_value', rb_row.get('AAV'))
-        prev_team = rb_row['Prev Team']
-        age = rb_row['Age']
-        games = rb_row['games']
-        headshot = rb_row['headshot_url']
-        final_fit = compute_final_fit_rb(rb_row, scheme_weights, raw_fit_functions_rb)
-        records_rb.append({
-            'team_name': team_name,
-            'rb_name': rb_name,
-            'rb_id': rb_id,
-            'aav': aav,
-            'prev_team': prev_team,
-            'age': age,
-            'games': games,
-            'headshot': headshot,
-            'final_fit': final_fit,
-            'production_score': compute_production_score_rb(rb_row),
-            'air_raid_fit': raw_fit_functions_rb.get('air_raid', lambda x: np.nan)(rb_row),
-            'spread_option_fit': raw_fit_functions_rb.get('spread_option', lambda x: np.nan)(rb_row),
-            'west_coast_fit': raw_fit_functions_rb.get('west_coast', lambda x: np.nan)(rb_row),
-            'mcvay_fit': raw_fit_functions_rb.get('mcvay', lambda x: np.nan)(rb_row),
-            'shanahan_fit': raw_fit_functions_rb.get('shanahan', lambda x: np.nan)(rb_row),
-            'run_power_fit': raw_fit_functions_rb.get('run_power', lambda x: np.nan)(rb_row),
-            'pistol_power_spread_fit': raw_fit_functions_rb.get('pistol_power_spread', lambda x: np.nan)(rb_row)
-        })
+# === 6b. Vectorized Final Fit ===
+def compute_run_power_bonus_rb_vectorized(rb_frame):
+    """
+    Carry bonuses added to the run power raw fit, one per RB in rb_frame
+    (or a single value for one RB row).
+    """
+    carries = np.asarray(rb_frame['carries'], dtype=float)
+    games = np.asarray(rb_frame['games'], dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        carries_per_game = np.where(games > 0, carries / games, 0)
+    return np.where(carries >= 250, 0.05, 0.0) + np.where(carries_per_game >= 15, 0.05, 0.0)
 
-fit_rb_df = pd.DataFrame(records_rb)
-fit_rb_df = fit_rb_df.dropna(subset=['final_fit'])
+def compute_bonuses_rb_vectorized(rb_frame):
+    """
+    Vectorized compute_volume_bonus_rb + compute_ypc_bonus_rb + compute_receiving_bonus_rb.
+    """
+    carries = rb_frame['carries'].to_numpy(dtype=float)
+    games = rb_frame['games'].to_numpy(dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        carries_per_game = np.where(games > 0, carries / games, 0)
+    bonus = np.where(carries >= 250, 0.02, 0.0)
+    bonus += np.where(carries_per_game >= 15, 0.03, 0.0)
+    bonus += np.where(rb_frame['yards_per_carry'].to_numpy(dtype=float) > 4.2, 0.1, 0.0)
+    if 'receptions' in rb_frame.columns:
+        bonus += np.where(rb_frame['receptions'].to_numpy(dtype=float) >= 30, 0.0375, 0.0)
+    if 'receiving_yards' in rb_frame.columns:
+        bonus += np.where(rb_frame['receiving_yards'].to_numpy(dtype=float) >= 300, 0.0375, 0.0)
+    return bonus
 
-# === 8. Train a Model Pipeline (Optional) ===
-features_rb = ['production_score', 'air_raid_fit', 'spread_option_fit', 'west_coast_fit', 
-               'mcvay_fit', 'shanahan_fit', 'run_power_fit', 'pistol_power_spread_fit']
-X_rb = fit_rb_df[features_rb]
-y_rb = fit_rb_df['final_fit']
-X_train_rb, X_test_rb, y_train_rb, y_test_rb = train_test_split(X_rb, y_rb, test_size=0.2, random_state=42)
-pipeline_rb = Pipeline([
-    ('imputer', SimpleImputer(strategy='median')),
-    ('regressor', LinearRegression())
-])
-pipeline_rb.fit(X_train_rb, y_train_rb)
-y_pred_rb = pipeline_rb.predict(X_test_rb)
-mse_rb = mean_squared_error(y_test_rb, y_pred_rb)
-print("Mean Squared Error for RB model:", mse_rb)
-
-# === 9. Functionalized Full RB Ranking ===
-def compute_full_rb_rankings():
+def compute_raw_fits_rb_vectorized(rb_frame):
+    """
+    Raw fit of every RB in rb_frame for every scheme, as a (players x schemes) array.
+    """
+    raw_fits = score_players(rb_frame, fit_matrix_rb)
+    raw_fits[:, fit_matrix_rb.schemes.index('run_power')] += compute_run_power_bonus_rb_vectorized(rb_frame)
+    return raw_fits
+
+def compute_final_fit_matrix_rb(rb_frame, scheme_weights):
     """
-    Loads the full RB dataset (from 'rb_data.csv'), preprocesses it similarly,
+    Vectorized compute_final_fit_rb for every RB against every team at once.
+
+    Parameters:
+      rb_frame (pd.DataFrame): Imputed and scaled RB rows.
+      scheme_weights (np.ndarray): (teams x schemes) weights from top3_scheme_weights.
+
+    Returns:
+      np.ndarray: A (players x teams) array of final fits (before team need and age).
+    """
+    base_fit = combine_scheme_fits(compute_raw_fits_rb_vectorized(rb_frame), scheme_weights)
+
+    adjustment = compute_bonuses_rb_vectorized(rb_frame)
+    adjustment -= np.where(rb_frame['games'].to_numpy(dtype=float) < 9, 0.1, 0.0)
+    adjustment -= (2024 - rb_frame['season'].to_numpy(dtype=float)) * 0.05
+    return base_fit + adjustment[:, None]
+
+# === 7. Functionalized Full RB Ranking ===
+def compute_full_rb_rankings(data_file=full_rb_data_file):
+    """
+    Loads the full RB dataset (data_file, 'rb_data.csv' by default), preprocesses it similarly,
     computes an inverted NGS Avg Time to LOS, and returns a DataFrame with ranking columns
     for all the desired RB stats.
     """
-    full_rb_df = pd.read_csv('processed_data/rb_data.csv')
+    full_rb_df = read_table(data_file)
     
     # Calculate yards per carry as before.
     full_rb_df['yards_per_carry'] = full_rb_df.apply(
@@ -361,6 +409,90 @@ def compute_full_rb_rankings():
     ranking_rb_df = grouped_full_rb[ranking_cols]
     return ranking_rb_df
 
+# === 8. Build (Team, RB) Fit Dataset ===
+@lru_cache(maxsize=None)
+def build_fit_rb_df():
+    """
+    Builds the full (team, RB) fit dataset row by row with the scalar fit functions,
+    keeping each scheme's raw fit as a column. The API uses the vectorized fit table
+    instead; this is the reference version, built only when asked for.
+    """
+    team_df, rb_imputed_scaled = load_rb_data()
+    records_rb = []
+    for _, team_row in team_df.iterrows():
+        team_name = team_row['team_name']
+        scheme_weights = get_top3_scheme_weights_rb(team_row)
+        for _, rb_row in rb_imputed_scaled.iterrows():
+            rb_name = rb_row['player_name']
+            rb_id = rb_row['player_id']
+            aav = rb_row.get('market_value', rb_row.get('AAV'))
+            prev_team = rb_row['Prev Team']
+            age = rb_row['Age']
+            games = rb_row['games']
+            headshot = rb_row['headshot_url']
+            final_fit = compute_final_fit_rb(rb_row, scheme_weights, raw_fit_functions_rb)
+            records_rb.append({
+                'team_name': team_name,
+                'rb_name': rb_name,
+                'rb_id': rb_id,
+                'aav': aav,
+                'prev_team': prev_team,
+                'age': age,
+                'games': games,
+                'headshot': headshot,
+                'final_fit': final_fit,
+                'production_score': compute_production_score_rb(rb_row),
+                'air_raid_fit': raw_fit_functions_rb.get('air_raid', lambda x: np.nan)(rb_row),
+                'spread_option_fit': raw_fit_functions_rb.get('spread_option', lambda x: np.nan)(rb_row),
+                'west_coast_fit': raw_fit_functions_rb.get('west_coast', lambda x: np.nan)(rb_row),
+                'mcvay_fit': raw_fit_functions_rb.get('mcvay', lambda x: np.nan)(rb_row),
+                'shanahan_fit': raw_fit_functions_rb.get('shanahan', lambda x: np.nan)(rb_row),
+                'run_power_fit': raw_fit_functions_rb.get('run_power', lambda x: np.nan)(rb_row),
+                'pistol_power_spread_fit': raw_fit_functions_rb.get('pistol_power_spread', lambda x: np.nan)(rb_row)
+            })
+
+    fit_rb_df = pd.DataFrame(records_rb)
+    return fit_rb_df.dropna(subset=['final_fit'])
+
+# === 9. Train a Model Pipeline (Optional) ===
+features_rb = ['production_score', 'air_raid_fit', 'spread_option_fit', 'west_coast_fit', 
+               'mcvay_fit', 'shanahan_fit', 'run_power_fit', 'pistol_power_spread_fit']
+
+def train_rb_model(fit_rb_df):
+    """
+    Fits a linear regression of final_fit on the scheme fits (illustrative; the API does not use it).
+
+    Returns:
+      tuple: (pipeline_rb, mse_rb) — the fitted pipeline and its test-set MSE.
+    """
+    X_rb = fit_rb_df[features_rb]
+    y_rb = fit_rb_df['final_fit']
+    X_train_rb, X_test_rb, y_train_rb, y_test_rb = train_test_split(X_rb, y_rb, test_size=0.2, random_state=42)
+    pipeline_rb = Pipeline([
+        ('imputer', SimpleImputer(strategy='median')),
+        ('regressor', LinearRegression())
+    ])
+    pipeline_rb.fit(X_train_rb, y_train_rb)
+    y_pred_rb = pipeline_rb.predict(X_test_rb)
+    mse_rb = mean_squared_error(y_test_rb, y_pred_rb)
+    return pipeline_rb, mse_rb
+
+# === 10. Lazy Module Attributes ===
+def __getattr__(name):
+    """
+    Keeps the old module-level frames (team_df, rb_imputed_scaled, fit_rb_df)
+    importable; they are now built on first access.
+    """
+    if name == 'team_df':
+        return load_rb_data()[0]
+    if name == 'rb_imputed_scaled':
+        return load_rb_data()[1]
+    if name == 'fit_rb_df':
+        return build_fit_rb_df()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # End of rb_fit.py
-print("RB model updated with unified final fit and bonuses.")
+if __name__ == "__main__":
+    pipeline_rb, mse_rb = train_rb_model(build_fit_rb_df())
+    print("Mean Squared Error for RB model:", mse_rb)
+    print("RB model updated with unified final fit and bonuses.")
@@ -1,6 +1,10 @@
 import pandas as pd
 import numpy as np
-from scripts.rb_fit import team_df, rb_imputed_scaled, get_top3_scheme_weights_rb, raw_fit_functions_rb, compute_full_rb_rankings, compute_final_fit_rb
+from scripts.fit_engine import top3_scheme_weights, column_or_fallback
+from scripts.fit_tensor import make_fit_table, get_fit_table, get_player_fit, sorted_team_fits
+from scripts.fit_store import shared_fit_table
+from scripts.ranking_cache import get_rankings, get_player_rankings, build_ranking_entry
+from scripts.rb_fit import load_rb_data, scheme_score_columns_rb, full_rb_data_file, compute_full_rb_rankings, compute_final_fit_matrix_rb
 
 def compute_team_need_bonus_rb(team_row):
     """
@@ -40,47 +44,85 @@ def compute_team_need_bonus_rb(team_row):
         bonus = -0.2
     return bonus
 
+def build_rb_fit_table():
+    """
+    Scores every free agent RB against every team at once, returning a FitTable
+    of (RB, team) final fits including team need and age adjustments.
+    """
+    team_df, rb_imputed_scaled = load_rb_data()
+    teams = team_df[team_df['team_name'].notna()].reset_index(drop=True)
+    scheme_weights = top3_scheme_weights(teams, scheme_score_columns_rb)
+    fits = compute_final_fit_matrix_rb(rb_imputed_scaled, scheme_weights)
+    fits += teams.apply(compute_team_need_bonus_rb, axis=1).to_numpy(dtype=float)
+    age = rb_imputed_scaled['Age']
+    fits -= np.where(age > 30, (age - 30) * 0.02, 0.0)[:, None]
+    players = pd.DataFrame({
+        'rb_name': rb_imputed_scaled['player_name'],
+        'rb_id': rb_imputed_scaled['player_id'],
+        'aav': column_or_fallback(rb_imputed_scaled, 'market_value', 'AAV'),
+        'prev_team': rb_imputed_scaled['Prev Team'],
+        'age': age,
+        'games': rb_imputed_scaled['games'],
+        'headshot': rb_imputed_scaled['headshot_url']
+    })
+    return make_fit_table(teams['team_name'], players, fits, 'rb_id')
+
+def load_rb_fit_table():
+    """
+    Returns the RB FitTable from the shared fit store (memory-mapped, shared by every
+    worker process), building it first if the store is out of date.
+    """
+    return shared_fit_table('RB', build_rb_fit_table, 'rb_id')
+
 def get_rb_fits_for_team(team_name):
     """
     Computes the RB fits for a given team, using the unified final fit function
     and merging full RB ranking data.
     """
-    team_row = team_df[team_df['team_name'].str.contains(team_name, case=False, na=False)]
-    if team_row.empty:
+    results_df = get_rb_fits_for_teams([team_name])[team_name]
+    if results_df is None:
         print(f"Error: Team '{team_name}' not found in the dataset.")
-        return None
-    team_row = team_row.iloc[0]
-    scheme_weights = get_top3_scheme_weights_rb(team_row)
-    records = []
-    for _, rb_row in rb_imputed_scaled.iterrows():
-        rb_name = rb_row['player_name']
-        rb_id = rb_row['player_id']
-        aav = rb_row.get('market_value', rb_row.get('AAV'))
-        prev_team = rb_row['Prev Team']
-        age = rb_row['Age']
-        games = rb_row['games']
-        headshot = rb_row['headshot_url']
-        final_fit = compute_final_fit_rb(rb_row, scheme_weights, raw_fit_functions_rb)
-        final_fit += compute_team_need_bonus_rb(team_row)
-        if age > 30:
-            final_fit -= (age - 30) * 0.02
-        records.append({
-            'rb_name': rb_name,
-            'rb_id': rb_id,
-            'aav': aav,
-            'prev_team': prev_team,
-            'age': age,
-            'games': games,
-            'headshot': headshot,
-            'final_fit': final_fit
-        })
-    results_df = pd.DataFrame(records).sort_values(by='final_fit', ascending=False)
-    
-    # Merge full RB rankings.
-    ranking_rb_df = compute_full_rb_rankings()
-    results_df = results_df.merge(ranking_rb_df, left_on='rb_name', right_on='player_name', how='left').drop(columns=['player_name'])
     return results_df
 
+def get_rb_fits_for_teams(team_names, limit=None, offset=0, min_fit=None, fields=None):
+    """
+    Returns the sorted RB fits (with ranking columns) for several teams in one pass over
+    the RB fit table: {team_name: DataFrame, or None if the team is unknown}.
+    limit, offset, min_fit and fields select a page of each team's results (see sorted_team_fits).
+    """
+    table = get_fit_table('RB', load_rb_fit_table)
+    # Merge full RB rankings once for every team.
+    ranking_rb_df = get_rankings('RB', full_rb_data_file, compute_full_rb_rankings)
+    ranked_players = table.players.merge(ranking_rb_df, left_on='rb_name', right_on='player_name', how='left').drop(columns=['player_name'])
+    return sorted_team_fits(table, ranked_players, team_names, limit, offset, min_fit, fields)
+
+def get_rb_fit_for_player(team_name, player_id):
+    """
+    Returns one RB's final fit for a team merged with its ranking columns, as a dict,
+    or None if the team or player is unknown. Hash lookups only; no scoring pass.
+    """
+    table = get_fit_table('RB', load_rb_fit_table)
+    final_fit = get_player_fit(table, team_name, player_id)
+    if final_fit is None:
+        return None
+    rb_name = table.players['rb_name'].iat[table.player_index[player_id.strip()]]
+    record = dict(get_player_rankings('RB', full_rb_data_file, compute_full_rb_rankings, rb_name))
+    record['final_fit'] = final_fit
+    return record
+
+def rebuild_rb_fits():
+    """
+    Re-reads the RB data and builds a new fit table and ranking entry, without touching
+    the ones being served (the caller swaps them in). If another worker already stored
+    the fit table for the same data, that one is attached instead of building it again.
+
+    Returns:
+    - (FitTable, ranking cache entry)
+    """
+    load_rb_data.cache_clear()
+    return load_rb_fit_table(), build_ranking_entry(full_rb_data_file, compute_full_rb_rankings)
+
+
 if __name__ == "__main__":
     while True:
         team_name_input = input("Enter an NFL team name (or 'exit'/'e' to quit): ")
@@ -1,16 +1,30 @@
 import pandas as pd
 import numpy as np
+from data_io import read_table, write_table
 
 def apply_offensive_scheme():
     """
     Apply offensive scheme analysis by processing seasonal and weekly stats,
     computing scheme scores, and saving the results.
     """
-    # --- Step 1: Load Data ---
-    seasonal_df = pd.read_csv("backend/processed_data/team_seasonal_stats.csv")
-    seasonal_df = seasonal_df[seasonal_df['posteam'] != "LGAVG"]
+    team_stats_df = read_table("backend/processed_data/team_seasonal_stats.csv")
+    weekly_df = read_table("backend/processed_data/team_weekly_stats.csv")
+    team_stats_df = add_offensive_scheme(team_stats_df, weekly_df)
+    write_table(team_stats_df, 'backend/processed_data/team_seasonal_stats.csv')
 
-    weekly_df = pd.read_csv("backend/processed_data/team_weekly_stats.csv")
+def add_offensive_scheme(team_stats_df, weekly_df):
+    """
+    Compute each team's scheme scores from its seasonal and weekly stats and classify it.
+
+    Parameters:
+      team_stats_df (pd.DataFrame): Seasonal team stats (including the LGAVG row).
+      weekly_df (pd.DataFrame): Weekly team stats.
+
+    Returns:
+      pd.DataFrame: team_stats_df with the score_<scheme> columns and the assigned scheme.
+    """
+    # --- Step 1: Select Data ---
+    seasonal_df = team_stats_df[team_stats_df['posteam'] != "LGAVG"]
 
     # --- Step 2: Aggregate Weekly Data ---
     weekly_agg = weekly_df.groupby("posteam").mean().reset_index()
@@ -128,8 +142,8 @@ def apply_offensive_scheme():
 
     data['predicted_scheme'] = data['scheme_scores'].apply(lambda scores: max(scores, key=scores.get))
 
-    # Load team seasonal stats again to add scheme information
-    team_stats_df = pd.read_csv('backend/processed_data/team_seasonal_stats.csv')
+    # Add the scheme information to the seasonal stats
+    team_stats_df = team_stats_df.copy()
     team_scheme_dict = data[['posteam', 'predicted_scheme']].set_index('posteam')['predicted_scheme'].to_dict()
 
     team_stats_df['scheme'] = team_stats_df['posteam'].map(team_scheme_dict)
@@ -147,7 +161,6 @@ def apply_offensive_scheme():
     for k, v in team_scheme_mapping.items():
         team_stats_df.loc[team_stats_df['posteam'] == k, 'scheme'] = v
 
-    team_stats_df.to_csv('backend/processed_data/team_seasonal_stats.csv', index=False)
     data['predicted_scheme'] = data.apply(lambda row: team_scheme_mapping.get(row['posteam'], row['predicted_scheme']), axis=1)
 
     # --- Step 6: Save and Display the Results ---
@@ -155,5 +168,7 @@ def apply_offensive_scheme():
         f.write(data[['posteam', 'scheme_scores', 'predicted_scheme']].to_string())
     print(data[['posteam', 'scheme_scores', 'predicted_scheme']])
 
+    return team_stats_df
+
 if __name__ == "__main__":
     apply_offensive_scheme()
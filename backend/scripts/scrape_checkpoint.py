@@ -0,0 +1,146 @@
+import json
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+# === Scrape Checkpoints ===
+# Long scrapes (a market value page per free agent, hundreds for the full class) record each
+# result as soon as it is parsed, so an interrupted run (Ctrl-C, timeouts, rate limiting)
+# loses nothing: the next run only fetches what is missing. Results are appended to a JSON
+# lines file ({"key": ..., "value": ..., "scraped_at": ...} per line, the last line for a
+# key wins) and are reused for SCRAPE_CHECKPOINT_MAX_AGE seconds.
+#   - SCRAPE_CHECKPOINT: the file (default backend/raw_data/market_values.jsonl; empty turns it off)
+#   - SCRAPE_CHECKPOINT_MAX_AGE: how long a recorded result is reused (default 24 hours)
+# Pages that failed to download are not recorded, so they are retried on the next run.
+# Several processes can share the file (e.g. the free_agents and oline pipeline stages): reads,
+# appends and the compaction in load() hold a lock on <file>.lock, so no result is lost.
+scrape_checkpoint_path = os.environ.get('SCRAPE_CHECKPOINT', 'backend/raw_data/market_values.jsonl')
+scrape_checkpoint_max_age = float(os.environ.get('SCRAPE_CHECKPOINT_MAX_AGE', 24 * 60 * 60))
+
+class ScrapeCheckpoint:
+    """
+    Results of a scrape recorded by key (e.g. the market value link), see above.
+    """
+    def __init__(self, path, max_age):
+        self.path = path
+        self.max_age = max_age
+
+    @contextmanager
+    def _locked(self):
+        # Held while reading, appending or replacing the file, so an append from another
+        # process can't go to the old file while load() swaps in the compacted one.
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if fcntl is None:
+            yield
+            return
+        with open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def load(self):
+        """
+        Returns {key: value} for the results recorded within max_age. Older and
+        superseded lines are dropped from the file.
+        """
+        with self._locked():
+            entries = {}
+            lines = 0
+            try:
+                with open(self.path) as f:
+                    for line in f:
+                        lines += 1
+                        try:
+                            entry = json.loads(line)
+                            entries[entry['key']] = entry
+                        except (ValueError, KeyError, TypeError):
+                            continue  # e.g. a line cut short when the last run was killed
+            except OSError:
+                return {}
+
+            now = time.time()
+            fresh = [entry for entry in entries.values() if now - entry['scraped_at'] < self.max_age]
+            if len(fresh) < lines:
+                self._rewrite(fresh)
+            return {entry['key']: entry['value'] for entry in fresh}
+
+    def record(self, key, value):
+        """
+        Appends one result, flushed right away so it survives the process being killed.
+        """
+        with self._locked():
+            with open(self.path, 'a') as f:
+                f.write(json.dumps({'key': key, 'value': value, 'scraped_at': time.time()}) + '\n')
+
+    def clear(self):
+        with self._locked():
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _rewrite(self, entries):
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + '\n')
+        os.replace(tmp_path, self.path)
+
+default_checkpoint = ScrapeCheckpoint(scrape_checkpoint_path, scrape_checkpoint_max_age) if scrape_checkpoint_path else None
+
+# === Progress Reporting ===
+class ScrapeProgress:
+    """
+    Prints how far a scrape is (done/total, failures, pages per second and time left)
+    at most every `every` seconds, and a summary at the end.
+
+    Parameters:
+      label (str): What is being scraped, e.g. "Market values".
+      total (int): Items in the scrape, including the resumed ones.
+      resumed (int): Items already done by an earlier run (from the checkpoint).
+      every (float): Seconds between progress lines (None for just the summary).
+    """
+    def __init__(self, label, total, resumed=0, every=5.0):
+        self.label = label
+        self.total = total
+        self.resumed = resumed
+        self.every = every
+        self.fetched = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.last_report = self.started
+
+    def update(self, failed=False):
+        if failed:
+            self.failed += 1
+        else:
+            self.fetched += 1
+        now = time.monotonic()
+        if self.every is not None and now - self.last_report >= self.every:
+            self.last_report = now
+            print(self._line(now))
+
+    def _rate(self, now):
+        elapsed = now - self.started
+        return (self.fetched + self.failed) / elapsed if elapsed > 0 else 0.0
+
+    def _line(self, now):
+        done = self.resumed + self.fetched + self.failed
+        rate = self._rate(now)
+        left = f", ~{(self.total - done) / rate:.0f}s left" if rate else ''
+        return (f"{self.label}: {done}/{self.total} ({self.resumed} resumed, {self.failed} failed), "
+                f"{rate:.1f} pages/s{left}")
+
+    def finish(self):
+        now = time.monotonic()
+        print(f"{self.label}: finished in {now - self.started:.1f}s - {self.resumed} resumed from "
+              f"checkpoint, {self.fetched} fetched, {self.failed} failed ({self._rate(now):.1f} pages/s)")
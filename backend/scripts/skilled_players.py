@@ -1,8 +1,12 @@
 import nfl_data_py as nfl
 import pandas as pd
-from playerscrape import get_available_free_agents, scrape_market_values_concurrently, off_url
+from playerscrape import get_available_free_agents, scrape_market_values_concurrently, off_url, free_agents_file
 import numpy as np
+import json
+import os
 import re
+import sys
+from data_io import read_table, write_table, parquet_path
 
 # --- Define column lists ---
 COMMON_ROSTER_COLUMNS = [
@@ -47,6 +51,36 @@ WR_SEASONAL_COLUMNS = [
     'fantasy_points', 'fantasy_points_ppr', 'games'
 ]
 
+# --- Seasons and file locations ---
+SEASONS = [2022, 2023, 2024]
+CURRENT_SEASON = 2024
+
+POSITION_DATA_FILES = {
+    'QB': 'backend/processed_data/qb_data.csv',
+    'RB': 'backend/processed_data/rb_data.csv',
+    'WR': 'backend/processed_data/wr_data.csv',
+    'TE': 'backend/processed_data/te_data.csv',
+}
+
+FREE_AGENT_DATA_FILES = {
+    'QB': 'backend/processed_data/fa_qbs.csv',
+    'RB': 'backend/processed_data/fa_rbs.csv',
+    'WR': 'backend/processed_data/fa_wrs.csv',
+    'TE': 'backend/processed_data/fa_tes.csv',
+}
+
+NGS_FILES = {
+    'QB': 'backend/processed_data/qb_ngs.csv',
+    'RB': 'backend/processed_data/rb_ngs.csv',
+    'WR': 'backend/processed_data/wr_ngs.csv',
+    'TE': 'backend/processed_data/wr_ngs.csv',
+}
+
+# Local cache of the raw nflverse pulls (one file per season) and the state of the last run,
+# used by the incremental refresh (python backend/scripts/skilled_players.py --incremental).
+RAW_CACHE_DIR = 'backend/raw_data'
+REFRESH_STATE_FILE = os.path.join(RAW_CACHE_DIR, 'skilled_players_state.json')
+
 # --- Data Import Functions ---
 def get_seasonal_data(years):
     """Import seasonal stats for the given years (e.g., 2022, 2023, 2024)."""
@@ -62,53 +96,155 @@ def merge_seasonal_and_roster(seasonal_df, roster_df):
     """Merge seasonal stats with 2024 roster info using player_id."""
     return pd.merge(seasonal_df, roster_df, on='player_id', how='left')
 
+# --- Raw Data Cache ---
+def seasonal_cache_path(season):
+    return os.path.join(RAW_CACHE_DIR, f'seasonal_{season}.csv')
+
+def cache_seasonal_data(seasonal_df):
+    """Save each season of a seasonal pull to the raw cache."""
+    os.makedirs(RAW_CACHE_DIR, exist_ok=True)
+    for season, season_df in seasonal_df.groupby('season'):
+        write_table(season_df, seasonal_cache_path(season))
+
+def get_cached_seasonal_data(season):
+    """Return one season of seasonal stats from the raw cache, downloading it if it isn't cached yet."""
+    path = seasonal_cache_path(season)
+    if os.path.exists(path) or os.path.exists(parquet_path(path)):
+        return read_table(path)
+    season_df = get_seasonal_data([season])
+    cache_seasonal_data(season_df)
+    return season_df
+
+def load_merged_data(incremental=False):
+    """
+    Load the seasonal stats for SEASONS merged with the current rosters.
+    A full load downloads every season (and refreshes the raw cache); an incremental load
+    only downloads the current season and reads the earlier ones from the cache.
+    """
+    if incremental:
+        print(f"Loading cached seasonal data for earlier seasons, downloading {CURRENT_SEASON} data and rosters...")
+        past = [get_cached_seasonal_data(season) for season in SEASONS if season != CURRENT_SEASON]
+        current = get_seasonal_data([CURRENT_SEASON])
+        cache_seasonal_data(current)
+        seasonal_df = pd.concat(past + [current], ignore_index=True)
+    else:
+        print("Loading seasonal data for 2022-2024 and 2024 rosters...")
+        seasonal_df = get_seasonal_data(SEASONS)
+        cache_seasonal_data(seasonal_df)
+    roster_df = get_roster_data([CURRENT_SEASON])
+    return merge_seasonal_and_roster(seasonal_df, roster_df)
+
+# --- Change Detection ---
+def file_signature(path):
+    """(mtime, size) of a file, or None if it doesn't exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+def normalized_source_frame(pos_df):
+    """
+    pos_df with fixed column order and dtypes, so the same rows hash the same whether they
+    were just downloaded or read back from the raw cache (a CSV cache loses the dtypes and
+    can change the last digit of a float): numbers (including numeric text and empty
+    columns) become floats rounded to 9 decimals, everything else strings ('' if missing).
+    """
+    normalized = pd.DataFrame(index=pos_df.index)
+    for col in sorted(pos_df.columns):
+        values = pos_df[col]
+        if not pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_datetime64_any_dtype(values):
+            numeric = pd.to_numeric(values, errors='coerce')
+            if numeric.notna().equals(values.notna()):
+                values = numeric
+        if pd.api.types.is_numeric_dtype(values):
+            normalized[col] = values.astype(float).round(9)
+        else:
+            normalized[col] = values.astype(str).where(values.notna(), '')
+    return normalized
+
+def source_hashes(pos_df):
+    """
+    Hash each player's source rows (every season, stats and roster columns).
+    Returns a dict of player_id -> hash string; it changes when any of the player's rows do.
+    The rows are normalized first (normalized_source_frame), so a full run and an
+    incremental run over the same data give the same hashes.
+    """
+    if pos_df.empty:
+        return {}
+    row_hashes = pd.util.hash_pandas_object(normalized_source_frame(pos_df), index=False)
+    combined = row_hashes.groupby(pos_df['player_id'].to_numpy()).sum()
+    return {str(player_id): str(value) for player_id, value in combined.items()}
+
+def load_refresh_state():
+    try:
+        with open(REFRESH_STATE_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_refresh_state(state):
+    os.makedirs(RAW_CACHE_DIR, exist_ok=True)
+    with open(REFRESH_STATE_FILE, 'w') as f:
+        json.dump(state, f)
+
 # --- Active Selection Logic ---
-def select_pos_active_season(group, position):
+# Position -> (metric, threshold): a season counts as active if metric >= threshold
+ACTIVE_SEASON_RULES = {
+    'QB': ('attempts', 100),
+    'RB': ('carries', 75),
+    'WR': ('targets', 40),
+    'TE': ('targets', 30),
+}
+
+def select_active_seasons(pos_df, position, seasons=None):
     """
-    For a given player's seasonal data (grouped by player_id) and position, select the row corresponding
+    For every player in pos_df (one row per player season), select the row corresponding
     to the most recent active season based on the following criteria:
       - QB: active if 'attempts' >= 100
       - RB: active if 'carries' >= 75
       - WR: active if 'targets' >= 40
-    If no season meets the criteria (from 2024 down to 2022), return the row with the highest value
-    of the corresponding metric.
+      - TE: active if 'targets' >= 30
+    Seasons are checked from the latest of `seasons` (default SEASONS) down to the earliest.
+    If no season meets the criteria, the row with the highest value of the corresponding
+    metric is used instead.
+    
+    Works on the whole frame at once (sort + mask + drop_duplicates) rather than per player,
+    so it stays fast over many seasons of history.
+    
+    Returns:
+      pd.DataFrame: One row per player_id, sorted by player_id.
     """
-    if position == 'QB':
-        metric = 'attempts'
-        threshold = 100
-    elif position == 'RB':
-        metric = 'carries'
-        threshold = 75
-    elif position == 'WR':
-        metric = 'targets'
-        threshold = 40
-    elif position == 'TE':
-        metric = 'targets'
-        threshold = 30
-    else:
-        # Default to QB criteria if position is unknown
-        metric = 'attempts'
-        threshold = 100
-
-    # Check seasons in order: 2024, then 2023, then 2022
-    # Check seasons in order: 2024, then 2023, then 2022
-    for season in [2024, 2023, 2022]:
-        candidate = group[(group['season'] == season) & (group[metric] >= threshold)]
-        if not candidate.empty:
-            selected_row = candidate.iloc[0]
-            break
-    else:
-        # If no season meets the threshold, pick the season with the highest value in the metric
-        selected_row = group.loc[group[metric].idxmax()]
+    # Unknown positions use the QB criteria
+    metric, threshold = ACTIVE_SEASON_RULES.get(position, ('attempts', 100))
+    if seasons is None:
+        seasons = SEASONS
+
+    df = pos_df[pos_df['player_id'].notna()].reset_index(drop=True)
+    values = df[metric].to_numpy(dtype=float)
+    row_order = np.arange(len(df))
+
+    # Active rows, latest preferred season first (ties keep the original row order)
+    season_rank = df['season'].map({season: rank for rank, season in enumerate(sorted(seasons, reverse=True))})
+    active = (season_rank.notna() & (values >= threshold)).to_numpy()
+    ranked = np.lexsort((row_order[active], season_rank.to_numpy()[active]))
+    active_rows = df[active].iloc[ranked].drop_duplicates('player_id')
+
+    # Everyone else: their highest value of the metric (first one on ties, like idxmax)
+    rest = df[~df['player_id'].isin(active_rows['player_id'])]
+    rest_values = rest[metric].to_numpy(dtype=float)
+    by_value = np.lexsort((np.arange(len(rest)), np.where(np.isnan(rest_values), np.inf, -rest_values)))
+    best_rows = rest.iloc[by_value].drop_duplicates('player_id')
+
+    selected = pd.concat([active_rows, best_rows]).sort_values('player_id', kind='stable').reset_index(drop=True)
     
-    # Normalize per-game stats before returning the row
-    if position in ['RB', 'WR', 'TE'] and 'target_share' in selected_row:
-        if selected_row['games'] > 0:
-            selected_row['target_share'] /= selected_row['games']
-        else:
-            selected_row['target_share'] = np.nan  # Avoid division by zero
+    # Normalize per-game stats
+    if position in ['RB', 'WR', 'TE'] and 'target_share' in selected.columns:
+        games = selected['games']
+        # Avoid division by zero
+        selected['target_share'] = (selected['target_share'] / games).where(games > 0, np.nan)
     
-    return selected_row
+    return selected
 
 # --- Roster Column Adjustments ---
 def adjust_roster_columns(df):
@@ -129,156 +265,229 @@ def adjust_roster_columns(df):
         cols.append('headshot_url')
     return df[cols]
 
-# --- Next Gen Stats Function ---
+# --- Next Gen Stats ---
+# Key metrics per position
+NGS_KEY_METRICS = {
+    'QB': [
+        'avg_time_to_throw',
+        'avg_completed_air_yards',
+        'avg_intended_air_yards',
+        'avg_air_yards_differential',
+        'aggressiveness',
+        'avg_air_yards_to_sticks',
+        'passer_rating',
+        'completion_percentage',
+        'expected_completion_percentage',
+        'completion_percentage_above_expectation'
+    ],
+    'RB': [
+        'efficiency',
+        'percent_attempts_gte_eight_defenders',
+        'avg_time_to_los',
+        'avg_rush_yards',
+        'expected_rush_yards',
+        'rush_yards_over_expected',
+        'rush_yards_over_expected_per_att',
+        'rush_pct_over_expected'
+    ],
+    'WR': [
+        'avg_cushion',
+        'avg_separation',
+        'avg_intended_air_yards',
+        'percent_share_of_intended_air_yards',
+        'catch_percentage',
+        'avg_yac',
+        'avg_expected_yac',
+        'avg_yac_above_expectation'
+    ],
+}
+NGS_KEY_METRICS['TE'] = NGS_KEY_METRICS['WR']
+
+def next_gen_stats_by_player(ngs_df, position, seasons=[2024, 2023, 2022]):
+    """
+    Reduce a Next Gen Stats table to one row of key metrics per player (indexed by player_gsis_id).
+    
+    For players with an active season (week == 0) the row comes from the first of the given
+    seasons that has one. Players without an active season get the average of all their rows.
+    
+    Returns:
+      (pd.DataFrame, set): The per-player metrics and the ids that came from an active season.
+    """
+    key_metrics = NGS_KEY_METRICS[position]
+    present = [metric for metric in key_metrics if metric in ngs_df.columns]
+
+    # Active season rows, ordered by season preference (file order within a season); keep each player's first
+    active = ngs_df[(ngs_df['week'] == 0) & ngs_df['season'].isin(seasons)]
+    season_rank = active['season'].map({season: rank for rank, season in enumerate(seasons)})
+    active = active.iloc[np.argsort(season_rank.to_numpy(), kind='stable')]
+    active = active.drop_duplicates('player_gsis_id').set_index('player_gsis_id')[present]
+
+    averaged = ngs_df.groupby('player_gsis_id')[present].mean()
+    averaged = averaged[~averaged.index.isin(active.index)]
+    stats = pd.concat([active, averaged]).reindex(columns=key_metrics)
+    return stats, set(active.index)
+
 def get_next_gen_stats(player_id, position, seasons=[2024, 2023, 2022]):
     """
     For a given player_id and position, look up Next Gen Stats from the appropriate CSV file.
-    The function returns only the key metrics for the position.
+    The function returns only the key metrics for the position (see NGS_KEY_METRICS).
     
     For active seasons (week == 0) the function returns that row's key metrics.
     If no active season is found (for the given seasons), it returns the average of the available rows.
-    
-    Key metrics per position:
-      - QB:
-          'avg_time_to_throw', 'avg_completed_air_yards', 'avg_intended_air_yards',
-          'avg_air_yards_differential', 'aggressiveness', 'avg_air_yards_to_sticks',
-          'passer_rating', 'completion_percentage', 'expected_completion_percentage',
-          'completion_percentage_above_expectation'
-      - RB:
-          'efficiency', 'percent_attempts_gte_eight_defenders', 'avg_time_to_los',
-          'avg_rush_yards', 'expected_rush_yards', 'rush_yards_over_expected',
-          'rush_yards_over_expected_per_att', 'rush_pct_over_expected'
-      - WR:
-          'avg_cushion', 'avg_separation', 'avg_intended_air_yards',
-          'percent_share_of_intended_air_yards', 'catch_percentage', 'avg_yac',
-          'avg_expected_yac', 'avg_yac_above_expectation'
+    For a whole position at once use add_next_gen_stats, which reads the file once.
     """
+    if position not in NGS_KEY_METRICS:
+        return None
     try:
-        if position == 'QB':
-            file_path = 'backend/processed_data/qb_ngs.csv'
-            key_metrics = [
-                'avg_time_to_throw',
-                'avg_completed_air_yards',
-                'avg_intended_air_yards',
-                'avg_air_yards_differential',
-                'aggressiveness',
-                'avg_air_yards_to_sticks',
-                'passer_rating',
-                'completion_percentage',
-                'expected_completion_percentage',
-                'completion_percentage_above_expectation'
-            ]
-        elif position == 'RB':
-            file_path = 'backend/processed_data/rb_ngs.csv'
-            key_metrics = [
-                'efficiency',
-                'percent_attempts_gte_eight_defenders',
-                'avg_time_to_los',
-                'avg_rush_yards',
-                'expected_rush_yards',
-                'rush_yards_over_expected',
-                'rush_yards_over_expected_per_att',
-                'rush_pct_over_expected'
-            ]
-        elif position == 'WR' or position == 'TE':
-            file_path = 'backend/processed_data/wr_ngs.csv'
-            key_metrics = [
-                'avg_cushion',
-                'avg_separation',
-                'avg_intended_air_yards',
-                'percent_share_of_intended_air_yards',
-                'catch_percentage',
-                'avg_yac',
-                'avg_expected_yac',
-                'avg_yac_above_expectation'
-            ]
-        else:
-            return None
-
-        ngs_df = pd.read_csv(file_path)
-        player_ngs = ngs_df[ngs_df['player_gsis_id'] == player_id]
-        if player_ngs.empty:
-            return None
-
-        # Look for an active season row (week == 0) in order of seasons
-        for season in seasons:
-            row = player_ngs[(player_ngs['season'] == season) & (player_ngs['week'] == 0)]
-            if not row.empty:
-                active_stats = row.iloc[0].to_dict()
-                return {metric: active_stats.get(metric) for metric in key_metrics}
-
-        # If no active season, average the key metrics over all available rows
-        agg_stats = {metric: player_ngs[metric].mean() for metric in key_metrics if metric in player_ngs.columns}
-        return agg_stats
-
+        ngs_df = read_table(NGS_FILES[position])
     except FileNotFoundError:
         print(f"Warning: Next Gen Stats file not found for player {player_id}")
         return None
-    except Exception as e:
-        print(f"Error processing Next Gen Stats for player {player_id}: {e}")
+    stats, active_ids = next_gen_stats_by_player(ngs_df[ngs_df['player_gsis_id'] == player_id], position, seasons)
+    if stats.empty:
         return None
+    row = stats.iloc[0]
+    if player_id not in active_ids:
+        # The average only covers the metrics the file has
+        row = row[[metric for metric in row.index if metric in ngs_df.columns]]
+    return row.to_dict()
+
+def add_next_gen_stats(pos_final, position):
+    """
+    Add the ngs_<metric> columns for every player in pos_final with one merge:
+    the NGS file is read once and reduced to a row per player (see next_gen_stats_by_player).
+    Players without Next Gen Stats get NaN; if no player has any, no columns are added.
+    """
+    try:
+        ngs_df = read_table(NGS_FILES[position])
+    except FileNotFoundError:
+        print(f"Warning: Next Gen Stats file not found for {position}")
+        return pos_final
+    stats, active_ids = next_gen_stats_by_player(ngs_df, position)
+
+    matched = pos_final['player_id'].isin(stats.index)
+    if not matched.any():
+        return pos_final
+    # Metrics missing from the file only appear when a player has an active season row
+    if not pos_final.loc[matched, 'player_id'].isin(active_ids).any():
+        stats = stats[[metric for metric in stats.columns if metric in ngs_df.columns]]
+    stats = stats.add_prefix('ngs_')
+    merged = pos_final[['player_id']].merge(stats, left_on='player_id', right_index=True, how='left')
+    pos_final = pos_final.copy()
+    for column in stats.columns:
+        pos_final[column] = merged[column].to_numpy()
+    return pos_final
+
+# --- Position Tables ---
+def build_position_data(pos_df, pos):
+    """
+    Build the output table for one position from its merged seasonal/roster rows:
+    one row per player (their most recent active season) with Next Gen Stats added.
+    """
+    # Select each player's most recent active season (see ACTIVE_SEASON_RULES)
+    selected = select_active_seasons(pos_df, pos)
+    
+    # Limit the dataframe to the appropriate seasonal columns + common roster columns for the position
+    if pos == 'QB':
+        final_columns = QB_SEASONAL_COLUMNS + COMMON_ROSTER_COLUMNS
+    elif pos == 'RB':
+        final_columns = RB_SEASONAL_COLUMNS + COMMON_ROSTER_COLUMNS
+    elif pos == 'WR' or pos == 'TE':
+        final_columns = WR_SEASONAL_COLUMNS + COMMON_ROSTER_COLUMNS
+    # Ensure only columns that exist in the dataframe are used
+    final_columns = [col for col in final_columns if col in selected.columns]
+    pos_final = selected[final_columns].copy()
+    
+    # Step 3: Add Next Gen Stats for each player using player_id
+    pos_final = add_next_gen_stats(pos_final, pos)
+    
+    # Adjust roster columns and sort by player_name
+    pos_final = adjust_roster_columns(pos_final)
+    return pos_final.sort_values('player_name', ascending=True)
+
+def refresh_position_data(pos_df, pos, previous_state):
+    """
+    Incremental version of build_position_data: players whose source rows are unchanged
+    since the last run keep their row from the existing output file, and only the rest
+    are recomputed. Falls back to a full build when there is nothing to reuse (first run,
+    output file missing, or the position's Next Gen Stats file changed).
+    """
+    hashes = source_hashes(pos_df)
+    output_file = POSITION_DATA_FILES[pos]
+    previous_hashes = previous_state.get('players', {})
+    can_reuse = (
+        previous_hashes
+        and previous_state.get('ngs_file') == file_signature(NGS_FILES[pos])
+        and os.path.exists(output_file)
+    )
+    if not can_reuse:
+        print(f"{pos}: no usable previous run, rebuilding all {len(hashes)} players")
+        return build_position_data(pos_df, pos)
+
+    previous = read_table(output_file)
+    previous_ids = set(previous['player_id'].astype(str))
+    unchanged = {
+        player_id for player_id, source_hash in hashes.items()
+        if previous_hashes.get(player_id) == source_hash and player_id in previous_ids
+    }
+    kept = previous[previous['player_id'].astype(str).isin(unchanged)]
+    changed_df = pos_df[~pos_df['player_id'].astype(str).isin(unchanged)]
+    print(f"{pos}: recomputing {len(hashes) - len(unchanged)} of {len(hashes)} players")
+    if changed_df.empty:
+        return kept.sort_values('player_name', ascending=True)
+
+    pos_final = pd.concat([kept, build_position_data(changed_df, pos)], ignore_index=True)
+    pos_final = adjust_roster_columns(pos_final)
+    return pos_final.sort_values('player_name', ascending=True)
 
 # --- Main Execution ---
-def main():
+def build_player_files(incremental=False):
+    """
+    Rebuild the position files (qb_data.csv, rb_data.csv, wr_data.csv, te_data.csv).
+
+    Parameters:
+      incremental (bool): Only download the current season (earlier seasons come from the
+        raw cache) and only recompute players whose source rows changed since the last run.
+
+    Returns:
+      dict: Position -> the position's DataFrame.
+    """
     # Step 1: Import seasonal data for 2022-2024 and roster data from 2024, then merge
-    print("Loading seasonal data for 2022-2024 and 2024 rosters...")
-    seasonal_df = get_seasonal_data([2022, 2023, 2024])
-    roster_df = get_roster_data([2024])
-    merged_df = merge_seasonal_and_roster(seasonal_df, roster_df)
+    merged_df = load_merged_data(incremental)
     
     # Process for each position: QB, RB, and WR
     positions = ['QB', 'RB', 'WR', 'TE']
     final_dfs = {}
+    previous_state = load_refresh_state() if incremental else {}
+    state = {}
     
     for pos in positions:
         # Filter merged data to only include the current position
         pos_df = merged_df[merged_df['position'] == pos].copy()
-        
-        # Group by player_id and select the most recent active season based on criteria:
-        #  - QB: 'attempts' >= 100
-        #  - RB: 'carries' >= 75
-        #  - WR: 'targets' >= 40
-        selected = pos_df.groupby('player_id').apply(lambda group: select_pos_active_season(group, pos)).reset_index(drop=True)
-        
-        # Limit the dataframe to the appropriate seasonal columns + common roster columns for the position
-        if pos == 'QB':
-            final_columns = QB_SEASONAL_COLUMNS + COMMON_ROSTER_COLUMNS
-        elif pos == 'RB':
-            final_columns = RB_SEASONAL_COLUMNS + COMMON_ROSTER_COLUMNS
-        elif pos == 'WR' or pos == 'TE':
-            final_columns = WR_SEASONAL_COLUMNS + COMMON_ROSTER_COLUMNS
-        # Ensure only columns that exist in the dataframe are used
-        final_columns = [col for col in final_columns if col in selected.columns]
-        pos_final = selected[final_columns].copy()
-        
-        # Step 3: Add Next Gen Stats for each player using player_id
-        for idx, row in pos_final.iterrows():
-            player_id = row['player_id']
-            ngs_stats = get_next_gen_stats(player_id, pos)
-            if ngs_stats:
-                for stat, value in ngs_stats.items():
-                    pos_final.loc[idx, f'ngs_{stat}'] = value
-        
-        # Adjust roster columns and sort by player_name
-        pos_final = adjust_roster_columns(pos_final)
-        pos_final = pos_final.sort_values('player_name', ascending=True)
+        if incremental:
+            pos_final = refresh_position_data(pos_df, pos, previous_state.get(pos, {}))
+        else:
+            pos_final = build_position_data(pos_df, pos)
         final_dfs[pos] = pos_final
+        state[pos] = {'ngs_file': file_signature(NGS_FILES[pos]), 'players': source_hashes(pos_df)}
         print(f"Number of {pos} rows after selection: {pos_final.shape[0]}")
     
     # Save the final dataframes for each position to CSV files in the processed_data folder
-    final_dfs['QB'].to_csv('backend/processed_data/qb_data.csv', index=False)
-    final_dfs['RB'].to_csv('backend/processed_data/rb_data.csv', index=False)
-    final_dfs['WR'].to_csv('backend/processed_data/wr_data.csv', index=False)
+    write_table(final_dfs['QB'], POSITION_DATA_FILES['QB'])
+    write_table(final_dfs['RB'], POSITION_DATA_FILES['RB'])
+    write_table(final_dfs['WR'], POSITION_DATA_FILES['WR'])
     # final_dfs['TE'] = final_dfs['TE'].sort_values('targets', ascending=False)
-    final_dfs['TE'].to_csv('backend/processed_data/te_data.csv', index=False)
+    write_table(final_dfs['TE'], POSITION_DATA_FILES['TE'])
+    # Only record the run once its output is written, so the next incremental run can reuse it
+    save_refresh_state(state)
     print("Saved qb_data.csv, rb_data.csv, wr_data.csv, and te_data.csv to processed_data folder.")
-    
-    # Step 4: Scrape free agents from Spotrac and merge with the QB data
-    print("Scraping free agent data from Spotrac...")
-    # free_agents_df = scrape_free_agents(off_url)
-    free_agents_df = get_available_free_agents(off_url)
-    free_agents_df = scrape_market_values_concurrently(free_agents_df, max_workers=5, delay=0.2)
+    return final_dfs
 
+def build_free_agent_files(final_dfs, free_agents_df):
+    """
+    Match the scraped free agents (with market values) to the position data and save
+    fa_qbs.csv, fa_rbs.csv, fa_wrs.csv and fa_tes.csv.
+    """
     def only_alpha_lower(s):
         """Return only alphabetic characters in lowercase (drop spaces, punctuation, etc.)."""
         if pd.isna(s):
@@ -351,11 +560,35 @@ def main():
     print(f"Number of FA WR rows: {fa_wr_merged.shape[0]}")
     print(f"Number of FA TE rows: {fa_te_merged.shape[0]}")
     
-    fa_qb_merged.to_csv('backend/processed_data/fa_qbs.csv', index=False)
-    fa_rb_merged.to_csv('backend/processed_data/fa_rbs.csv', index=False)
-    fa_wr_merged.to_csv('backend/processed_data/fa_wrs.csv', index=False)
-    fa_te_merged.to_csv('backend/processed_data/fa_tes.csv', index=False)
+    write_table(fa_qb_merged, FREE_AGENT_DATA_FILES['QB'])
+    write_table(fa_rb_merged, FREE_AGENT_DATA_FILES['RB'])
+    write_table(fa_wr_merged, FREE_AGENT_DATA_FILES['WR'])
+    write_table(fa_te_merged, FREE_AGENT_DATA_FILES['TE'])
     print("Saved fa_qbs.csv to processed_data folder.")
 
+def write_free_agent_files():
+    """
+    Pipeline step: build the free agent files from the saved position files and the
+    free agents saved by playerscrape.py (free_agents.csv).
+    """
+    final_dfs = {pos: read_table(path) for pos, path in POSITION_DATA_FILES.items()}
+    build_free_agent_files(final_dfs, read_table(free_agents_file))
+
+def main(incremental=False):
+    """
+    Rebuild the position files and free agent files.
+
+    Parameters:
+      incremental (bool): See build_player_files.
+    """
+    final_dfs = build_player_files(incremental)
+
+    # Step 4: Scrape free agents from Spotrac and merge with the QB data
+    print("Scraping free agent data from Spotrac...")
+    # free_agents_df = scrape_free_agents(off_url)
+    free_agents_df = get_available_free_agents(off_url)
+    free_agents_df = scrape_market_values_concurrently(free_agents_df, max_workers=5, delay=0.2)
+    build_free_agent_files(final_dfs, free_agents_df)
+
 if __name__ == "__main__":
-    main()
+    main(incremental='--incremental' in sys.argv)
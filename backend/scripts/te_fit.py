@@ -1,18 +1,22 @@
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LinearRegression
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
+from scripts.fit_engine import build_coefficient_matrix, row_fit_functions, score_row_terms, score_players, combine_scheme_fits
+from scripts.data_io import read_table
 
-# === 1. Read the Data ===
-team_df = pd.read_csv('processed_data/team_seasonal_stats.csv')
+# === 1. Data Files ===
+# Nothing is read at import time: load_te_data() reads and preprocesses the data on first use.
+team_data_file = 'processed_data/team_seasonal_stats.csv'
 # Free agent TEs for computing fits
-fa_te_df = pd.read_csv('processed_data/fa_tes.csv')
+fa_te_data_file = 'processed_data/fa_tes.csv'
 # Full TE dataset for ranking advanced metrics
-full_te_df = pd.read_csv('processed_data/te_data.csv')
+full_te_data_file = 'processed_data/te_data.csv'
 
 # === 2. Preprocess TE Data for Both Datasets ===
 def preprocess_te_data(df):
@@ -24,9 +28,6 @@ def preprocess_te_data(df):
     df['receiving_first_downs_per_game'] = df['receiving_first_downs'] / df['games']
     return df
 
-fa_te_df = preprocess_te_data(fa_te_df)
-full_te_df = preprocess_te_data(full_te_df)
-
 # === 3. Define Columns ===
 # Production columns (lower emphasis)
 production_cols_te = [
@@ -38,131 +39,142 @@ advanced_cols_te = [
     'ngs_avg_yac', 'ngs_avg_separation'
 ]
 all_te_cols = list(set(production_cols_te + advanced_cols_te))
-
-# === 4. Imputation & Scaling ===
-imputer = SimpleImputer(strategy='median')
-scaler = MinMaxScaler(feature_range=(0.2, 1))
-
-# Process free agent TE dataset (fa_tes)
-fa_te_imputed = fa_te_df.copy()
-fa_te_imputed[all_te_cols] = imputer.fit_transform(fa_te_imputed[all_te_cols])
-fa_te_imputed_scaled = fa_te_imputed.copy()
 scaled_cols_te = ["scaled_" + col for col in all_te_cols]
-fa_te_imputed_scaled[scaled_cols_te] = scaler.fit_transform(fa_te_imputed[all_te_cols])
-
-# Process full TE dataset (te_data) for rankings
-full_te_imputed = full_te_df.copy()
-full_te_imputed[all_te_cols] = imputer.fit_transform(full_te_imputed[all_te_cols])
-full_te_imputed_scaled = full_te_imputed.copy()
-full_te_imputed_scaled[scaled_cols_te] = scaler.fit_transform(full_te_imputed[all_te_cols])
 
-# === 5. Compute an Adjusted Production Score for TEs ===
-def compute_production_score_te(te_row):
+# === 4. Imputation & Scaling ===
+def impute_and_scale_te(te_df):
     """
-    Production score for TEs using lower weights on production stats.
-    Weighted sum:
-      - 30% scaled receiving yards per game
-      - 30% scaled receptions per game
-      - 40% scaled receiving TDs per game
+    Imputes missing values and scales the fit columns of a preprocessed TE frame
+    (free agent or full dataset). Returns the imputed and scaled frame.
     """
-    return (
-        0.3 * te_row['scaled_receiving_yards_per_game'] +
-        0.3 * te_row['scaled_receptions_per_game'] +
-        0.4 * te_row['scaled_receiving_tds_per_game']
-    )
-
-# === 6. Define Raw Fit Functions for Each Scheme for TEs ===
-# Each function uses 30% weight on production and 70% on advanced metrics.
-# The advanced portion distributes weights among:
-# - receiving_epa (EPA)
-# - ngs_avg_yac (YAC) [where applicable]
-# - receiving_first_downs_per_game (1st downs)
-# - ngs_catch_percentage (Catch %)
-# - ngs_avg_separation (only for West Coast)
+    imputer = SimpleImputer(strategy='median')
+    scaler = MinMaxScaler(feature_range=(0.2, 1))
+    te_imputed = te_df.copy()
+    te_imputed[all_te_cols] = imputer.fit_transform(te_imputed[all_te_cols])
+    te_imputed_scaled = te_imputed.copy()
+    te_imputed_scaled[scaled_cols_te] = scaler.fit_transform(te_imputed[all_te_cols])
+    return te_imputed_scaled
 
-def compute_raw_fit_air_raid_te(te_row):
-    prod = compute_production_score_te(te_row)
-    eff = (
-        0.3 * te_row['scaled_receiving_epa'] +
-        0.2 * te_row['scaled_ngs_avg_yac'] +
-        0.2 * te_row['scaled_ngs_catch_percentage'] +
-        0.3 * te_row['scaled_receiving_first_downs_per_game']
-    )
-    return 0.3 * prod + 0.7 * eff
+@lru_cache(maxsize=None)
+def load_te_data():
+    """
+    Reads the team and free agent TE data once and preprocesses it.
 
-def compute_raw_fit_spread_option_te(te_row):
-    prod = compute_production_score_te(te_row)
-    eff = (
-        0.3 * te_row['scaled_receiving_epa'] +
-        0.25 * te_row['scaled_ngs_avg_yac'] +
-        0.25 * te_row['scaled_receiving_first_downs_per_game'] +
-        0.2 * te_row['scaled_ngs_catch_percentage']
-    )
-    return 0.3 * prod + 0.7 * eff
+    Returns:
+      tuple: (team_df, fa_te_imputed_scaled). Treat both as read-only.
+    """
+    team_df = read_table(team_data_file)
+    fa_te_imputed_scaled = impute_and_scale_te(preprocess_te_data(read_table(fa_te_data_file)))
+    return team_df, fa_te_imputed_scaled
 
-def compute_raw_fit_west_coast_te(te_row):
-    prod = compute_production_score_te(te_row)
-    # Incorporate separation in the West Coast scheme
-    eff = (
-        0.25 * te_row['scaled_receiving_epa'] +
-        0.2 * te_row['scaled_ngs_avg_yac'] +
-        0.2 * te_row['scaled_receiving_first_downs_per_game'] +
-        0.2 * te_row['scaled_ngs_catch_percentage'] +
-        0.15 * te_row['scaled_ngs_avg_separation']
-    )
-    return 0.3 * prod + 0.7 * eff
+# === 5. Production Score & Scheme Coefficients for TEs ===
+# Production uses lower weights for TEs: 30% receiving yards, 30% receptions and 40% receiving
+# TDs per game. Each scheme puts 30% weight on production and 70% on advanced metrics, as
+# nested (weight, terms) components. These tables are the only place the weights are defined:
+# the vectorized fits score the matrix (fit_matrix_te) and the row-by-row raw fit functions
+# are read off the same matrix.
+production_terms_te = {
+    'scaled_receiving_yards_per_game': 0.3,
+    'scaled_receptions_per_game': 0.3,
+    'scaled_receiving_tds_per_game': 0.4
+}
+fit_coefficients_te = {
+    'air_raid': {
+        'prod': (0.3, production_terms_te),
+        'eff': (0.7, {
+            'scaled_receiving_epa': 0.3,
+            'scaled_ngs_avg_yac': 0.2,
+            'scaled_ngs_catch_percentage': 0.2,
+            'scaled_receiving_first_downs_per_game': 0.3
+        })
+    },
+    'spread_option': {
+        'prod': (0.3, production_terms_te),
+        'eff': (0.7, {
+            'scaled_receiving_epa': 0.3,
+            'scaled_ngs_avg_yac': 0.25,
+            'scaled_receiving_first_downs_per_game': 0.25,
+            'scaled_ngs_catch_percentage': 0.2
+        })
+    },
+    'west_coast': {
+        'prod': (0.3, production_terms_te),
+        'eff': (0.7, {
+            'scaled_receiving_epa': 0.25,
+            'scaled_ngs_avg_yac': 0.2,
+            'scaled_receiving_first_downs_per_game': 0.2,
+            'scaled_ngs_catch_percentage': 0.2,
+            'scaled_ngs_avg_separation': 0.15
+        })
+    },
+    'mcvay': {
+        'prod': (0.3, production_terms_te),
+        'eff': (0.7, {
+            'scaled_receiving_epa': 0.35,
+            'scaled_ngs_avg_yac': 0.2,
+            'scaled_receiving_first_downs_per_game': 0.25,
+            'scaled_ngs_catch_percentage': 0.2
+        })
+    },
+    'shanahan': {
+        'prod': (0.3, production_terms_te),
+        'eff': (0.7, {
+            'scaled_receiving_epa': 0.3,
+            'scaled_receiving_first_downs_per_game': 0.4,
+            'scaled_ngs_catch_percentage': 0.3
+        })
+    },
+    'run_power': {
+        'prod': (0.3, production_terms_te),
+        'eff': (0.7, {
+            'scaled_receiving_epa': 0.25,
+            'scaled_receiving_first_downs_per_game': 0.5,
+            'scaled_ngs_catch_percentage': 0.25
+        })
+    },
+    'pistol_power_spread': {
+        'prod': (0.3, production_terms_te),
+        'eff': (0.7, {
+            'scaled_receiving_epa': 0.3,
+            'scaled_ngs_avg_yac': 0.2,
+            'scaled_receiving_first_downs_per_game': 0.3,
+            'scaled_ngs_catch_percentage': 0.2
+        })
+    }
+}
+fit_matrix_te = build_coefficient_matrix(fit_coefficients_te, list(fit_coefficients_te))
+raw_fit_functions_te = row_fit_functions(fit_matrix_te)
 
-def compute_raw_fit_mcvay_te(te_row):
-    prod = compute_production_score_te(te_row)
-    eff = (
-        0.35 * te_row['scaled_receiving_epa'] +
-        0.2 * te_row['scaled_ngs_avg_yac'] +
-        0.25 * te_row['scaled_receiving_first_downs_per_game'] +
-        0.2 * te_row['scaled_ngs_catch_percentage']
-    )
-    return 0.3 * prod + 0.7 * eff
+def compute_production_score_te(te_row):
+    return score_row_terms(te_row, production_terms_te)
 
-def compute_raw_fit_shanahan_te(te_row):
-    prod = compute_production_score_te(te_row)
-    # Shanahan relies less on YAC, focusing on EPA, 1st downs, and catch percentage
-    eff = (
-        0.3 * te_row['scaled_receiving_epa'] +
-        0.4 * te_row['scaled_receiving_first_downs_per_game'] +
-        0.3 * te_row['scaled_ngs_catch_percentage']
-    )
-    return 0.3 * prod + 0.7 * eff
+# Team score column for each scheme, in the same order as fit_matrix_te.
+scheme_score_columns_te = {
+    'air_raid': 'score_air_raid',
+    'spread_option': 'score_spread_option',
+    'west_coast': 'score_west_coast',
+    'mcvay': 'score_west_coast_mcvay',
+    'shanahan': 'score_shanahan_wide_zone',
+    'run_power': 'score_run_power',
+    'pistol_power_spread': 'score_pistol_power_spread'
+}
 
-def compute_raw_fit_run_power_te(te_row):
-    prod = compute_production_score_te(te_row)
-    # Run Power focuses on EPA and 1st downs; YAC is not used here.
-    eff = (
-        0.25 * te_row['scaled_receiving_epa'] +
-        0.5 * te_row['scaled_receiving_first_downs_per_game'] +
-        0.25 * te_row['scaled_ngs_catch_percentage']
-    )
-    return 0.3 * prod + 0.7 * eff
+def compute_weighted_fit_matrix_te(te_frame, scheme_weights):
+    """
+    Weighted scheme fit of every TE in te_frame against every team at once.
 
-def compute_raw_fit_pistol_power_spread_te(te_row):
-    prod = compute_production_score_te(te_row)
-    eff = (
-        0.3 * te_row['scaled_receiving_epa'] +
-        0.2 * te_row['scaled_ngs_avg_yac'] +
-        0.3 * te_row['scaled_receiving_first_downs_per_game'] +
-        0.2 * te_row['scaled_ngs_catch_percentage']
-    )
-    return 0.3 * prod + 0.7 * eff
+    Parameters:
+      te_frame (pd.DataFrame): Imputed and scaled TE rows.
+      scheme_weights (np.ndarray): (teams x schemes) weights from top3_scheme_weights.
 
-raw_fit_functions_te = {
-    'air_raid': compute_raw_fit_air_raid_te,
-    'spread_option': compute_raw_fit_spread_option_te,
-    'west_coast': compute_raw_fit_west_coast_te,
-    'mcvay': compute_raw_fit_mcvay_te,
-    'shanahan': compute_raw_fit_shanahan_te,
-    'run_power': compute_raw_fit_run_power_te,
-    'pistol_power_spread': compute_raw_fit_pistol_power_spread_te
-}
+    Returns:
+      np.ndarray: A (players x teams) array. Like the scalar sum, a NaN raw fit in one
+      of a team's schemes makes that fit NaN.
+    """
+    raw_fits = score_players(te_frame, fit_matrix_te)
+    return combine_scheme_fits(raw_fits, scheme_weights, skip_nonfinite=False)
 
-# === 7. Define Function to Get Top 3 Scheme Weights for TEs ===
+# === 6. Define Function to Get Top 3 Scheme Weights for TEs ===
 def get_top3_scheme_weights_te(team_row):
     schemes = {
         'air_raid': team_row['score_air_raid'],
@@ -179,97 +191,146 @@ def get_top3_scheme_weights_te(team_row):
     weights = {scheme: score / total for scheme, score in top3}
     return weights
 
-# === 8. Build the (Team, TE) Fit Dataset Using Free Agent TEs ===
-records_te = []
-for _, team_row in team_df.iterrows():
-    team_name = team_row['team_name']
-    scheme_weights = get_top3_scheme_weights_te(team_row)
-    for _, te_row in fa_te_imputed_scaled.iterrows():
-        te_name = te_row['player_name']
-        te_id = te_row['player_id']
-        aav = te_row.get('market_value', te_row.get('AAV'))
-        prev_team = te_row['Prev Team'] if 'Prev Team' in te_row else np.nan
-        age = te_row['Age']
-        headshot = te_row['headshot_url'] if 'headshot_url' in te_row else ''
-        fit_components = {}
-        for scheme, weight in scheme_weights.items():
-            if scheme in raw_fit_functions_te:
-                raw_fit = raw_fit_functions_te[scheme](te_row)
-                fit_components[scheme] = raw_fit
-            else:
-                fit_components[scheme] = np.nan
-        final_fit = sum(scheme_weights[scheme] * fit_components[scheme] for scheme in scheme_weights)
-        recency_penalty = (2024- int(te_row['season'])) * 0.05
-        final_fit -= recency_penalty
-        records_te.append({
-            'team_name': team_name,
-            'te_name': te_name,
-            'te_id': te_id,
-            'aav': aav,
-            'prev_team': prev_team,
-            'age': age,
-            'headshot': headshot, 
-            'final_fit': final_fit,
-            'production_score': compute_production_score_te(te_row),
-            'air_raid_fit': fit_components.get('air_raid', np.nan),
-            'spread_option_fit': fit_components.get('spread_option', np.nan),
-            'west_coast_fit': fit_components.get('west_coast', np.nan),
-            'mcvay_fit': fit_components.get('mcvay', np.nan),
-            'shanahan_fit': fit_components.get('shanahan', np.nan),
-            'run_power_fit': fit_components.get('run_power', np.nan),
-            'pistol_power_spread_fit': fit_components.get('pistol_power_spread', np.nan),
-            # Save the raw advanced metrics (from free agent TE data)
-            'adv_receiving_epa': te_row['scaled_receiving_epa'],
-            'adv_receiving_first_downs': te_row['scaled_receiving_first_downs_per_game'],
-            'adv_ngs_catch_percentage': te_row['scaled_ngs_catch_percentage'],
-            'adv_ngs_avg_yac': te_row['scaled_ngs_avg_yac'],
-            'adv_ngs_avg_separation': te_row['scaled_ngs_avg_separation']
-        })
+# === 7. Compute Advanced Metric Rankings from the Full TE Dataset ===
+def rank_full_te_metrics(full_te_scaled):
+    """
+    Groups the imputed and scaled full TE dataset by player_name (so each player appears
+    only once) and ranks the advanced metrics, with 1 as the best (highest) value.
+    """
+    grouped_full_te = full_te_scaled.groupby('player_name').agg({
+        'scaled_receiving_epa': 'mean',
+        'scaled_receiving_first_downs_per_game': 'mean',
+        'scaled_ngs_catch_percentage': 'mean',
+        'scaled_ngs_avg_yac': 'mean',
+        'scaled_ngs_avg_separation': 'mean'
+    }).reset_index()
 
-fit_te_df = pd.DataFrame(records_te)
-print("Sample computed (team, TE) fit scores:")
-print(fit_te_df[['te_name', 'final_fit']].head())
-fit_te_df = fit_te_df.dropna(subset=['final_fit'])
-print("Number of rows after dropping NaN final_fit:", len(fit_te_df))
+    # For each metric, create a ranking column (with 1 as the best, i.e., highest value)
+    for col, rank_name in [
+        ('scaled_receiving_epa', 'adv_receiving_epa_rank'),
+        ('scaled_receiving_first_downs_per_game', 'adv_receiving_first_downs_rank'),
+        ('scaled_ngs_catch_percentage', 'adv_ngs_catch_percentage_rank'),
+        ('scaled_ngs_avg_yac', 'adv_ngs_avg_yac_rank'),
+        ('scaled_ngs_avg_separation', 'adv_ngs_avg_separation_rank')
+    ]:
+        grouped_full_te[rank_name] = grouped_full_te[col].rank(ascending=False, method='min')
 
-# === 9. Compute Advanced Metric Rankings from the Full TE Dataset ===
-# Group by player_name to ensure each player appears only once.
-grouped_full_te = full_te_imputed_scaled.groupby('player_name').agg({
-    'scaled_receiving_epa': 'mean',
-    'scaled_receiving_first_downs_per_game': 'mean',
-    'scaled_ngs_catch_percentage': 'mean',
-    'scaled_ngs_avg_yac': 'mean',
-    'scaled_ngs_avg_separation': 'mean'
-}).reset_index()
+    # Keep only the necessary ranking columns
+    return grouped_full_te[['player_name', 'adv_receiving_epa_rank', 'adv_receiving_first_downs_rank',
+                            'adv_ngs_catch_percentage_rank', 'adv_ngs_avg_yac_rank', 'adv_ngs_avg_separation_rank']]
 
-# For each metric, create a ranking column (with 1 as the best, i.e., highest value)
-for col, rank_name in [
-    ('scaled_receiving_epa', 'adv_receiving_epa_rank'),
-    ('scaled_receiving_first_downs_per_game', 'adv_receiving_first_downs_rank'),
-    ('scaled_ngs_catch_percentage', 'adv_ngs_catch_percentage_rank'),
-    ('scaled_ngs_avg_yac', 'adv_ngs_avg_yac_rank'),
-    ('scaled_ngs_avg_separation', 'adv_ngs_avg_separation_rank')
-]:
-    grouped_full_te[rank_name] = grouped_full_te[col].rank(ascending=False, method='min')
+def compute_full_te_rankings(data_file=full_te_data_file):
+    """
+    Loads the full TE dataset (data_file, 'te_data.csv' by default), imputes and scales it
+    like the free agent data, and returns the advanced metric ranking columns per player.
+    """
+    full_df = preprocess_te_data(read_table(data_file))
+    return rank_full_te_metrics(impute_and_scale_te(full_df))
 
-# Keep only the necessary ranking columns
-ranking_df = grouped_full_te[['player_name', 'adv_receiving_epa_rank', 'adv_receiving_first_downs_rank', 
-                              'adv_ngs_catch_percentage_rank', 'adv_ngs_avg_yac_rank', 'adv_ngs_avg_separation_rank']]
+# === 8. Build the (Team, TE) Fit Dataset Using Free Agent TEs ===
+@lru_cache(maxsize=None)
+def build_fit_te_df():
+    """
+    Builds the full (team, TE) fit dataset row by row with the scalar fit functions
+    and merges in the advanced metric rankings. The API uses the vectorized fit table
+    instead; this is the reference version, built only when asked for.
+    """
+    team_df, fa_te_imputed_scaled = load_te_data()
+    records_te = []
+    for _, team_row in team_df.iterrows():
+        team_name = team_row['team_name']
+        scheme_weights = get_top3_scheme_weights_te(team_row)
+        for _, te_row in fa_te_imputed_scaled.iterrows():
+            te_name = te_row['player_name']
+            te_id = te_row['player_id']
+            aav = te_row.get('market_value', te_row.get('AAV'))
+            prev_team = te_row['Prev Team'] if 'Prev Team' in te_row else np.nan
+            age = te_row['Age']
+            headshot = te_row['headshot_url'] if 'headshot_url' in te_row else ''
+            fit_components = {}
+            for scheme, weight in scheme_weights.items():
+                if scheme in raw_fit_functions_te:
+                    raw_fit = raw_fit_functions_te[scheme](te_row)
+                    fit_components[scheme] = raw_fit
+                else:
+                    fit_components[scheme] = np.nan
+            final_fit = sum(scheme_weights[scheme] * fit_components[scheme] for scheme in scheme_weights)
+            recency_penalty = (2024- int(te_row['season'])) * 0.05
+            final_fit -= recency_penalty
+            records_te.append({
+                'team_name': team_name,
+                'te_name': te_name,
+                'te_id': te_id,
+                'aav': aav,
+                'prev_team': prev_team,
+                'age': age,
+                'headshot': headshot, 
+                'final_fit': final_fit,
+                'production_score': compute_production_score_te(te_row),
+                'air_raid_fit': fit_components.get('air_raid', np.nan),
+                'spread_option_fit': fit_components.get('spread_option', np.nan),
+                'west_coast_fit': fit_components.get('west_coast', np.nan),
+                'mcvay_fit': fit_components.get('mcvay', np.nan),
+                'shanahan_fit': fit_components.get('shanahan', np.nan),
+                'run_power_fit': fit_components.get('run_power', np.nan),
+                'pistol_power_spread_fit': fit_components.get('pistol_power_spread', np.nan),
+                # Save the raw advanced metrics (from free agent TE data)
+                'adv_receiving_epa': te_row['scaled_receiving_epa'],
+                'adv_receiving_first_downs': te_row['scaled_receiving_first_downs_per_game'],
+                'adv_ngs_catch_percentage': te_row['scaled_ngs_catch_percentage'],
+                'adv_ngs_avg_yac': te_row['scaled_ngs_avg_yac'],
+                'adv_ngs_avg_separation': te_row['scaled_ngs_avg_separation']
+            })
 
-# Merge the ranking info into our free agent TE fit dataset based on te_name
-fit_te_df = fit_te_df.merge(ranking_df, left_on='te_name', right_on='player_name', how='left').drop(columns=['player_name'])
+    fit_te_df = pd.DataFrame(records_te)
+    fit_te_df = fit_te_df.dropna(subset=['final_fit'])
+    # Merge the ranking info into our free agent TE fit dataset based on te_name
+    ranking_df = compute_full_te_rankings()
+    return fit_te_df.merge(ranking_df, left_on='te_name', right_on='player_name', how='left').drop(columns=['player_name'])
 
-# === 10. Train a Simple Linear Regression Model Using a Pipeline ===
+# === 9. Train a Simple Linear Regression Model Using a Pipeline ===
 features_te = ['production_score', 'air_raid_fit', 'spread_option_fit', 'west_coast_fit', 
                'mcvay_fit', 'shanahan_fit', 'run_power_fit', 'pistol_power_spread_fit']
-X_te = fit_te_df[features_te]
-y_te = fit_te_df['final_fit']
-X_train_te, X_test_te, y_train_te, y_test_te = train_test_split(X_te, y_te, test_size=0.2, random_state=42)
-pipeline_te = Pipeline([
-    ('imputer', SimpleImputer(strategy='median')),
-    ('regressor', LinearRegression())
-])
-pipeline_te.fit(X_train_te, y_train_te)
-y_pred_te = pipeline_te.predict(X_test_te)
-mse_te = mean_squared_error(y_test_te, y_pred_te)
-print("Mean Squared Error for TE model:", mse_te)
+
+def train_te_model(fit_te_df):
+    """
+    Fits a linear regression of final_fit on the scheme fits (illustrative; the API does not use it).
+
+    Returns:
+      tuple: (pipeline_te, mse_te) — the fitted pipeline and its test-set MSE.
+    """
+    X_te = fit_te_df[features_te]
+    y_te = fit_te_df['final_fit']
+    X_train_te, X_test_te, y_train_te, y_test_te = train_test_split(X_te, y_te, test_size=0.2, random_state=42)
+    pipeline_te = Pipeline([
+        ('imputer', SimpleImputer(strategy='median')),
+        ('regressor', LinearRegression())
+    ])
+    pipeline_te.fit(X_train_te, y_train_te)
+    y_pred_te = pipeline_te.predict(X_test_te)
+    mse_te = mean_squared_error(y_test_te, y_pred_te)
+    return pipeline_te, mse_te
+
+# === 10. Lazy Module Attributes ===
+def __getattr__(name):
+    """
+    Keeps the old module-level frames (team_df, fa_te_imputed_scaled, fit_te_df,
+    ranking_df) importable; they are now built on first access.
+    """
+    if name == 'team_df':
+        return load_te_data()[0]
+    if name == 'fa_te_imputed_scaled':
+        return load_te_data()[1]
+    if name == 'fit_te_df':
+        return build_fit_te_df()
+    if name == 'ranking_df':
+        return compute_full_te_rankings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+if __name__ == "__main__":
+    fit_te_df = build_fit_te_df()
+    print("Sample computed (team, TE) fit scores:")
+    print(fit_te_df[['te_name', 'final_fit']].head())
+    print("Number of rows after dropping NaN final_fit:", len(fit_te_df))
+    pipeline_te, mse_te = train_te_model(fit_te_df)
+    print("Mean Squared Error for TE model:", mse_te)
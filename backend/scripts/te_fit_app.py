@@ -1,6 +1,13 @@
 import pandas as pd
 import numpy as np
-from scripts.te_fit import team_df, fa_te_imputed_scaled, get_top3_scheme_weights_te, raw_fit_functions_te, fit_te_df, full_te_imputed_scaled
+from scripts.fit_engine import top3_scheme_weights, column_or_fallback
+from scripts.fit_tensor import make_fit_table, get_fit_table, get_player_fit, sorted_team_fits
+from scripts.fit_store import shared_fit_table
+from scripts.ranking_cache import get_rankings, get_player_rankings, build_ranking_entry
+from scripts.te_fit import (
+    load_te_data, scheme_score_columns_te, compute_weighted_fit_matrix_te,
+    full_te_data_file, compute_full_te_rankings
+)
 
 def compute_team_need_te(team_row):
     """
@@ -30,9 +37,44 @@ def compute_team_need_te(team_row):
         bonus = -0.2
     return bonus
 
+def build_te_fit_table():
+    """
+    Scores every free agent TE (fa_tes) against every team at once.
+
+    Returns:
+      A FitTable of (TE, team) final fits including team need and age adjustments.
+    """
+    team_df, fa_te_imputed_scaled = load_te_data()
+    teams = team_df[team_df['team_name'].notna()].reset_index(drop=True)
+
+    # Get every team's top 3 scheme weights based on their offensive tendencies
+    scheme_weights = top3_scheme_weights(teams, scheme_score_columns_te)
+
+    # Calculate the final weighted fit score for every (TE, team) pair
+    fits = compute_weighted_fit_matrix_te(fa_te_imputed_scaled, scheme_weights)
+    fits += teams.apply(compute_team_need_te, axis=1).to_numpy(dtype=float)
+    age = fa_te_imputed_scaled['Age']
+    fits -= np.where(age > 33, (age - 33) * 0.02, 0.0)[:, None]
+    players = pd.DataFrame({
+        'te_name': fa_te_imputed_scaled['player_name'],
+        'te_id': fa_te_imputed_scaled['player_id'],
+        'aav': column_or_fallback(fa_te_imputed_scaled, 'market_value', 'AAV'),
+        'prev_team': fa_te_imputed_scaled['Prev Team'] if 'Prev Team' in fa_te_imputed_scaled.columns else np.nan,
+        'age': age,
+        'headshot': fa_te_imputed_scaled['headshot_url'] if 'headshot_url' in fa_te_imputed_scaled.columns else ''
+    })
+    return make_fit_table(teams['team_name'], players, fits, 'te_id')
+
+def load_te_fit_table():
+    """
+    Returns the TE FitTable from the shared fit store (memory-mapped, shared by every
+    worker process), building it first if the store is out of date.
+    """
+    return shared_fit_table('TE', build_te_fit_table, 'te_id')
+
 def get_te_fits_for_team(team_name):
     """
-    Given an NFL team name, computes the best TE fits using the trained TE model.
+    Given an NFL team name, returns the best TE fits from the precomputed (TE, team) fit table.
     
     Parameters:
       team_name (str): The full team name (e.g., "New England Patriots")
@@ -40,84 +82,51 @@ def get_te_fits_for_team(team_name):
     Returns:
       A sorted DataFrame with TE names, fit scores, and advanced metric rankings for the specified team.
     """
-    # Find the team row in the team stats DataFrame
-    team_row = team_df[team_df['team_name'].str.contains(team_name, case=False, na=False)]
-    
-    if team_row.empty:
+    results_df = get_te_fits_for_teams([team_name])[team_name]
+    if results_df is None:
         print(f"Error: Team '{team_name}' not found in the dataset.")
-        return None
-
-    team_row = team_row.iloc[0]  # Use the first matching row
-
-    # Get the team's top 3 scheme weights based on their offensive tendencies
-    scheme_weights = get_top3_scheme_weights_te(team_row)
-
-    records = []
-    # Iterate through each TE in the free agent TE DataFrame (fa_tes)
-    for _, te_row in fa_te_imputed_scaled.iterrows():
-        te_name = te_row['player_name']
-        te_id = te_row['player_id']
-        aav = te_row.get('market_value', te_row.get('AAV'))
-        prev_team = te_row['Prev Team'] if 'Prev Team' in te_row else np.nan
-        age = te_row['Age']
-        headshot = te_row['headshot_url'] if 'headshot_url' in te_row else ''
-        fit_components = {}
-
-        # Compute raw fit for each of the team's top 3 schemes
-        for scheme, weight in scheme_weights.items():
-            if scheme in raw_fit_functions_te:
-                raw_fit = raw_fit_functions_te[scheme](te_row)
-                fit_components[scheme] = raw_fit
-            else:
-                fit_components[scheme] = np.nan
-
-        # Calculate the final weighted fit score for this TE
-        final_fit = sum(scheme_weights[scheme] * fit_components[scheme] for scheme in scheme_weights)
-        final_fit += compute_team_need_te(team_row)
-        if age > 33:
-            final_fit -= (age - 33) * 0.02
-        records.append({
-            'te_name': te_name,
-            'te_id': te_id,
-            'aav': aav,
-            'prev_team': prev_team,
-            'age': age,
-            'headshot': headshot, 
-            'final_fit': final_fit
-        })
-
-    # Convert records to a DataFrame and sort by final fit score in descending order
-    results_df = pd.DataFrame(records).sort_values(by='final_fit', ascending=False)
+    return results_df
 
-    # === Compute Advanced Metric Rankings from the Full TE Dataset ===
-    # Group by player_name so that each player appears only once (taking the mean for duplicates)
-    grouped_full_te = full_te_imputed_scaled.groupby('player_name').agg({
-        'scaled_receiving_epa': 'mean',
-        'scaled_receiving_first_downs_per_game': 'mean',
-        'scaled_ngs_catch_percentage': 'mean',
-        'scaled_ngs_avg_yac': 'mean',
-        'scaled_ngs_avg_separation': 'mean'
-    }).reset_index()
+def get_te_fits_for_teams(team_names, limit=None, offset=0, min_fit=None, fields=None):
+    """
+    Returns the sorted TE fits (with ranking columns) for several teams in one pass over
+    the TE fit table: {team_name: DataFrame, or None if the team is unknown}.
+    limit, offset, min_fit and fields select a page of each team's results (see sorted_team_fits).
+    """
+    table = get_fit_table('TE', load_te_fit_table)
+    # Advanced metric rankings from the full TE dataset, with 'player_name' renamed
+    # to 'te_name' for merging, merged once for every team.
+    ranking_df = get_rankings('TE', full_te_data_file, compute_full_te_rankings)
+    ranking_df = ranking_df.rename(columns={'player_name': 'te_name'})
+    ranked_players = table.players.merge(ranking_df, on='te_name', how='left')
+    return sorted_team_fits(table, ranked_players, team_names, limit, offset, min_fit, fields)
 
-    # For each metric, create a ranking column (with 1 as the best, i.e., highest value)
-    for col, rank_name in [
-        ('scaled_receiving_epa', 'adv_receiving_epa_rank'),
-        ('scaled_receiving_first_downs_per_game', 'adv_receiving_first_downs_rank'),
-        ('scaled_ngs_catch_percentage', 'adv_ngs_catch_percentage_rank'),
-        ('scaled_ngs_avg_yac', 'adv_ngs_avg_yac_rank'),
-        ('scaled_ngs_avg_separation', 'adv_ngs_avg_separation_rank')
-    ]:
-        grouped_full_te[rank_name] = grouped_full_te[col].rank(ascending=False, method='min')
+def get_te_fit_for_player(team_name, player_id):
+    """
+    Returns one TE's final fit for a team merged with its ranking columns, as a dict,
+    or None if the team or player is unknown. Hash lookups only; no scoring pass.
+    """
+    table = get_fit_table('TE', load_te_fit_table)
+    final_fit = get_player_fit(table, team_name, player_id)
+    if final_fit is None:
+        return None
+    te_name = table.players['te_name'].iat[table.player_index[player_id.strip()]]
+    record = dict(get_player_rankings('TE', full_te_data_file, compute_full_te_rankings, te_name))
+    record['final_fit'] = final_fit
+    return record
 
-    # Keep only the ranking columns and rename 'player_name' to 'te_name' for merging
-    ranking_df = grouped_full_te[['player_name', 'adv_receiving_epa_rank', 'adv_receiving_first_downs_rank', 
-                                  'adv_ngs_catch_percentage_rank', 'adv_ngs_avg_yac_rank', 'adv_ngs_avg_separation_rank']]
-    ranking_df = ranking_df.rename(columns={'player_name': 'te_name'})
+def rebuild_te_fits():
+    """
+    Re-reads the TE data and builds a new fit table and ranking entry, without touching
+    the ones being served (the caller swaps them in). If another worker already stored
+    the fit table for the same data, that one is attached instead of building it again.
 
-    # Merge the ranking info into our free agent TE fit dataset based on te_name
-    results_df = results_df.merge(ranking_df, on='te_name', how='left')
+    Returns:
+    - (FitTable, ranking cache entry)
+    """
+    load_te_data.cache_clear()
+    return load_te_fit_table(), build_ranking_entry(full_te_data_file, compute_full_te_rankings)
 
-    return results_df
 
 # === Run the application ===
 if __name__ == "__main__":
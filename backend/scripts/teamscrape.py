@@ -1,27 +1,27 @@
-import requests
 import pandas as pd
-from bs4 import BeautifulSoup
+from data_io import write_table
+from http_fetch import fetch_text
+from html_parsing import table_rows
 
 def scrape_team_cap_data():
     # URL for the 2025 NFL Team Salary Cap Tracker
     url = "https://www.spotrac.com/nfl/cap/_/year/2025/sort/cap_maximum_space2"
 
-    # Headers to mimic a browser request
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    # Get the webpage content (browser headers, timeout and retries come from http_fetch);
+    # raises if the request doesn't succeed
+    df = parse_team_cap_data(fetch_text(url))
 
-    # Get the webpage content
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()  # Ensure the request was successful
-
-    # Parse the HTML
-    soup = BeautifulSoup(response.text, "html.parser")
+    # Save to CSV
+    write_table(df, "backend/processed_data/team_cap_data.csv")
 
-    # Find the table containing the data
-    table = soup.find("table", {"class": "datatable"})
+    return df
 
-    rows = soup.find_all("tr")
+def parse_team_cap_data(html):
+    """
+    Parse the Spotrac team salary cap page into a DataFrame (one row per team).
+    """
+    # Parse the table rows of the HTML
+    rows = table_rows(html)
 
     # Initialize lists for each column
     ranks = []
@@ -71,10 +71,6 @@ def scrape_team_cap_data():
         # Remove '$' and ',' then convert to numeric, replacing errors with NaN
         df[col] = pd.to_numeric(df[col].str.replace('[\$,]', '', regex=True), errors='coerce')
 
-    
-    # Save to CSV
-    df.to_csv("backend/processed_data/team_cap_data.csv", index=False)
-
     return df
 
 if __name__ == "__main__":
@@ -1,55 +1,117 @@
 import os
+import numpy as np
 import pandas as pd
 from data_loader import load_pbp_data, nfl
-import scheme           # make sure scheme.py contains apply_offensive_scheme() as defined earlier
+import scheme           # make sure scheme.py contains add_offensive_scheme() as defined earlier
 from teamscrape import scrape_team_cap_data
+from data_io import read_table, write_table
 
-def process_team_data(df):
+# Team tendency columns, in output order
+TEAM_STAT_COLUMNS = [
+    "pass_to_run", "shotgun_freq", "no_huddle_freq", "short_passes_freq", "deep_passes_freq",
+    "middle_passes", "side_passes", "scramble_freq", "first_down_rush_pct", "epa_pass", "epa_run",
+    "yac", "inside_run_pct", "outside_run_pct", "yards_gained_1", "yards_gained_2", "yards_gained_3",
+    "yards_gained_4", "ydstogo_3rd_down", "avg_air_yards"
+]
+
+def play_indicators(df):
     """
-    Process team statistics from play-by-play data.
+    Precompute, once for every play, the indicator columns the team stats are built from:
+    0/1 counts for the binary events and values that only count on some plays (e.g. EPA on
+    pass plays) with NaN elsewhere, so each stat becomes a plain per-team sum or mean.
     """
-    # Count binary events correctly by checking for 1s
-    num_dropbacks = (df["qb_dropback"] == 1).sum()
-    num_rush_attempts = (df["rush_attempt"] == 1).sum()
-    num_plays = num_dropbacks + num_rush_attempts
-
-    return pd.Series({
+    is_pass = df["play_type"] == "pass"
+    is_run = df["play_type"] == "run"
+    down = df["down"]
+    return pd.DataFrame({
+        # Count binary events correctly by checking for 1s
+        "dropbacks": (df["qb_dropback"] == 1).astype(int),
+        "rush_attempts": (df["rush_attempt"] == 1).astype(int),
+        "pass_attempts": (df["pass_attempt"] == 1).astype(int),
+        "shotgun": (df["shotgun"] == 1).astype(int),
+        "no_huddle": (df["no_huddle"] == 1).astype(int),
+        "short_passes": (df["pass_length"] == "short").astype(int),
+        "deep_passes": (df["pass_length"] == "deep").astype(int),
+        "middle_passes": (df["pass_location"] == "middle").astype(int),
+        "side_passes": df["pass_location"].isin(["left", "right"]).astype(int),
+        "scrambles": (df["qb_scramble"] == 1).astype(int),
+        "first_down_rushes": (df["first_down_rush"] == 1).astype(int),
+        "first_down_passes": (df["first_down_pass"] == 1).astype(int),
+        "runs": is_run.astype(int),
+        "inside_runs": (is_run & (df["run_gap"].isin(["tackle", "guard"]) | (df["run_location"] == "middle"))).astype(int),
+        "outside_runs": (is_run & (df["run_gap"] == "end")).astype(int),
+        "epa_pass": df["epa"].where(is_pass),
+        "epa_run": df["epa"].where(is_run),
+        "yac": df["yards_after_catch"],
+        "yards_gained_1": df["yards_gained"].where(down == 1),
+        "yards_gained_2": df["yards_gained"].where(down == 2),
+        "yards_gained_3": df["yards_gained"].where(down == 3),
+        "yards_gained_4": df["yards_gained"].where(down == 4),
+        "ydstogo_3rd_down": df["ydstogo"].where(down == 3),
+        "avg_air_yards": df["air_yards"].where(is_pass),
+    }, index=df.index)
+
+def process_team_data(df, keys):
+    """
+    Process team statistics from play-by-play data, one row per group of keys
+    (e.g. ["posteam", "week"] for weekly stats, "posteam" for seasonal stats).
+    One groupby pass over the precomputed indicators instead of filtering every group.
+    """
+    indicators = play_indicators(df)
+    count_columns = [col for col in indicators.columns if pd.api.types.is_integer_dtype(indicators[col])]
+    mean_columns = [col for col in indicators.columns if col not in count_columns]
+    # observed=True: categorical keys (posteam from load_pbp_data) only get rows for teams that played
+    grouped = indicators.groupby([df[key] for key in np.atleast_1d(keys)], observed=True)
+    counts = grouped[count_columns].sum()
+    means = grouped[mean_columns].mean()
+
+    num_dropbacks = counts["dropbacks"]
+    num_plays = num_dropbacks + counts["rush_attempts"]
+    pass_attempts = counts["pass_attempts"]
+    runs = counts["runs"]
+    stats = pd.DataFrame({
         "pass_to_run": num_dropbacks / num_plays,
-        "shotgun_freq": (df["shotgun"] == 1).sum() / num_plays,
-        "no_huddle_freq": (df["no_huddle"] == 1).sum() / num_plays,
-        "short_passes_freq": (df["pass_length"] == "short").sum() / (df["pass_attempt"] == 1).sum(),
-        "deep_passes_freq": (df["pass_length"] == "deep").sum() / (df["pass_attempt"] == 1).sum(),
-        "middle_passes": (df["pass_location"] == "middle").sum() / (df["pass_attempt"] == 1).sum(),
-        "side_passes": (df["pass_location"].isin(["left", "right"])).sum() / (df["pass_attempt"] == 1).sum(),
-        "scramble_freq": (df["qb_scramble"] == 1).sum() / num_dropbacks if num_dropbacks > 0 else 0,
-        "first_down_rush_pct": (df["first_down_rush"] == 1).sum() / ((df["first_down_rush"] == 1).sum() + (df["first_down_pass"] == 1).sum()),
-        "epa_pass": df[df["play_type"] == "pass"]["epa"].mean(),
-        "epa_run": df[df["play_type"] == "run"]["epa"].mean(),
-        "yac": df["yards_after_catch"].mean(),
-        "inside_run_pct": df[(df["play_type"] == "run") & 
-                              ((df["run_gap"].isin(["tackle", "guard"])) | (df["run_location"] == "middle"))].shape[0] / \
-                           df[df["play_type"] == "run"].shape[0] if df[df["play_type"] == "run"].shape[0] > 0 else 0,
-        "outside_run_pct": df[(df["play_type"] == "run") & (df["run_gap"] == "end")].shape[0] / \
-                           df[df["play_type"] == "run"].shape[0] if df[df["play_type"] == "run"].shape[0] > 0 else 0,
-        "yards_gained_1": df[df["down"] == 1]["yards_gained"].mean(),
-        "yards_gained_2": df[df["down"] == 2]["yards_gained"].mean(),
-        "yards_gained_3": df[df["down"] == 3]["yards_gained"].mean(),
-        "yards_gained_4": df[df["down"] == 4]["yards_gained"].mean(),
-        "ydstogo_3rd_down": df[df["down"] == 3]["ydstogo"].mean(),
-        "avg_air_yards": df[df["play_type"] == "pass"]["air_yards"].mean()
+        "shotgun_freq": counts["shotgun"] / num_plays,
+        "no_huddle_freq": counts["no_huddle"] / num_plays,
+        "short_passes_freq": counts["short_passes"] / pass_attempts,
+        "deep_passes_freq": counts["deep_passes"] / pass_attempts,
+        "middle_passes": counts["middle_passes"] / pass_attempts,
+        "side_passes": counts["side_passes"] / pass_attempts,
+        "scramble_freq": (counts["scrambles"] / num_dropbacks).where(num_dropbacks > 0, 0),
+        "first_down_rush_pct": counts["first_down_rushes"] / (counts["first_down_rushes"] + counts["first_down_passes"]),
+        "inside_run_pct": (counts["inside_runs"] / runs).where(runs > 0, 0),
+        "outside_run_pct": (counts["outside_runs"] / runs).where(runs > 0, 0),
     })
+    stats = stats.join(means)[TEAM_STAT_COLUMNS]
+    return stats.reset_index()
+
+# Output files; team_pbp_stats.csv is the seasonal stats before the scheme, cap and offense
+# columns are added (kept so those steps can be redone without re-aggregating play-by-play)
+TEAM_WEEKLY_FILE = "backend/processed_data/team_weekly_stats.csv"
+TEAM_PBP_FILE = "backend/processed_data/team_pbp_stats.csv"
+TEAM_SEASONAL_FILE = "backend/processed_data/team_seasonal_stats.csv"
+TEAM_CAP_FILE = "backend/processed_data/team_cap_data.csv"
+TEAM_OFFENSE_FILE = "backend/processed_data/team_offense_stats.csv"
+
+def build_team_pbp_stats(refresh=None):
+    """
+    Aggregate the play-by-play into weekly and seasonal team stats.
+    refresh is passed to load_pbp_data (default: download the current season again).
 
-def main():
+    Returns:
+      (pd.DataFrame, pd.DataFrame): Weekly stats, and seasonal stats with a league
+        average (LGAVG) row and the team descriptions.
+    """
     # --- Load and process play-by-play data ---
-    pbp_offense = load_pbp_data()
+    pbp_offense = load_pbp_data(refresh=refresh)
     pbp_offense = pbp_offense[pbp_offense['week'].between(1, 18)]
 
     # Calculate weekly team stats
-    team_weekly_data = pbp_offense.groupby(["posteam", "week"]).apply(process_team_data).reset_index()
+    team_weekly_data = process_team_data(pbp_offense, ["posteam", "week"])
     team_weekly_data = team_weekly_data.drop(columns=["week"])
 
     # Calculate seasonal team stats
-    team_seasonal_data = pbp_offense.groupby("posteam").apply(process_team_data).reset_index()
+    team_seasonal_data = process_team_data(pbp_offense, "posteam")
 
     # Calculate league average and append to seasonal stats
     league_average = team_seasonal_data.mean(numeric_only=True)
@@ -62,38 +124,38 @@ def main():
     team_seasonal_data = team_seasonal_data.merge(team_desc, left_on='posteam', right_on='team_abbr', how='left')
     team_seasonal_data = team_seasonal_data.drop(columns=["team_abbr"])
     team_seasonal_data = team_seasonal_data[['posteam', 'team_name'] + [col for col in team_seasonal_data.columns if col not in ['posteam', 'team_name']]]
+    return team_weekly_data, team_seasonal_data
+
+def write_team_pbp_stats(refresh=None):
+    """
+    Pipeline step: aggregate the play-by-play and save the weekly and (pre-scheme) seasonal stats.
+    """
+    team_weekly_data, team_seasonal_data = build_team_pbp_stats(refresh)
 
     # Create directory if needed and save weekly and seasonal stats
     os.makedirs("backend/processed_data", exist_ok=True)
-    team_weekly_data.to_csv("backend/processed_data/team_weekly_stats.csv", index=False)
-    team_seasonal_data.to_csv("backend/processed_data/team_seasonal_stats.csv", index=False)
+    write_table(team_weekly_data, TEAM_WEEKLY_FILE)
+    write_table(team_seasonal_data, TEAM_PBP_FILE)
 
     print("\nData saved to CSVs:")
-    print("1. Weekly team statistics: backend/processed_data/team_weekly_stats.csv")
-    print("2. Season averages: backend/processed_data/team_seasonal_stats.csv")
+    print(f"1. Weekly team statistics: {TEAM_WEEKLY_FILE}")
+    print(f"2. Season averages: {TEAM_PBP_FILE}")
 
-    # --- Apply Offensive Scheme ---
-    # This function reads the saved seasonal and weekly stats, computes scheme scores,
-    # assigns schemes, and writes back to the seasonal stats CSV.
-    scheme.apply_offensive_scheme()
-
-    # --- Merge Team Cap Data and Merge ---
-    cap_df = scrape_team_cap_data()  # Scrapes and saves ../processed_data/team_cap_data.csv
-    # Read the updated seasonal stats (which now includes scheme information)
-    seasonal_stats = pd.read_csv("backend/processed_data/team_seasonal_stats.csv")
-    
+def add_cap_space(seasonal_stats, cap_df):
+    """
+    Add each team's cap space (cap_space_all) from the scraped cap table.
+    """
     # Merge on team abbreviation; in cap_df the team abbreviation is in the "Team" column,
     # while in seasonal_stats it is in "posteam".
     merged_stats = pd.merge(seasonal_stats, cap_df[['Team', 'Cap Space All']], left_on='posteam', right_on='Team', how='left')
     # Optionally drop the redundant 'Team' column and rename 'Cap Space All' to 'cap_space_all'
-    merged_stats = merged_stats.drop(columns=['Team']).rename(columns={'Cap Space All': 'cap_space_all'})
-    
-    # Save the final CSV
-    merged_stats.to_csv("backend/processed_data/team_seasonal_stats.csv", index=False)
-
-    # --- Merge Team Offense Stats ---
-    offense_stats = pd.read_csv("backend/processed_data/team_offense_stats.csv")
-    merged_stats = pd.merge(merged_stats, offense_stats, left_on='team_name', right_on='Tm', how='left')
+    return merged_stats.drop(columns=['Team']).rename(columns={'Cap Space All': 'cap_space_all'})
+
+def add_offense_stats(seasonal_stats, offense_stats):
+    """
+    Add the team offense stats and a league rank for each of them.
+    """
+    merged_stats = pd.merge(seasonal_stats, offense_stats, left_on='team_name', right_on='Tm', how='left')
     merged_stats = merged_stats.drop(columns=['Rk', 'Tm', 'G'])
 
     # Define the columns and whether a lower value is better (True for ascending rank)
@@ -114,11 +176,34 @@ def main():
 
     for col, ascending in columns_to_rank.items():
         merged_stats[col + "_Rank"] = merged_stats[col].rank(ascending=ascending, method="min")
+    return merged_stats
+
+def write_team_seasonal_stats():
+    """
+    Pipeline step: build the final seasonal stats (scheme, cap space and offense stats
+    added to the play-by-play stats) and save them, in one write.
+    Reads the play-by-play stats, team_cap_data.csv and team_offense_stats.csv.
+    """
+    seasonal_stats = read_table(TEAM_PBP_FILE)
+    weekly_stats = read_table(TEAM_WEEKLY_FILE)
+
+    # --- Apply Offensive Scheme ---
+    # Computes scheme scores from the seasonal and weekly stats and assigns schemes
+    seasonal_stats = scheme.add_offensive_scheme(seasonal_stats, weekly_stats)
+
+    # --- Merge Team Cap Data and Offense Stats ---
+    seasonal_stats = add_cap_space(seasonal_stats, read_table(TEAM_CAP_FILE))
+    seasonal_stats = add_offense_stats(seasonal_stats, read_table(TEAM_OFFENSE_FILE))
 
     # save csv
-    merged_stats.to_csv("backend/processed_data/team_seasonal_stats.csv", index=False)
-    
-    print("\nFinal seasonal stats updated with Cap Space All and offense stats, and saved to backend/processed_data/team_seasonal_stats.csv")
+    write_table(seasonal_stats, TEAM_SEASONAL_FILE)
+
+    print(f"\nFinal seasonal stats updated with schemes, Cap Space All and offense stats, and saved to {TEAM_SEASONAL_FILE}")
+
+def main():
+    write_team_pbp_stats()
+    scrape_team_cap_data()  # Scrapes and saves backend/processed_data/team_cap_data.csv
+    write_team_seasonal_stats()
 
 if __name__ == "__main__":
     main()
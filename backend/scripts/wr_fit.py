@@ -1,26 +1,23 @@
 import pandas as pd
 import numpy as np
+from functools import lru_cache
 from sklearn.preprocessing import MinMaxScaler
 from sklearn.impute import SimpleImputer
 from sklearn.linear_model import LinearRegression
 from sklearn.pipeline import Pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error
+from scripts.fit_engine import build_coefficient_matrix, row_fit_functions, score_players, combine_scheme_fits
+from scripts.data_io import read_table
 
-# === 1. Read the Data ===
-team_df = pd.read_csv('processed_data/team_seasonal_stats.csv')
-wr_df = pd.read_csv('processed_data/fa_wrs.csv')
+# === 1. Data Files ===
+# Nothing is read at import time: load_wr_data() reads and preprocesses the data on first use.
+team_data_file = 'processed_data/team_seasonal_stats.csv'
+fa_wr_data_file = 'processed_data/fa_wrs.csv'
+# Full WR dataset (all seasons), used for the advanced stat rankings
+full_wr_data_file = 'processed_data/wr_data.csv'
 
 # === 2. Preprocess WR Data ===
-# Replace 0 games with NaN to avoid division by zero
-wr_df['games'] = wr_df['games'].replace(0, np.nan)
-wr_df['receiving_yards_per_game'] = wr_df['receiving_yards'] / wr_df['games']
-wr_df['receiving_tds_per_game'] = wr_df['receiving_tds'] / wr_df['games']
-wr_df['receptions_per_game'] = wr_df['receptions'] / wr_df['games']
-wr_df['targets_per_game'] = wr_df['targets'] / wr_df['games']
-wr_df['receiving_first_downs_per_game'] = wr_df['receiving_first_downs'] / wr_df['games']
-wr_df['receiving_2pt_conversions_per_game'] = wr_df.get('receiving_2pt_conversions', 0) / wr_df['games']
-
 # Define columns for production, efficiency, volume, and extra stats
 production_cols_wr = [
     'receiving_yards_per_game', 'receiving_tds_per_game',
@@ -40,26 +37,54 @@ ranking_cols_extra = [
     'ngs_avg_yac_above_expectation', 'ngs_percent_share_of_intended_air_yards',
     'racr'
 ]
-for col in ranking_cols_extra:
-    if col not in wr_df.columns:
-        wr_df[col] = np.nan
 
 # Combine all columns to be imputed and scaled
 all_wr_cols = list(set(production_cols_wr + efficiency_cols_wr + volume_cols + ranking_cols_extra))
-
-imputer = SimpleImputer(strategy='median')
-wr_imputed = wr_df.copy()
-wr_imputed[all_wr_cols] = imputer.fit_transform(wr_imputed[all_wr_cols])
-
-scaler = MinMaxScaler(feature_range=(0.2, 1))
-wr_imputed_scaled = wr_imputed.copy()
 scaled_cols_wr = ["scaled_" + col for col in all_wr_cols]
-wr_imputed_scaled[scaled_cols_wr] = scaler.fit_transform(wr_imputed[all_wr_cols])
 
 # Auxiliary metric: Yards per Reception (YPR)
 def safe_ypr(row):
     return row['receiving_yards'] / row['receptions'] if row['receptions'] > 0 else 0
-wr_imputed_scaled['ypr'] = wr_imputed_scaled.apply(safe_ypr, axis=1)
+
+def preprocess_wr_data(wr_df):
+    """
+    Adds the per-game columns to the free agent WR data, imputes missing values,
+    scales the fit columns and adds yards per reception. Returns the imputed and scaled frame.
+    """
+    # Replace 0 games with NaN to avoid division by zero
+    wr_df['games'] = wr_df['games'].replace(0, np.nan)
+    wr_df['receiving_yards_per_game'] = wr_df['receiving_yards'] / wr_df['games']
+    wr_df['receiving_tds_per_game'] = wr_df['receiving_tds'] / wr_df['games']
+    wr_df['receptions_per_game'] = wr_df['receptions'] / wr_df['games']
+    wr_df['targets_per_game'] = wr_df['targets'] / wr_df['games']
+    wr_df['receiving_first_downs_per_game'] = wr_df['receiving_first_downs'] / wr_df['games']
+    wr_df['receiving_2pt_conversions_per_game'] = wr_df.get('receiving_2pt_conversions', 0) / wr_df['games']
+    for col in ranking_cols_extra:
+        if col not in wr_df.columns:
+            wr_df[col] = np.nan
+
+    imputer = SimpleImputer(strategy='median')
+    wr_imputed = wr_df.copy()
+    wr_imputed[all_wr_cols] = imputer.fit_transform(wr_imputed[all_wr_cols])
+
+    scaler = MinMaxScaler(feature_range=(0.2, 1))
+    wr_imputed_scaled = wr_imputed.copy()
+    wr_imputed_scaled[scaled_cols_wr] = scaler.fit_transform(wr_imputed[all_wr_cols])
+
+    wr_imputed_scaled['ypr'] = wr_imputed_scaled.apply(safe_ypr, axis=1)
+    return wr_imputed_scaled
+
+@lru_cache(maxsize=None)
+def load_wr_data():
+    """
+    Reads the team and free agent WR data once and preprocesses it.
+
+    Returns:
+      tuple: (team_df, wr_imputed_scaled). Treat both as read-only.
+    """
+    team_df = read_table(team_data_file)
+    wr_imputed_scaled = preprocess_wr_data(read_table(fa_wr_data_file))
+    return team_df, wr_imputed_scaled
 
 # === 3. Bonus Functions for WRs ===
 def compute_volume_bonus(wr_row):
@@ -86,103 +111,96 @@ def compute_ypr_bonus_wr(wr_row):
         bonus += 0.05
     return bonus
 
-# === 4. Raw Fit Functions for Wideouts ===
-def compute_production_score_wr(wr_row):
-    """
-    Production score is a weighted sum of per-game receiving stats.
-      - 40% receiving yards per game
-      - 20% receiving TDs per game
-      - 20% receptions per game
-      - 10% receiving first downs per game
-      - 10% receiving 2pt conversions per game
-    """
-    return (
-        0.4 * wr_row['scaled_receiving_yards_per_game'] +
-        0.2 * wr_row['scaled_receiving_tds_per_game'] +
-        0.2 * wr_row['scaled_receptions_per_game'] +
-        0.1 * wr_row['scaled_receiving_first_downs_per_game'] +
-        0.1 * wr_row.get('scaled_receiving_2pt_conversions_per_game', 0)
-    )
+# === 4. Scheme Coefficients for WRs ===
+# Each scheme's raw fit combines the per-game production score (production_terms_wr) and an
+# efficiency component, as nested (weight, terms) components. These tables are the only place
+# the weights are defined: the vectorized fits score the matrix (fit_matrix_wr) and the
+# row-by-row raw fit functions are read off the same matrix.
+production_terms_wr = {
+    'scaled_receiving_yards_per_game': 0.4,
+    'scaled_receiving_tds_per_game': 0.2,
+    'scaled_receptions_per_game': 0.2,
+    'scaled_receiving_first_downs_per_game': 0.1,
+    'scaled_receiving_2pt_conversions_per_game': 0.1
+}
+fit_coefficients_wr = {
+    'air_raid': {
+        'prod': (0.45, production_terms_wr),
+        'eff': (0.55, {
+            'scaled_receiving_epa': 0.30,
+            'scaled_ngs_avg_yac': 0.25,
+            'scaled_ngs_avg_separation': 0.25,
+            'scaled_ngs_catch_percentage': 0.20
+        })
+    },
+    'spread_option': {
+        'prod': (0.4, production_terms_wr),
+        'eff': (0.6, {
+            'scaled_receiving_epa': 0.35,
+            'scaled_ngs_avg_yac': 0.25,
+            'scaled_ngs_avg_separation': 0.20,
+            'scaled_air_yards_share': 0.20
+        })
+    },
+    'west_coast': {
+        'prod': (0.4, production_terms_wr),
+        'eff': (0.6, {
+            'scaled_receiving_epa': 0.30,
+            'scaled_ngs_avg_yac': 0.30,
+            'scaled_ngs_avg_separation': 0.20,
+            'scaled_ngs_catch_percentage': 0.20
+        })
+    },
+    'mcvay': {
+        'prod': (0.4, production_terms_wr),
+        'eff': (0.6, {
+            'scaled_receiving_epa': 0.35,
+            'scaled_ngs_avg_yac': 0.25,
+            'scaled_ngs_avg_separation': 0.25,
+            'scaled_receiving_2pt_conversions_per_game': 0.15
+        })
+    },
+    'shanahan': {
+        'prod': (0.5, production_terms_wr),
+        'eff': (0.5, {
+            'scaled_receiving_epa': 0.25,
+            'scaled_ngs_avg_yac': 0.25,
+            'scaled_ngs_avg_separation': 0.25,
+            'scaled_ngs_catch_percentage': 0.25
+        })
+    },
+    'run_power': {
+        'prod': (0.35, production_terms_wr),
+        'eff': (0.65, {
+            'scaled_receiving_epa': 0.20,
+            'scaled_ngs_avg_yac': 0.20,
+            'scaled_ngs_avg_separation': 0.30,
+            'scaled_ngs_catch_percentage': 0.30
+        })
+    },
+    'pistol_power_spread': {
+        'prod': (0.4, production_terms_wr),
+        'eff': (0.6, {
+            'scaled_receiving_epa': 0.30,
+            'scaled_ngs_avg_yac': 0.20,
+            'scaled_ngs_avg_separation': 0.20,
+            'scaled_target_share': 0.15,
+            'scaled_air_yards_share': 0.15
+        })
+    }
+}
+fit_matrix_wr = build_coefficient_matrix(fit_coefficients_wr, list(fit_coefficients_wr))
+raw_fit_functions_wr = row_fit_functions(fit_matrix_wr)
 
-def compute_raw_fit_air_raid_wr(wr_row):
-    prod = compute_production_score_wr(wr_row)
-    eff = (
-        0.30 * wr_row['scaled_receiving_epa'] +
-        0.25 * wr_row['scaled_ngs_avg_yac'] +
-        0.25 * wr_row['scaled_ngs_avg_separation'] +
-        0.20 * wr_row['scaled_ngs_catch_percentage']
-    )
-    return 0.45 * prod + 0.55 * eff
-
-def compute_raw_fit_spread_option_wr(wr_row):
-    prod = compute_production_score_wr(wr_row)
-    eff = (
-        0.35 * wr_row['scaled_receiving_epa'] +
-        0.25 * wr_row['scaled_ngs_avg_yac'] +
-        0.20 * wr_row['scaled_ngs_avg_separation'] +
-        0.20 * wr_row['scaled_air_yards_share']
-    )
-    return 0.4 * prod + 0.6 * eff
-
-def compute_raw_fit_west_coast_wr(wr_row):
-    prod = compute_production_score_wr(wr_row)
-    eff = (
-        0.30 * wr_row['scaled_receiving_epa'] +
-        0.30 * wr_row['scaled_ngs_avg_yac'] +
-        0.20 * wr_row['scaled_ngs_avg_separation'] +
-        0.20 * wr_row['scaled_ngs_catch_percentage']
-    )
-    return 0.4 * prod + 0.6 * eff
-
-def compute_raw_fit_mcvay_wr(wr_row):
-    prod = compute_production_score_wr(wr_row)
-    eff = (
-        0.35 * wr_row['scaled_receiving_epa'] +
-        0.25 * wr_row['scaled_ngs_avg_yac'] +
-        0.25 * wr_row['scaled_ngs_avg_separation'] +
-        0.15 * wr_row.get('scaled_receiving_2pt_conversions_per_game', 0)
-    )
-    return 0.4 * prod + 0.6 * eff
-
-def compute_raw_fit_shanahan_wr(wr_row):
-    prod = compute_production_score_wr(wr_row)
-    eff = (
-        0.25 * wr_row['scaled_receiving_epa'] +
-        0.25 * wr_row['scaled_ngs_avg_yac'] +
-        0.25 * wr_row['scaled_ngs_avg_separation'] +
-        0.25 * wr_row['scaled_ngs_catch_percentage']
-    )
-    return 0.5 * prod + 0.5 * eff
-
-def compute_raw_fit_run_power_wr(wr_row):
-    prod = compute_production_score_wr(wr_row)
-    eff = (
-        0.20 * wr_row['scaled_receiving_epa'] +
-        0.20 * wr_row['scaled_ngs_avg_yac'] +
-        0.30 * wr_row['scaled_ngs_avg_separation'] +
-        0.30 * wr_row['scaled_ngs_catch_percentage']
-    )
-    return 0.35 * prod + 0.65 * eff
-
-def compute_raw_fit_pistol_power_spread_wr(wr_row):
-    prod = compute_production_score_wr(wr_row)
-    eff = (
-        0.30 * wr_row['scaled_receiving_epa'] +
-        0.20 * wr_row['scaled_ngs_avg_yac'] +
-        0.20 * wr_row['scaled_ngs_avg_separation'] +
-        0.15 * wr_row['scaled_target_share'] +
-        0.15 * wr_row['scaled_air_yards_share']
-    )
-    return 0.4 * prod + 0.6 * eff
-
-raw_fit_functions_wr = {
-    'air_raid': compute_raw_fit_air_raid_wr,
-    'spread_option': compute_raw_fit_spread_option_wr,
-    'west_coast': compute_raw_fit_west_coast_wr,
-    'mcvay': compute_raw_fit_mcvay_wr,
-    'shanahan': compute_raw_fit_shanahan_wr,
-    'run_power': compute_raw_fit_run_power_wr,
-    'pistol_power_spread': compute_raw_fit_pistol_power_spread_wr
+# Team score column for each scheme, in the same order as fit_matrix_wr.
+scheme_score_columns_wr = {
+    'air_raid': 'score_air_raid',
+    'spread_option': 'score_spread_option',
+    'west_coast': 'score_west_coast',
+    'mcvay': 'score_west_coast_mcvay',
+    'shanahan': 'score_shanahan_wide_zone',
+    'run_power': 'score_run_power',
+    'pistol_power_spread': 'score_pistol_power_spread'
 }
 
 # === 5. Scheme Weights for WRs ===
@@ -202,6 +220,9 @@ def get_top3_scheme_weights_wr(team_row):
     weights = {scheme: score/total for scheme, score in top3}
     return weights
 
+# "Big name" receivers get a recognition bonus.
+big_name_list_wr = ["Dyami Brown", "DeAndre Hopkins", "Stefon Diggs", "Keenan Allen", "Amari Cooper"]
+
 # === 6. Unified Final Fit Calculation for WRs (No Ranking) ===
 def compute_final_fit_wr(wr_row, scheme_weights, raw_fit_functions):
     """
@@ -240,64 +261,48 @@ def compute_final_fit_wr(wr_row, scheme_weights, raw_fit_functions):
     base_fit += compute_ypr_bonus_wr(wr_row)
     
     # Add bonus for "big name" receivers.
-    big_name_list = ["Dyami Brown", "DeAndre Hopkins", "Stefon Diggs", "Keenan Allen", "Amari Cooper"]
-    if wr_row['player_name'] in big_name_list:
+    if wr_row['player_name'] in big_name_list_wr:
         base_fit += 0.11
 
     recency_penalty = (2024- int(wr_row['season'])) * 0.05
 
     return base_fit - recency_penalty
 
-# === 7. Build the (Team, WR) Fit Dataset (No Ranking) ===
-records_wr = []
-for _, team_row in team_df.iterrows():
-    team_name = team_row['team_name']
-    scheme_weights = get_top3_scheme_weights_wr(team_row)
-    for _, wr_row in wr_imputed_scaled.iterrows():
-        wr_name = wr_row['player_name']
-        wr_id = wr_row['player_id']
-        aav = wr_row.get('market_value', wr_row.get('AAV'))
-        prev_team = wr_row['Prev Team']
-        age = wr_row['Age']
-        games = wr_row['games']
-        headshot = wr_row['headshot_url']
-        final_fit = compute_final_fit_wr(wr_row, scheme_weights, raw_fit_functions_wr)
-        records_wr.append({
-            'team_name': team_name,
-            'wr_name': wr_name,
-            'wr_id': wr_id,
-            'aav': aav,
-            'prev_team': prev_team,
-            'age': age,
-            'games': games,
-            'headshot': headshot,
-            'final_fit': final_fit
-        })
+# === 6b. Vectorized Final Fit for WRs ===
+def compute_bonuses_wr_vectorized(wr_frame):
+    """
+    Vectorized compute_volume_bonus + compute_ypr_bonus_wr + the big name bonus,
+    one value per WR in wr_frame.
+    """
+    bonus = np.where(wr_frame['receptions_per_game'].to_numpy(dtype=float) >= 6, 0.05, 0.0)
+    bonus += np.where(wr_frame['targets_per_game'].to_numpy(dtype=float) >= 8, 0.05, 0.0)
+    if 'ypr' in wr_frame.columns:
+        bonus += np.where(wr_frame['ypr'].to_numpy(dtype=float) > 14, 0.05, 0.0)
+    bonus += np.where(wr_frame['player_name'].isin(big_name_list_wr), 0.11, 0.0)
+    return bonus
 
-fit_wr_df = pd.DataFrame(records_wr)
-fit_wr_df = fit_wr_df.dropna(subset=['final_fit'])
-print("Sample computed (Team, WR) fit scores:")
-print(fit_wr_df[['wr_name', 'final_fit']].head())
+def compute_final_fit_matrix_wr(wr_frame, scheme_weights):
+    """
+    Vectorized compute_final_fit_wr for every WR against every team at once.
 
-# === 8. Train a Simple Linear Regression Model Using a Pipeline (Optional) ===
-# Here, we illustrate a basic pipeline. In practice, your target may differ.
-features_wr = ['final_fit']  # For example, you might include other features as well.
-X_wr = fit_wr_df[['final_fit']]
-y_wr = fit_wr_df['final_fit']  # This is illustrative; adjust as needed.
-X_train_wr, X_test_wr, y_train_wr, y_test_wr = train_test_split(X_wr, y_wr, test_size=0.2, random_state=42)
-pipeline_wr = Pipeline([
-    ('imputer', SimpleImputer(strategy='median')),
-    ('regressor', LinearRegression())
-])
-pipeline_wr.fit(X_train_wr, y_train_wr)
-y_pred_wr = pipeline_wr.predict(X_test_wr)
-mse_wr = mean_squared_error(y_test_wr, y_pred_wr)
-print("Mean Squared Error for WR model:", mse_wr)
+    Parameters:
+      wr_frame (pd.DataFrame): Imputed and scaled WR rows.
+      scheme_weights (np.ndarray): (teams x schemes) weights from top3_scheme_weights.
+
+    Returns:
+      np.ndarray: A (players x teams) array of final fits (before team need and age).
+    """
+    base_fit = combine_scheme_fits(score_players(wr_frame, fit_matrix_wr), scheme_weights)
+
+    adjustment = compute_bonuses_wr_vectorized(wr_frame)
+    adjustment -= np.where(wr_frame['games'].to_numpy(dtype=float) < 9, 0.1, 0.0)
+    adjustment -= (2024 - wr_frame['season'].to_numpy(dtype=float)) * 0.05
+    return base_fit + adjustment[:, None]
 
 # === 7. Functionalized Full WR Ranking ===
-def compute_full_wr_rankings():
+def compute_full_wr_rankings(data_file=full_wr_data_file):
     # Load full WR dataset
-    full_wr_df = pd.read_csv('processed_data/wr_data.csv')
+    full_wr_df = read_table(data_file)
     full_wr_df['games'] = full_wr_df['games'].replace(0, np.nan)
     full_wr_df['receiving_yards_per_game'] = full_wr_df['receiving_yards'] / full_wr_df['games']
     full_wr_df['receiving_tds_per_game'] = full_wr_df['receiving_tds'] / full_wr_df['games']
@@ -345,9 +350,90 @@ def compute_full_wr_rankings():
     ranking_wr_df = grouped_full_wr[['player_name'] + [metric + '_rank' for metric in ranking_columns.keys()]]
     return ranking_wr_df
 
-# === 8. Merge Ranking Info into Free Agent WR Fit Dataset ===
-ranking_wr_df = compute_full_wr_rankings()
-fit_wr_df = fit_wr_df.merge(ranking_wr_df, left_on='wr_name', right_on='player_name', how='left').drop(columns=['player_name'])
+# === 8. Build the (Team, WR) Fit Dataset ===
+@lru_cache(maxsize=None)
+def build_fit_wr_df():
+    """
+    Builds the full (team, WR) fit dataset row by row with the scalar fit functions
+    and merges in the WR rankings. The API uses the vectorized fit table instead; this
+    is the reference version, built only when asked for.
+    """
+    team_df, wr_imputed_scaled = load_wr_data()
+    records_wr = []
+    for _, team_row in team_df.iterrows():
+        team_name = team_row['team_name']
+        scheme_weights = get_top3_scheme_weights_wr(team_row)
+        for _, wr_row in wr_imputed_scaled.iterrows():
+            wr_name = wr_row['player_name']
+            wr_id = wr_row['player_id']
+            aav = wr_row.get('market_value', wr_row.get('AAV'))
+            prev_team = wr_row['Prev Team']
+            age = wr_row['Age']
+            games = wr_row['games']
+            headshot = wr_row['headshot_url']
+            final_fit = compute_final_fit_wr(wr_row, scheme_weights, raw_fit_functions_wr)
+            records_wr.append({
+                'team_name': team_name,
+                'wr_name': wr_name,
+                'wr_id': wr_id,
+                'aav': aav,
+                'prev_team': prev_team,
+                'age': age,
+                'games': games,
+                'headshot': headshot,
+                'final_fit': final_fit
+            })
+
+    fit_wr_df = pd.DataFrame(records_wr)
+    fit_wr_df = fit_wr_df.dropna(subset=['final_fit'])
+    # Merge Ranking Info into Free Agent WR Fit Dataset
+    ranking_wr_df = compute_full_wr_rankings()
+    return fit_wr_df.merge(ranking_wr_df, left_on='wr_name', right_on='player_name', how='left').drop(columns=['player_name'])
+
+# === 9. Train a Simple Linear Regression Model Using a Pipeline (Optional) ===
+# Here, we illustrate a basic pipeline. In practice, your target may differ.
+features_wr = ['final_fit']  # For example, you might include other features as well.
+
+def train_wr_model(fit_wr_df):
+    """
+    Fits the illustrative linear regression pipeline (the API does not use it).
+
+    Returns:
+      tuple: (pipeline_wr, mse_wr) — the fitted pipeline and its test-set MSE.
+    """
+    X_wr = fit_wr_df[features_wr]
+    y_wr = fit_wr_df['final_fit']  # This is illustrative; adjust as needed.
+    X_train_wr, X_test_wr, y_train_wr, y_test_wr = train_test_split(X_wr, y_wr, test_size=0.2, random_state=42)
+    pipeline_wr = Pipeline([
+        ('imputer', SimpleImputer(strategy='median')),
+        ('regressor', LinearRegression())
+    ])
+    pipeline_wr.fit(X_train_wr, y_train_wr)
+    y_pred_wr = pipeline_wr.predict(X_test_wr)
+    mse_wr = mean_squared_error(y_test_wr, y_pred_wr)
+    return pipeline_wr, mse_wr
+
+# === 10. Lazy Module Attributes ===
+def __getattr__(name):
+    """
+    Keeps the old module-level frames (team_df, wr_imputed_scaled, fit_wr_df,
+    ranking_wr_df) importable; they are now built on first access.
+    """
+    if name == 'team_df':
+        return load_wr_data()[0]
+    if name == 'wr_imputed_scaled':
+        return load_wr_data()[1]
+    if name == 'fit_wr_df':
+        return build_fit_wr_df()
+    if name == 'ranking_wr_df':
+        return compute_full_wr_rankings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-print("Final WR Fit Data with Rankings:")
-print(fit_wr_df.head())
+if __name__ == "__main__":
+    fit_wr_df = build_fit_wr_df()
+    print("Sample computed (Team, WR) fit scores:")
+    print(fit_wr_df[['wr_name', 'final_fit']].head())
+    pipeline_wr, mse_wr = train_wr_model(fit_wr_df)
+    print("Mean Squared Error for WR model:", mse_wr)
+    print("Final WR Fit Data with Rankings:")
+    print(fit_wr_df.head())
@@ -1,6 +1,10 @@
 import pandas as pd
 import numpy as np
-from scripts.wr_fit import team_df, wr_imputed_scaled, get_top3_scheme_weights_wr, raw_fit_functions_wr, compute_final_fit_wr, compute_full_wr_rankings
+from scripts.fit_engine import top3_scheme_weights, column_or_fallback
+from scripts.fit_tensor import make_fit_table, get_fit_table, get_player_fit, sorted_team_fits
+from scripts.fit_store import shared_fit_table
+from scripts.ranking_cache import get_rankings, get_player_rankings, build_ranking_entry
+from scripts.wr_fit import load_wr_data, scheme_score_columns_wr, compute_final_fit_matrix_wr, full_wr_data_file, compute_full_wr_rankings
 
 def compute_team_need_bonus_wr(team_row):
     """
@@ -36,49 +40,86 @@ def compute_team_need_bonus_wr(team_row):
         bonus = 0.075
     return bonus
 
+def build_wr_fit_table():
+    """
+    Scores every free agent WR against every team at once, returning a FitTable
+    of (WR, team) final fits including team need and age adjustments.
+    """
+    team_df, wr_imputed_scaled = load_wr_data()
+    teams = team_df[team_df['team_name'].notna()].reset_index(drop=True)
+    scheme_weights = top3_scheme_weights(teams, scheme_score_columns_wr)
+    # Use the unified (vectorized) function to compute final fit (with bonuses)
+    fits = compute_final_fit_matrix_wr(wr_imputed_scaled, scheme_weights)
+    fits += teams.apply(compute_team_need_bonus_wr, axis=1).to_numpy(dtype=float)
+    age = wr_imputed_scaled['Age']
+    fits -= np.where(age > 29, (age - 31) * 0.04, 0.0)[:, None]
+    players = pd.DataFrame({
+        'wr_name': wr_imputed_scaled['player_name'],
+        'wr_id': wr_imputed_scaled['player_id'],
+        'aav': column_or_fallback(wr_imputed_scaled, 'market_value', 'AAV'),
+        'prev_team': wr_imputed_scaled['Prev Team'],
+        'age': age,
+        'games': wr_imputed_scaled['games'],
+        'headshot': wr_imputed_scaled['headshot_url']
+    })
+    return make_fit_table(teams['team_name'], players, fits, 'wr_id')
+
+def load_wr_fit_table():
+    """
+    Returns the WR FitTable from the shared fit store (memory-mapped, shared by every
+    worker process), building it first if the store is out of date.
+    """
+    return shared_fit_table('WR', build_wr_fit_table, 'wr_id')
+
 def get_wr_fits_for_team(team_name):
     """
-    Given an NFL team name, computes the best WR fits using the unified final fit function.
+    Given an NFL team name, returns the best WR fits from the precomputed (WR, team) fit table.
     Returns a DataFrame with free agent WRs' final fit scores (including bonuses) and full ranking columns.
     """
-    team_row = team_df[team_df['team_name'].str.contains(team_name, case=False, na=False)]
-    if team_row.empty:
+    results_df = get_wr_fits_for_teams([team_name])[team_name]
+    if results_df is None:
         print(f"Error: Team '{team_name}' not found in the dataset.")
-        return None
-    team_row = team_row.iloc[0]
-    scheme_weights = get_top3_scheme_weights_wr(team_row)
-    records = []
-    for _, wr_row in wr_imputed_scaled.iterrows():
-        wr_name = wr_row['player_name']
-        wr_id = wr_row['player_id']
-        aav = wr_row.get('market_value', wr_row.get('AAV'))
-        prev_team = wr_row['Prev Team']
-        age = wr_row['Age']
-        games = wr_row['games']
-        headshot = wr_row['headshot_url']
-        # Use the unified function to compute final fit (with bonuses)
-        final_fit = compute_final_fit_wr(wr_row, scheme_weights, raw_fit_functions_wr)
-        final_fit += compute_team_need_bonus_wr(team_row)
-        if age > 29:
-            final_fit -= (age - 31) * 0.04
-        records.append({
-            'wr_name': wr_name,
-            'wr_id': wr_id,
-            'aav': aav,
-            'prev_team': prev_team,
-            'age': age,
-            'games': games,
-            'headshot': headshot,
-            'final_fit': final_fit
-        })
-    results_df = pd.DataFrame(records).sort_values(by='final_fit', ascending=False)
-    
-    # Merge in full ranking info
-    ranking_wr_df = compute_full_wr_rankings()
-    results_df = results_df.merge(ranking_wr_df, left_on='wr_name', right_on='player_name', how='left').drop(columns=['player_name'])
-    
     return results_df
 
+def get_wr_fits_for_teams(team_names, limit=None, offset=0, min_fit=None, fields=None):
+    """
+    Returns the sorted WR fits (with ranking columns) for several teams in one pass over
+    the WR fit table: {team_name: DataFrame, or None if the team is unknown}.
+    limit, offset, min_fit and fields select a page of each team's results (see sorted_team_fits).
+    """
+    table = get_fit_table('WR', load_wr_fit_table)
+    # Merge in full ranking info once for every team.
+    ranking_wr_df = get_rankings('WR', full_wr_data_file, compute_full_wr_rankings)
+    ranked_players = table.players.merge(ranking_wr_df, left_on='wr_name', right_on='player_name', how='left').drop(columns=['player_name'])
+    return sorted_team_fits(table, ranked_players, team_names, limit, offset, min_fit, fields)
+
+def get_wr_fit_for_player(team_name, player_id):
+    """
+    Returns one WR's final fit for a team merged with its ranking columns, as a dict,
+    or None if the team or player is unknown. Hash lookups only; no scoring pass.
+    """
+    table = get_fit_table('WR', load_wr_fit_table)
+    final_fit = get_player_fit(table, team_name, player_id)
+    if final_fit is None:
+        return None
+    wr_name = table.players['wr_name'].iat[table.player_index[player_id.strip()]]
+    record = dict(get_player_rankings('WR', full_wr_data_file, compute_full_wr_rankings, wr_name))
+    record['final_fit'] = final_fit
+    return record
+
+def rebuild_wr_fits():
+    """
+    Re-reads the WR data and builds a new fit table and ranking entry, without touching
+    the ones being served (the caller swaps them in). If another worker already stored
+    the fit table for the same data, that one is attached instead of building it again.
+
+    Returns:
+    - (FitTable, ranking cache entry)
+    """
+    load_wr_data.cache_clear()
+    return load_wr_fit_table(), build_ranking_entry(full_wr_data_file, compute_full_wr_rankings)
+
+
 if __name__ == "__main__":
     while True:
         team_name_input = input("Enter an NFL team name (or 'exit' to quit): ")
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The pipeline scripts import each other as top-level modules (they run as
+# python backend/scripts/<script>.py), so the tests put backend/scripts on the path too.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts'))
@@ -0,0 +1,60 @@
+import pytest
+
+import html_parsing
+from bench_html_parsing import parse_all, synthetic_pages
+from html_parsing import lxml, text_after_label
+
+# === Parser Settings ===
+# Every parser backend, with and without targeted parsing, has to give exactly the results
+# of the original whole-page html.parser parse.
+settings = [
+    (parser, targeted)
+    for parser in ['html.parser'] + (['lxml'] if lxml is not None else [])
+    for targeted in (False, True)
+]
+
+def use_parser(monkeypatch, parser, targeted):
+    monkeypatch.setattr(html_parsing, 'html_parser', parser)
+    monkeypatch.setattr(html_parsing, 'targeted_parsing', targeted)
+
+@pytest.fixture(scope='module')
+def pages():
+    return synthetic_pages(market_value_pages=3)
+
+@pytest.fixture(scope='module')
+def baseline(pages):
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        use_parser(monkeypatch, 'html.parser', False)
+        return parse_all(pages)
+
+@pytest.mark.parametrize('parser, targeted', settings)
+def test_parsers_match_whole_page_parse(pages, baseline, monkeypatch, parser, targeted):
+    use_parser(monkeypatch, parser, targeted)
+    parsed = parse_all(pages)
+    for kind in ('free_agents', 'team_cap'):
+        assert len(parsed[kind]) == len(baseline[kind])
+        for df, expected in zip(parsed[kind], baseline[kind]):
+            assert not expected.empty
+            assert df.equals(expected)
+    assert parsed['market_value'] == baseline['market_value']
+    assert all(value is not None for value in parsed['market_value'])
+
+label_pages = [
+    '<div><span>Avg. Salary:</span>$13,462,485</div>',
+    '<div><span class="label">Avg. Salary:</span> $8 </div>',
+    '<div><span>Avg. Salary:</span><!-- c -->$8</div>',
+    '<div><span>Avg. Salary:</span>$8 < $9</div>',
+    '<div><span>Avg. Salary:</span><b>$8</b></div>',
+    '<div><span>Avg. Salary:</span></div>',
+    '<p>Avg. Salary: none</p><div><span>Avg. Salary:</span>$5</div>',
+    '<div><span>Avg. Salary: $5</span></div>',
+    '<div><span>Avg. Salary:</span>$8',
+]
+
+@pytest.mark.parametrize('parser, targeted', settings)
+@pytest.mark.parametrize('page', label_pages)
+def test_text_after_label_matches_whole_page_parse(monkeypatch, parser, targeted, page):
+    use_parser(monkeypatch, 'html.parser', False)
+    expected = text_after_label(page, 'Avg. Salary:')
+    use_parser(monkeypatch, parser, targeted)
+    assert text_after_label(page, 'Avg. Salary:') == expected
@@ -0,0 +1,237 @@
+import asyncio
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pandas as pd
+import pytest
+
+import http_fetch
+import playerscrape
+from http_fetch import AsyncFetcher, ResponseCache, TokenBucket, fetch_many
+
+# === Stub Server ===
+# A local HTTP server standing in for Spotrac, so the fetch layer is tested offline.
+# Responses are scripted per path: server.script['/page'] = [(503, {}, ''), (200, {}, 'ok')]
+# answers the first request with a 503 and every later one with the last entry; the requests
+# (path and headers) are recorded in server.requests.
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.requests.append((self.path, dict(self.headers)))
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            responses = server.script.get(self.path, [(200, {}, 'ok')])
+            status, headers, body = responses[min(server.hits[self.path], len(responses)) - 1]
+        try:
+            time.sleep(server.delay)
+            data = body.encode('utf-8')
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.lock = threading.Lock()
+    server.script = {}
+    server.hits = {}
+    server.requests = []
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.delay = 0.0
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def closed_port_url():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        port = s.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+def fetch(url, **options):
+    options = dict({'rate': None, 'backoff': 0.01, 'cache': None}, **options)
+
+    async def run():
+        async with AsyncFetcher(**options) as fetcher:
+            return await fetcher.fetch(url)
+    return asyncio.run(run())
+
+# === Retries and Backoff ===
+def test_retries_5xx_until_success(stub_server):
+    stub_server.script['/page'] = [(503, {}, ''), (502, {}, ''), (200, {}, 'done')]
+    response = fetch(stub_server.url + '/page', retries=3)
+    assert response.text == 'done'
+    assert stub_server.hits['/page'] == 3
+
+def test_gives_up_after_retries(stub_server):
+    stub_server.script['/down'] = [(500, {}, '')]
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(stub_server.url + '/down', retries=2)
+    assert stub_server.hits['/down'] == 3
+
+def test_client_errors_are_not_retried(stub_server):
+    stub_server.script['/missing'] = [(404, {}, '')]
+    with pytest.raises(httpx.HTTPStatusError):
+        fetch(stub_server.url + '/missing', retries=3)
+    assert stub_server.hits['/missing'] == 1
+
+def test_429_waits_for_retry_after(stub_server):
+    stub_server.script['/limited'] = [(429, {'Retry-After': '0.3'}, ''), (200, {}, 'ok')]
+    started = time.monotonic()
+    # A 10s backoff would blow the time limit: the wait has to come from Retry-After.
+    response = fetch(stub_server.url + '/limited', backoff=10)
+    assert response.text == 'ok'
+    assert 0.3 <= time.monotonic() - started < 5
+
+def test_backoff_doubles_per_attempt(stub_server, monkeypatch):
+    stub_server.script['/flaky'] = [(503, {}, '')] * 3 + [(200, {}, 'ok')]
+    waits = []
+    sleep = asyncio.sleep
+
+    async def record_sleep(seconds):
+        waits.append(seconds)
+        await sleep(0)
+    monkeypatch.setattr(http_fetch.asyncio, 'sleep', record_sleep)
+    monkeypatch.setattr(http_fetch.random, 'uniform', lambda low, high: 1.0)
+    fetch(stub_server.url + '/flaky', retries=3, backoff=0.1)
+    assert waits == pytest.approx([0.1, 0.2, 0.4])
+
+# === Concurrency and Rate Limits ===
+def test_per_host_concurrency_cap(stub_server):
+    stub_server.delay = 0.1
+    urls = [f"{stub_server.url}/page{i}" for i in range(12)]
+    pages = fetch_many(urls, rate=None, per_host=3, cache=None)
+    assert pages == ['ok'] * 12
+    assert stub_server.max_in_flight == 3
+
+def test_token_bucket_rate():
+    async def acquire_times(bucket, count):
+        started = time.monotonic()
+        for _ in range(count):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # The burst goes through at once, then 20 per second.
+    assert asyncio.run(acquire_times(TokenBucket(20, burst=5), 5)) < 0.05
+    assert asyncio.run(acquire_times(TokenBucket(20, burst=1), 6)) >= 0.25 - 0.01
+
+# === Failures and Fallbacks ===
+def test_fetch_many_returns_failures_in_place(stub_server):
+    stub_server.script['/missing'] = [(404, {}, '')]
+    urls = [stub_server.url + '/a', stub_server.url + '/missing', closed_port_url()]
+    arrived = {}
+    pages = fetch_many(urls, on_page=arrived.__setitem__, rate=None, retries=0, cache=None)
+    assert pages[0] == 'ok'
+    assert isinstance(pages[1], httpx.HTTPStatusError)
+    assert isinstance(pages[2], httpx.TransportError)
+    assert set(arrived) == set(urls)
+
+def test_market_values_fall_back_to_aav(stub_server, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # the default response cache is relative to the working directory
+    salary_page = '<div><span>Avg. Salary:</span>$7,000,000</div>'
+    stub_server.script['/mv/ok'] = [(200, {}, salary_page)]
+    stub_server.script['/mv/busy'] = [(503, {}, ''), (200, {}, salary_page)]
+    stub_server.script['/mv/gone'] = [(404, {}, '')]
+    df = pd.DataFrame({
+        'AAV': [1.0, 2.0, 3.0, 4.0],
+        'MV_Link': [stub_server.url + '/mv/ok', stub_server.url + '/mv/busy', stub_server.url + '/mv/gone', None],
+    })
+    df = playerscrape.scrape_market_values_concurrently(df, delay=0, checkpoint=None, progress_every=None)
+    assert df['market_value'].tolist() == [7000000.0, 7000000.0, 3.0, 4.0]
+    assert playerscrape.get_avg_salary(stub_server.url + '/mv/gone') is None
+
+# === Response Cache ===
+def fetch_cached_text(url, cache):
+    async def run():
+        async with AsyncFetcher(rate=None, cache=cache) as fetcher:
+            return await fetcher.fetch_text(url)
+    return asyncio.run(run())
+
+def test_cache_serves_fresh_pages_and_revalidates_stale_ones(stub_server, tmp_path):
+    last_modified = 'Wed, 01 Jan 2025 00:00:00 GMT'
+    stub_server.script['/page'] = [
+        (200, {'ETag': '"v1"', 'Last-Modified': last_modified}, 'page v1'),
+        (304, {'ETag': '"v1"'}, ''),
+    ]
+    url = stub_server.url + '/page'
+    cache = ResponseCache(str(tmp_path), ttl=60)
+    assert fetch_cached_text(url, cache) == 'page v1'
+    first_entry, _ = cache.get(url)
+
+    # Fresh: served from disk without a request
+    assert fetch_cached_text(url, cache) == 'page v1'
+    assert stub_server.hits['/page'] == 1
+
+    # Stale (ttl=0): revalidated with the stored validators; the 304 keeps the stored body
+    stale_cache = ResponseCache(str(tmp_path), ttl=0)
+    time.sleep(0.01)
+    assert fetch_cached_text(url, stale_cache) == 'page v1'
+    assert stub_server.hits['/page'] == 2
+    _, headers = stub_server.requests[-1]
+    assert headers.get('If-None-Match') == '"v1"'
+    assert headers.get('If-Modified-Since') == last_modified
+    entry, text = stale_cache.get(url)
+    assert text == 'page v1'
+    assert entry['body'] == first_entry['body']
+    assert entry['fetched_at'] > first_entry['fetched_at']
+
+def test_cache_prunes_unused_pages(tmp_path):
+    cache = ResponseCache(str(tmp_path), ttl=60, max_age=3600)
+    cache.put('https://example.com/old', httpx.Response(200, text='old page'))
+    cache.put('https://example.com/shared-old', httpx.Response(200, text='shared page'))
+    cache.put('https://example.com/shared-new', httpx.Response(200, text='shared page'))
+    cache.put('https://example.com/new', httpx.Response(200, text='new page'))
+    for url in ('https://example.com/old', 'https://example.com/shared-old'):
+        entry, _ = cache.get(url)
+        cache._write_entry(url, dict(entry, fetched_at=time.time() - 7200))
+
+    assert cache.prune() == 3  # two entries and the old page's body
+    assert cache.get('https://example.com/old') == (None, None)
+    assert cache.get('https://example.com/shared-old') == (None, None)
+    assert cache.get('https://example.com/shared-new')[1] == 'shared page'
+    assert cache.get('https://example.com/new')[1] == 'new page'
+    assert len(list(tmp_path.iterdir())) == 4
+
+# === Free Agent Class ===
+def free_agent_page(server, side, count):
+    rows = ''.join(
+        f'<tr><td>{side} Player {i}</td><td>QB</td><td>{25 + i}</td><td>3</td><td>NYJ</td>'
+        f'<td>${1000 * (i + 1):,}</td><td>UFA</td><td><a href="{server.url}/mv/{side}{i}">Market Value</a></td></tr>'
+        for i in range(count)
+    )
+    return f'<table><tr><th>Player</th></tr>{rows}</table>'
+
+def test_write_free_agents_scrapes_every_page(stub_server, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # free_agents.csv, the checkpoint and the cache are relative paths
+    (tmp_path / 'backend' / 'processed_data').mkdir(parents=True)
+    stub_server.script['/off'] = [(200, {}, free_agent_page(stub_server, 'off', 3))]
+    stub_server.script['/def'] = [(200, {}, free_agent_page(stub_server, 'def', 2))]
+    for path in ('/mv/off0', '/mv/off1', '/mv/off2', '/mv/def0', '/mv/def1'):
+        stub_server.script[path] = [(200, {}, '<div><span>Avg. Salary:</span>$9,000</div>')]
+
+    df = playerscrape.write_free_agents((stub_server.url + '/off', stub_server.url + '/def'))
+    assert df['Name'].tolist() == ['off Player 0', 'off Player 1', 'off Player 2', 'def Player 0', 'def Player 1']
+    assert df['market_value'].tolist() == [9000.0] * 5
+    assert pd.read_csv(playerscrape.free_agents_file)['Name'].tolist() == df['Name'].tolist()
+
+    stub_server.script['/gone'] = [(404, {}, '')]
+    with pytest.raises(RuntimeError):
+        playerscrape.get_free_agent_class((stub_server.url + '/off', stub_server.url + '/gone'))